@@ -0,0 +1,201 @@
+# benchmark.py
+"""Headless benchmark comparing the registered search algorithms across map families.
+
+    python benchmark.py --sizes 64 256 --densities 0.1 0.3 --repeats 9 --json out.json
+    python benchmark.py --maze initial_maze.txt --maze big.maze
+
+Generated maps come from a seeded random generator, so the same arguments
+always benchmark the same grids. No pygame window is opened.
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+
+from grid_engine import COST_MODELS, GridEngine
+from maze_saver import is_binary_maze, load_maze_binary, load_maze_streaming
+from pathfinding_algorithms import ALGORITHMS, path_cost
+
+DEFAULT_SIZES = (64, 256)
+DEFAULT_DENSITIES = (0.0, 0.2, 0.35)
+
+
+def random_map(size, density, seed):
+    # A size x size grid with roughly density of its cells walled; the corners stay free
+    rng = random.Random(seed)
+    grid = [[int(rng.random() < density) for _ in range(size)] for _ in range(size)]
+    grid[0][0] = grid[size - 1][size - 1] = 0
+    return {
+        'name': f"random-{size}x{size}-{density:g}-seed{seed}",
+        'grid': grid,
+        'start': (0, 0),
+        'goal': (size - 1, size - 1),
+    }
+
+
+def maze_map(filename):
+    # A saved maze, searched corner to corner unless the binary header stores endpoints
+    start = goal = None
+    if is_binary_maze(filename):
+        with load_maze_binary(filename) as maze:
+            grid = maze.to_grid()
+            start, goal = maze.start, maze.goal
+        rows, cols = maze.rows, maze.cols
+    else:
+        # Streamed into a flat buffer first, parsing never holds more than the rows
+        # built so far
+        rows, cols, cells = load_maze_streaming(filename)
+        grid = [list(cells[row * cols:(row + 1) * cols]) for row in range(rows)]
+    return {
+        'name': os.path.basename(filename),
+        'grid': grid,
+        'start': start if start is not None else (0, 0),
+        'goal': goal if goal is not None else (rows - 1, cols - 1),
+    }
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of a non-empty list
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def run_case(algorithm, case, cost_model, warmup, repeats):
+    """Time algorithm on case; {'skipped': reason} if it rejects the cost model.
+
+    peak_memory_kb is measured on a fresh GridEngine for algorithms that
+    take an engine, so it includes the search arrays. State cached across
+    calls, such as HPA*'s abstract graph or ALT's landmark tables, is built
+    during the warmup runs and is not included.
+    """
+    grid, start, goal = case['grid'], case['start'], case['goal']
+    stats = {}
+    try:
+        for _ in range(warmup):
+            algorithm(grid, start, goal, cost_model=cost_model, stats=stats)
+
+        timings = []
+        for _ in range(repeats):
+            begin = time.perf_counter()
+            path = algorithm(grid, start, goal, cost_model=cost_model, stats=stats)
+            timings.append(time.perf_counter() - begin)
+
+        # Memory is measured on a separate run, tracing would distort the timings
+        options = {}
+        tracemalloc.start()
+        if 'engine' in inspect.signature(algorithm).parameters:
+            options['engine'] = GridEngine.from_grid(grid)
+        algorithm(grid, start, goal, cost_model=cost_model, stats=stats, **options)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    except ValueError as error:
+        # The algorithm does not support this cost model (JPS on a 4-connected grid)
+        tracemalloc.stop()
+        return {'skipped': str(error)}
+
+    return {
+        'median_ms': statistics.median(timings) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'min_ms': min(timings) * 1000,
+        'expansions': stats.get('nodes_examined'),
+        'path_length': len(path),
+        'path_cost': path_cost(path, cost_model, grid) if path else None,
+        'peak_memory_kb': peak / 1024,
+    }
+
+
+def run_benchmark(cases, algorithms=None, cost_model='chebyshev', warmup=1, repeats=5):
+    """Run every algorithm on every case, returning the results as a JSON-ready dict."""
+    names = list(algorithms or ALGORITHMS)
+    results = []
+    for case in cases:
+        for name in names:
+            result = run_case(ALGORITHMS[name], case, cost_model, warmup, repeats)
+            result.update({'map': case['name'], 'algorithm': name})
+            results.append(result)
+    return {
+        'cost_model': cost_model,
+        'warmup': warmup,
+        'repeats': repeats,
+        'python': platform.python_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+
+def format_table(report):
+    columns = [
+        ('map', 'map', '{}'),
+        ('algorithm', 'algorithm', '{}'),
+        ('median ms', 'median_ms', '{:.2f}'),
+        ('p95 ms', 'p95_ms', '{:.2f}'),
+        ('expansions', 'expansions', '{}'),
+        ('path cost', 'path_cost', '{:.2f}'),
+        ('peak KiB', 'peak_memory_kb', '{:.1f}'),
+    ]
+    rows = []
+    for result in report['results']:
+        if 'skipped' in result:
+            padding = [''] * (len(columns) - 3)
+            rows.append([result['map'], result['algorithm'], 'skipped'] + padding)
+            continue
+        rows.append([
+            '-' if result[key] is None else fmt.format(result[key])
+            for _, key, fmt in columns
+        ])
+    titles = [title for title, _, _ in columns]
+    widths = [
+        max(len(title), *(len(row[i]) for row in rows))
+        for i, title in enumerate(titles)
+    ]
+
+    def line(cells):
+        pairs = zip(cells, widths, strict=True)
+        return '  '.join(cell.ljust(width) for cell, width in pairs)
+
+    lines = [line(titles).rstrip(), line('-' * width for width in widths)]
+    for row in rows:
+        lines.append(line(row).rstrip())
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the pathfinding algorithms without a window.")
+    add = parser.add_argument
+    add('--sizes', type=int, nargs='*', default=list(DEFAULT_SIZES))
+    add('--densities', type=float, nargs='*', default=list(DEFAULT_DENSITIES))
+    add('--seed', type=int, default=0)
+    add('--maze', action='append', default=[],
+        help="saved maze file to include (repeatable)")
+    add('--algorithm', action='append', choices=sorted(ALGORITHMS),
+        help="algorithm to run (repeatable), default all")
+    add('--cost-model', default='chebyshev', choices=sorted(COST_MODELS))
+    add('--warmup', type=int, default=1)
+    add('--repeats', type=int, default=5)
+    add('--json', metavar='FILE', help="also write the results to FILE as JSON")
+    args = parser.parse_args(argv)
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1")
+
+    cases = [
+        random_map(size, density, args.seed)
+        for size in args.sizes for density in args.densities
+    ]
+    cases += [maze_map(filename) for filename in args.maze]
+    report = run_benchmark(
+        cases, args.algorithm, args.cost_model, args.warmup, args.repeats)
+    print(format_table(report))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to '{args.json}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# cli.py
+"""Command line entry point that works without a display.
+
+    python cli.py solve maze.json --start 0,0 --goal 49,49 --algorithm astar --json
+    python cli.py generate kruskal 1000 1000 big.maze --seed 7
+    python cli.py landmarks big.maze --count 8
+    python cli.py bench --sizes 256 --repeats 9
+    python cli.py gui
+
+Only the gui command imports pygame, so the other commands run on
+machines without SDL installed.
+"""
+import argparse
+import contextlib
+import inspect
+import json
+import os
+import sys
+import time
+
+from grid_engine import COST_MODELS, GridEngine
+from grid_model import Graph
+from landmarks import LandmarkTable
+from maze_generators import GENERATORS
+from maze_saver import (
+    is_binary_maze,
+    landmarks_filename,
+    load_landmarks,
+    load_maze_binary,
+    load_maze_streaming,
+    save_landmarks,
+    save_maze,
+    save_maze_binary,
+)
+from pathfinding_algorithms import ALGORITHMS, path_cost
+
+# Text and JSON mazes at least this large report their loading progress on stderr
+PROGRESS_MIN_BYTES = 8 * 2 ** 20
+
+
+def parse_cell(text):
+    try:
+        row, col = (int(value) for value in text.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROW,COL, got '{text}'") from None
+    return row, col
+
+
+@contextlib.contextmanager
+def open_maze(filename):
+    """Yield (engine, grid, start, goal) for a saved maze.
+
+    start and goal come from a binary maze's header and are None otherwise.
+    Binary mazes are searched straight from the mapped file, text and JSON
+    ones are streamed into a flat buffer. grid holds one view per row of
+    the engine's cells, so it can be passed wherever a list of rows is
+    read; the views are released when the block exits.
+    """
+    if is_binary_maze(filename):
+        with load_maze_binary(filename) as maze:
+            yield from _with_rows(maze.engine(), maze.start, maze.goal)
+    else:
+        progress = None
+        if os.path.getsize(filename) >= PROGRESS_MIN_BYTES:
+            progress = progress_reporter(filename)
+        rows, cols, cells = load_maze_streaming(filename, progress)
+        if progress:
+            print(file=sys.stderr)
+        yield from _with_rows(GridEngine(rows, cols, cells), None, None)
+
+
+def progress_reporter(filename):
+    # A load_maze_streaming progress callback that rewrites one stderr line whenever
+    # the percentage read changes
+    shown = None
+
+    def report(read, total):
+        nonlocal shown
+        percent = read * 100 // total if total else 100
+        if percent != shown:
+            shown = percent
+            print(f"\rLoading '{filename}': {percent}%", end='', file=sys.stderr,
+                  flush=True)
+
+    return report
+
+
+def _with_rows(engine, start, goal):
+    cols = engine.cols
+    cells = memoryview(engine.cells)
+    grid = [cells[row * cols:(row + 1) * cols] for row in range(engine.rows)]
+    try:
+        yield engine, grid, start, goal
+    finally:
+        # A mapped file cannot be closed while views into it are alive
+        for values in grid:
+            values.release()
+        cells.release()
+
+
+def solve(args):
+    with open_maze(args.maze) as (engine, grid, start, goal):
+        return _solve(args, engine, grid, start, goal)
+
+
+def _solve(args, engine, grid, start, goal):
+    rows, cols = engine.rows, engine.cols
+    start = args.start or start or (0, 0)
+    goal = args.goal or goal or (rows - 1, cols - 1)
+    for name, cell in (('start', start), ('goal', goal)):
+        if not (0 <= cell[0] < rows and 0 <= cell[1] < cols):
+            raise SystemExit(
+                f"{name} {cell[0]},{cell[1]} is outside the {rows}x{cols} maze")
+
+    algorithm = ALGORITHMS[args.algorithm]
+    options = {}
+    if 'engine' in inspect.signature(algorithm).parameters:
+        # Searches that take an engine run on the loaded cells without copying them
+        options['engine'] = engine
+    if args.algorithm == 'alt_astar' and os.path.exists(landmarks_filename(args.maze)):
+        # Tables precomputed by the landmarks command; stale ones are rejected
+        # and rebuilt in memory
+        try:
+            table = load_landmarks(landmarks_filename(args.maze), engine.cells)
+            if table.model.name == args.cost_model:
+                options['landmarks'] = table
+        except ValueError as error:
+            print(f"Ignoring landmarks: {error}", file=sys.stderr)
+
+    stats = {}
+    begin = time.perf_counter()
+    try:
+        path = algorithm(grid, start, goal, cost_model=args.cost_model, stats=stats,
+                         **options)
+    except ValueError as error:
+        # e.g. jump_point_search on a 4-connected model or alt_astar with octile costs
+        raise SystemExit(f"{args.algorithm}: {error}") from None
+    elapsed = time.perf_counter() - begin
+
+    if args.json:
+        json.dump({
+            'maze': args.maze,
+            'algorithm': args.algorithm,
+            'cost_model': args.cost_model,
+            'start': list(start),
+            'goal': list(goal),
+            'found': bool(path),
+            'length': len(path),
+            'cost': path_cost(path, args.cost_model, grid) if path else None,
+            'nodes_examined': stats.get('nodes_examined'),
+            'elapsed_ms': elapsed * 1000,
+            'path': [list(cell) for cell in path],
+        }, sys.stdout)
+        print()
+    elif path:
+        cost = path_cost(path, args.cost_model, grid)
+        print(f"{args.algorithm}: {len(path)} cells, cost {cost:g}, "
+              f"{stats.get('nodes_examined')} nodes examined in {elapsed * 1000:.2f}ms")
+        print(' '.join(f"{row},{col}" for row, col in path))
+    else:
+        print(f"{args.algorithm}: no path from {start} to {goal}")
+    return 0 if path else 1
+
+
+def generate(args):
+    start = args.start or (0, 0)
+    goal = args.goal or (args.rows - 1, args.cols - 1)
+    begin = time.perf_counter()
+    generator = GENERATORS[args.generator](Graph(args.rows, args.cols), args.seed)
+    grid = generator.generate_maze(start, goal)
+    elapsed = time.perf_counter() - begin
+    if args.output.endswith('.maze'):
+        # Only grids of plain walls and free cells fit in one bit per cell
+        terrain = any(value > 1 for values in grid for value in values)
+        save_maze_binary(grid, args.output, start, goal, packed=not terrain)
+    else:
+        save_maze(grid, args.output)
+    print(f"{args.generator} {args.rows}x{args.cols} maze generated in "
+          f"{elapsed * 1000:.1f}ms, saved to '{args.output}'.")
+    return 0
+
+
+def landmarks(args):
+    with open_maze(args.maze) as (engine, _, _, _):
+        begin = time.perf_counter()
+        try:
+            table = LandmarkTable.build(engine.rows, engine.cols, engine.cells,
+                                        args.count, args.cost_model)
+        except ValueError as error:
+            raise SystemExit(str(error)) from None
+        elapsed = time.perf_counter() - begin
+    filename = landmarks_filename(args.maze)
+    save_landmarks(table, filename)
+    print(f"{len(table.landmarks)} landmarks built in {elapsed * 1000:.1f}ms, "
+          f"saved to '{filename}'.")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pathfinding comparison tools.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    solve_parser = commands.add_parser('solve', help="find a path through a saved maze")
+    add = solve_parser.add_argument
+    add('maze', help="maze file (.json, .txt or binary .maze)")
+    add('--start', type=parse_cell, help="ROW,COL, default the stored start or 0,0")
+    add('--goal', type=parse_cell,
+        help="ROW,COL, default the stored goal or the far corner")
+    add('--algorithm', default='astar', choices=sorted(ALGORITHMS))
+    add('--cost-model', default='chebyshev', choices=sorted(COST_MODELS))
+    add('--json', action='store_true', help="print the result as one JSON object")
+
+    generate_parser = commands.add_parser(
+        'generate', help="generate a solvable maze and save it")
+    add = generate_parser.add_argument
+    add('generator', choices=list(GENERATORS))
+    add('rows', type=int)
+    add('cols', type=int)
+    add('output',
+        help="a .maze name saves the bit-packed binary format, anything else JSON")
+    add('--seed', type=int)
+    add('--start', type=parse_cell, help="ROW,COL kept reachable, default 0,0")
+    add('--goal', type=parse_cell,
+        help="ROW,COL kept reachable, default the far corner")
+
+    landmarks_parser = commands.add_parser(
+        'landmarks', help="precompute ALT landmark tables for alt_astar")
+    add = landmarks_parser.add_argument
+    add('maze', help="the tables are saved next to it as <maze>.landmarks")
+    add('--count', type=int, default=8)
+    add('--cost-model', default='chebyshev', choices=sorted(COST_MODELS))
+
+    # Everything after 'bench' is handed to benchmark.py's own parser
+    bench_help = "run the benchmark suite (see benchmark.py --help)"
+    commands.add_parser('bench', help=bench_help, add_help=False)
+
+    commands.add_parser('gui', help="open the interactive pygame window")
+
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command != 'bench':
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if args.command == 'solve':
+        return solve(args)
+    if args.command == 'generate':
+        return generate(args)
+    if args.command == 'landmarks':
+        return landmarks(args)
+    if args.command == 'bench':
+        import benchmark
+        benchmark.main(extra)
+        return 0
+    # The GUI is the only part of the project that needs pygame
+    try:
+        import main as gui
+    except ModuleNotFoundError as error:
+        if error.name != 'pygame':
+            raise
+        raise SystemExit("The gui command needs pygame, "
+                         "install it with 'pip install pygame==2.5.2'") from None
+    gui.run_gui()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
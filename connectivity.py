@@ -0,0 +1,182 @@
+# connectivity.py
+from array import array
+
+from grid_engine import DIRECTIONS, flatten_grid
+
+# Neighbours of a cell in clockwise order, used for the local split test
+RING = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+
+
+class ConnectivityIndex:
+    """Connected-component labels over a grid, answering "is there any path?" in O(1).
+
+    Every free cell carries a component label; labels are merged with
+    union-find when a wall is removed. Adding a wall can only split a
+    component, so the affected label is marked dirty and re-flooded lazily
+    the next time a query lands on it. Walls whose free neighbours stay
+    connected around them cannot split anything and never dirty a label.
+    """
+
+    def __init__(self, rows, cols, cells, directions=DIRECTIONS):
+        self.rows = rows
+        self.cols = cols
+        self.directions = directions
+        self.labels = array('l', [-1]) * (rows * cols)
+        self.parent = []
+        self.dirty = set()
+        self.build(cells)
+
+    @classmethod
+    def from_grid(cls, grid, directions=DIRECTIONS):
+        return cls(*flatten_grid(grid), directions)
+
+    def build(self, cells):
+        labels = self.labels
+        self.parent = []
+        self.dirty = set()
+        for index in range(len(labels)):
+            labels[index] = -1 if cells[index] == 1 else -2
+        for index in range(len(labels)):
+            if labels[index] == -2:
+                self._flood(index, self._new_label(), -2)
+
+    def _new_label(self):
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def _find(self, label):
+        parent = self.parent
+        root = label
+        while parent[root] != root:
+            root = parent[root]
+        while parent[label] != root:
+            parent[label], label = root, parent[label]
+        return root
+
+    def _union(self, a, b):
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return a
+        self.parent[b] = a
+        if b in self.dirty:
+            self.dirty.discard(b)
+            self.dirty.add(a)
+        return a
+
+    def _flood(self, source, label, old_root):
+        # Relabel every cell reachable from source whose current label resolves to
+        # old_root
+        rows, cols = self.rows, self.cols
+        labels = self.labels
+        directions = self.directions
+        find = self._find if old_root >= 0 else None
+        labels[source] = label
+        stack = [source]
+        size = 0
+        while stack:
+            current = stack.pop()
+            size += 1
+            row, col = divmod(current, cols)
+            for dr, dc in directions:
+                nr, nc = row + dr, col + dc
+                if nr < 0 or nr >= rows or nc < 0 or nc >= cols:
+                    continue
+                neighbor = current + dr * cols + dc
+                current_label = labels[neighbor]
+                if current_label < 0 and current_label != old_root:
+                    continue
+                if current_label == label or (find and find(current_label) != old_root):
+                    continue
+                labels[neighbor] = label
+                stack.append(neighbor)
+        return size
+
+    def component(self, node):
+        # Current root label for node, or -1 for walls; re-floods the component
+        # first if it may have split
+        index = node[0] * self.cols + node[1]
+        label = self.labels[index]
+        if label < 0:
+            return -1
+        root = self._find(label)
+        if root in self.dirty:
+            root = self._new_label()
+            self._flood(index, root, self._find(label))
+        return root
+
+    def connected(self, start, goal):
+        start_root = self.component(start)
+        goal_root = self.component(goal)
+        return start_root != -1 and start_root == goal_root
+
+    def reachable(self, start, goal):
+        # Searches step off the start cell even when it is a wall, so try its free
+        # neighbours then
+        if start == goal:
+            return True
+        if self.component(start) != -1:
+            return self.connected(start, goal)
+        goal_root = self.component(goal)
+        row, col = start
+        for dr, dc in self.directions:
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < self.rows and 0 <= nc < self.cols and goal_root != -1 \
+                    and self.component((nr, nc)) == goal_root:
+                return True
+        return False
+
+    def set_cell(self, row, col, value):
+        if value == 1:
+            self.add_wall(row, col)
+        else:
+            self.remove_wall(row, col)
+
+    def add_wall(self, row, col):
+        index = row * self.cols + col
+        label = self.labels[index]
+        if label < 0:
+            return
+        self.labels[index] = -1
+        if self._may_split(row, col):
+            self.dirty.add(self._find(label))
+
+    def remove_wall(self, row, col):
+        index = row * self.cols + col
+        if self.labels[index] >= 0:
+            return
+        rows, cols = self.rows, self.cols
+        label = None
+        for dr, dc in self.directions:
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < rows and 0 <= nc < cols and self.labels[nr * cols + nc] >= 0:
+                neighbor_label = self.labels[nr * cols + nc]
+                if label is None:
+                    label = neighbor_label
+                else:
+                    label = self._union(label, neighbor_label)
+        self.labels[index] = self._new_label() if label is None else self._find(label)
+
+    def _may_split(self, row, col):
+        # Group the free cells around (row, col) using only moves between ring
+        # cells; the wall can only disconnect something if its neighbours end up in
+        # different groups
+        rows, cols = self.rows, self.cols
+        labels = self.labels
+        moves = set(self.directions)
+        free = [
+            (dr, dc) for dr, dc in RING
+            if 0 <= row + dr < rows and 0 <= col + dc < cols
+            and labels[(row + dr) * cols + col + dc] >= 0
+        ]
+        group = {cell: cell for cell in free}
+
+        def find(cell):
+            while group[cell] != cell:
+                cell = group[cell]
+            return cell
+
+        for i, a in enumerate(free):
+            for b in free[i + 1:]:
+                if (b[0] - a[0], b[1] - a[1]) in moves:
+                    group[find(b)] = find(a)
+        return len({find(cell) for cell in free if cell in moves}) > 1
@@ -0,0 +1,162 @@
+# dstar_lite.py
+import heapq
+from array import array
+
+from grid_engine import flatten_grid, get_cost_model
+
+INF = float('inf')
+
+# Keys are rounded before they are compared: octile costs summed along different
+# paths can differ in the last bit, and an exact comparison then ends the search
+# before a node whose key only ties with the start's has been processed
+KEY_DIGITS = 9
+
+
+class DStarLite:
+    """Incremental planner (D* Lite) that keeps its search state between plans.
+
+    The search runs backwards from the goal, so moving the start or changing
+    a few cells only repairs the part of the tree that depends on them
+    instead of searching again from scratch. Changing the goal starts over.
+    """
+
+    def __init__(self, grid, start, goal, cost_model='chebyshev'):
+        self.rows, self.cols, self.cells = flatten_grid(grid)
+        self.model = get_cost_model(cost_model)
+        step_cost = self.model.step_cost
+        self.moves = [(dr, dc, step_cost(dr, dc)) for dr, dc in self.model.directions]
+        self.nodes_examined = 0
+        self.start = start
+        self.set_goal(goal)
+
+    def set_goal(self, goal):
+        size = self.rows * self.cols
+        self.goal = goal
+        self.g = array('d', [INF]) * size
+        self.rhs = array('d', [INF]) * size
+        self.queued = {}
+        self.open_list = []
+        self.km = 0
+        self.last = self.start
+        goal_index = self._index(goal)
+        self.rhs[goal_index] = 0
+        self._push(goal_index)
+
+    def move_start(self, start):
+        self.km += self._heuristic(self.last, start)
+        self.last = start
+        self.start = start
+
+    def update_cell(self, row, col, value):
+        # Entering (row, col) changed cost, so only its neighbours' rhs values need
+        # repairing
+        index = row * self.cols + col
+        if self.cells[index] == value:
+            return
+        self.cells[index] = value
+        for neighbor in self._neighbors(index):
+            self._update_vertex(neighbor)
+
+    def update_cells(self, changes):
+        for row, col, value in changes:
+            self.update_cell(row, col, value)
+
+    def plan(self):
+        self._compute_shortest_path()
+        return self._extract_path()
+
+    def _index(self, node):
+        return node[0] * self.cols + node[1]
+
+    def _heuristic(self, a, b):
+        return self.model.distance(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+    def _key(self, index):
+        best = min(self.g[index], self.rhs[index])
+        estimate = self._heuristic(self.start, divmod(index, self.cols))
+        priority = best + estimate + self.km
+        return (round(priority, KEY_DIGITS), round(best, KEY_DIGITS))
+
+    def _push(self, index):
+        key = self._key(index)
+        self.queued[index] = key
+        heapq.heappush(self.open_list, (key, index))
+
+    def _neighbors(self, index):
+        row, col = divmod(index, self.cols)
+        for dr, dc, _ in self.moves:
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                yield nr * self.cols + nc
+
+    def _successors(self, index):
+        # Moves out of index and their costs, scaled by the terrain entered; walls
+        # can be left but never entered
+        row, col = divmod(index, self.cols)
+        for dr, dc, step in self.moves:
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                value = self.cells[nr * self.cols + nc]
+                if value != 1:
+                    yield nr * self.cols + nc, step * value if value else step
+
+    def _update_vertex(self, index):
+        if index != self._index(self.goal):
+            g = self.g
+            self.rhs[index] = min(
+                (step + g[successor] for successor, step in self._successors(index)),
+                default=INF)
+        self.queued.pop(index, None)
+        if self.g[index] != self.rhs[index]:
+            self._push(index)
+
+    def _top(self):
+        # Drop heap entries whose key was replaced or removed since they were pushed
+        open_list, queued = self.open_list, self.queued
+        while open_list and queued.get(open_list[0][1]) != open_list[0][0]:
+            heapq.heappop(open_list)
+        return open_list[0] if open_list else ((INF, INF), -1)
+
+    def _compute_shortest_path(self):
+        g, rhs = self.g, self.rhs
+        start = self._index(self.start)
+        nodes_examined = 0
+        while True:
+            old_key, index = self._top()
+            if index == -1 or (old_key >= self._key(start) and rhs[start] == g[start]):
+                break
+            heapq.heappop(self.open_list)
+            del self.queued[index]
+            nodes_examined += 1
+            new_key = self._key(index)
+            if old_key < new_key:
+                self._push(index)
+            elif g[index] > rhs[index]:
+                g[index] = rhs[index]
+                for neighbor in self._neighbors(index):
+                    self._update_vertex(neighbor)
+            else:
+                g[index] = INF
+                self._update_vertex(index)
+                for neighbor in self._neighbors(index):
+                    self._update_vertex(neighbor)
+        self.nodes_examined = nodes_examined
+
+    def _extract_path(self):
+        g = self.g
+        current = self._index(self.start)
+        goal = self._index(self.goal)
+        if g[current] == INF and current != goal:
+            return []
+        path = [self.start]
+        visited = {current}
+        while current != goal:
+            current, _ = min(self._successors(current),
+                             key=lambda move: move[1] + g[move[0]])
+            if current in visited:
+                # Following g downhill can only loop when the g values are inconsistent
+                raise RuntimeError(
+                    f"D* Lite path extraction revisited {divmod(current, self.cols)}")
+            visited.add(current)
+            path.append(divmod(current, self.cols))
+        return path
@@ -0,0 +1,791 @@
+# grid_engine.py
+import heapq
+import math
+from array import array
+from collections import deque
+
+import instrumentation
+
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+# Generation stamps are stored as unsigned 32-bit values
+MAX_GENERATION = 2 ** 32 - 1
+
+SQRT2 = math.sqrt(2)
+
+# Expansions between calls to GridEngine.on_progress, must be a power of two
+PROGRESS_INTERVAL = 4096
+
+
+def cell_cost(value):
+    # Cell values: 0 is open ground costing 1 to enter, 1 is a wall, k >= 2 costs k
+    return math.inf if value == 1 else value or 1
+
+
+def manhattan_distance(dr, dc):
+    return dr + dc
+
+
+def chebyshev_distance(dr, dc):
+    return max(dr, dc)
+
+
+def octile_distance(dr, dc):
+    return max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+
+
+class CostModel:
+    """Movement rules for a grid: the allowed steps, the cost of a diagonal step
+    and the obstacle-free distance used as the matching admissible heuristic.
+
+    A step into a terrain cell costs step_cost times the cell's cost, so a
+    diagonal step through mud costs diagonal_cost times as much as a
+    straight one. Every cell costs at least 1, which keeps the distance
+    admissible on weighted grids.
+    """
+
+    def __init__(self, name, directions, diagonal_cost, distance):
+        self.name = name
+        self.directions = directions
+        self.diagonal_cost = diagonal_cost
+        self.distance = distance
+
+    def step_cost(self, dr, dc):
+        return self.diagonal_cost if dr and dc else 1
+
+
+COST_MODELS = {
+    'chebyshev': CostModel('chebyshev', DIRECTIONS, 1, chebyshev_distance),
+    'octile': CostModel('octile', DIRECTIONS, SQRT2, octile_distance),
+    'manhattan': CostModel('manhattan', DIRECTIONS[:4], 1, manhattan_distance),
+}
+
+# 'counter' breaks f ties in insertion order, 'high_g' prefers the node
+# furthest from the start
+TIE_BREAKERS = ('counter', 'high_g')
+
+
+def get_cost_model(cost_model):
+    if isinstance(cost_model, CostModel):
+        return cost_model
+    if cost_model not in COST_MODELS:
+        raise ValueError(
+            f"Unknown cost model '{cost_model}', expected one of {sorted(COST_MODELS)}")
+    return COST_MODELS[cost_model]
+
+
+def grid_shape(grid):
+    rows = len(grid)
+    return rows, len(grid[0]) if rows > 0 else 0
+
+
+def flatten_grid(grid):
+    # (rows, cols, cells) for a list-of-lists grid, cells as one row-major bytearray
+    rows, cols = grid_shape(grid)
+    return rows, cols, bytearray().join(map(bytes, grid))
+
+
+class GridEngine:
+    """Search core over a flat, row-major grid buffer.
+
+    Cell (row, col) lives at index row * cols + col, one byte per cell
+    holding its value (see cell_cost). The distance, parent and closed
+    arrays are allocated once and reused by every search; a per-search
+    generation stamp tells live entries from stale ones, so no search has
+    to clear or rebuild them.
+    """
+
+    def __init__(self, rows, cols, cells=None):
+        self.rows = rows
+        self.cols = cols
+        size = rows * cols
+        self.cells = bytearray(size) if cells is None else cells
+        self.dist = array('d', [0.0]) * size
+        self.parent = array('i', [-1]) * size
+        self.seen = array('I', [0]) * size
+        self.closed = array('I', [0]) * size
+        # Arrays for the backward half of bidirectional searches, allocated on first use
+        self.reverse = None
+        self.generation = 0
+        self.nodes_examined = 0
+        self._moves = {}
+        # Optional on_progress(nodes_examined) hook; returning True cancels the search
+        self.on_progress = None
+        self.cancelled = False
+        # Optional sink that takes this engine's metrics records in place of the
+        # registered sinks
+        self.sink = None
+
+    @classmethod
+    def from_grid(cls, grid):
+        return cls(*flatten_grid(grid))
+
+    def load(self, grid):
+        # Copy a list-of-lists grid into the existing buffer, one row slice at a time
+        cols = self.cols
+        for row, values in enumerate(grid):
+            self.cells[row * cols:(row + 1) * cols] = bytes(values)
+
+    def index(self, node):
+        return node[0] * self.cols + node[1]
+
+    def weighted(self):
+        # Whether any cell is terrain, i.e. neither free nor a wall
+        return bool(bytes(self.cells).translate(None, b'\x00\x01'))
+
+    def node(self, index):
+        return divmod(index, self.cols)
+
+    def moves_for(self, cost_model):
+        if cost_model.name not in self._moves:
+            self._moves[cost_model.name] = [
+                (dr, dc, dr * self.cols + dc, cost_model.step_cost(dr, dc))
+                for dr, dc in cost_model.directions
+            ]
+        return self._moves[cost_model.name]
+
+    def next_generation(self):
+        if self.generation == MAX_GENERATION:
+            self.seen = array('I', [0]) * len(self.seen)
+            self.closed = array('I', [0]) * len(self.closed)
+            if self.reverse is not None:
+                self.reverse = self._reverse_arrays()
+            self.generation = 0
+        self.generation += 1
+        return self.generation
+
+    def _reverse_arrays(self):
+        size = self.rows * self.cols
+        dist, parent = array('d', [0.0]) * size, array('i', [-1]) * size
+        return dist, parent, array('I', [0]) * size, array('I', [0]) * size
+
+    def _metrics(self, algorithm):
+        # A SearchMetrics to fill in, or None while no instrumentation sink is added
+        if not instrumentation.sinks:
+            return None
+        cells = self.rows * self.cols
+        return instrumentation.SearchMetrics(algorithm, cells, self.sink)
+
+    def search(self, start, goal, heuristic=None, cost_model='chebyshev',
+               tie_breaker='counter', algorithm=None):
+        # Dijkstra when heuristic is None, A* otherwise; heuristic maps a flat index to
+        # a lower bound. algorithm names the search in metrics records
+        metrics = self._metrics(algorithm or ('astar' if heuristic else 'dijkstra'))
+        target = self.index(goal)
+        source = self.index(start)
+        found = self._run(source, {target}, heuristic, cost_model, tie_breaker, metrics)
+        path = self.path_to(target) if found else []
+        if metrics:
+            metrics.phase('reconstruction')
+            metrics.finish()
+        return path
+
+    def search_tree(self, start, goals, cost_model='chebyshev'):
+        # One Dijkstra tree from start, stopped once every goal is settled; returns
+        # {goal: path}, with an empty path for goals it does not reach
+        metrics = self._metrics('search_tree')
+        targets = {self.index(goal) for goal in goals}
+        self._run(self.index(start), targets, None, cost_model, 'counter', metrics)
+        closed, gen = self.closed, self.generation
+        paths = {}
+        for goal in goals:
+            index = self.index(goal)
+            paths[goal] = self.path_to(index) if closed[index] == gen else []
+        if metrics:
+            metrics.phase('reconstruction')
+            metrics.finish()
+        return paths
+
+    def distances(self, start, goals, cost_model='chebyshev'):
+        # Like search_tree but returns {goal: cost} for the reachable goals,
+        # skipping path reconstruction
+        targets = {self.index(goal) for goal in goals}
+        metrics = self._metrics('distances')
+        self._run(self.index(start), targets, None, cost_model, 'counter', metrics)
+        closed, dist, gen = self.closed, self.dist, self.generation
+        indices = {goal: self.index(goal) for goal in goals}
+        costs = {
+            goal: dist[index] for goal, index in indices.items() if closed[index] == gen
+        }
+        if metrics:
+            metrics.phase('reconstruction')
+            metrics.finish()
+        return costs
+
+    def search_steps(self, start, goal, heuristic=None, cost_model='chebyshev',
+                     tie_breaker='counter', batch_size=256):
+        """Resumable search, yields (opened, closed) lists every batch_size expansions.
+
+        opened holds the cells pushed onto the frontier and closed the cells
+        expanded since the previous batch; the generator returns the path.
+        The engine's arrays stay in use until it finishes, so a stepped
+        search needs an engine of its own.
+        """
+        metrics = self._metrics('astar_steps' if heuristic else 'dijkstra_steps')
+        target = self.index(goal)
+        cols = self.cols
+        expansion = self._expand(self.index(start), {target}, heuristic, cost_model,
+                                 tie_breaker, batch_size, metrics)
+        while True:
+            try:
+                opened, closed = next(expansion)
+            except StopIteration as done:
+                path = self.path_to(target) if done.value else []
+                if metrics:
+                    metrics.phase('reconstruction')
+                    metrics.finish()
+                return path
+            opened_cells = [divmod(index, cols) for index in opened]
+            yield opened_cells, [divmod(index, cols) for index in closed]
+
+    def _run(self, source, targets, heuristic, cost_model, tie_breaker, metrics=None):
+        # Expand from source until every index in targets is settled, returns
+        # whether they all were
+        expansion = self._expand(
+            source, targets, heuristic, cost_model, tie_breaker, 0, metrics)
+        while True:
+            try:
+                next(expansion)
+            except StopIteration as done:
+                return done.value
+
+    def _expand(self, source, targets, heuristic, cost_model, tie_breaker, batch_size,
+                metrics=None):
+        # The search loop itself; only yields (and only records deltas) when batch_size
+        # is set. Push and pop totals fall out of counter and the final heap size, so
+        # metrics only costs extra per push
+        if tie_breaker not in TIE_BREAKERS:
+            raise ValueError(
+                f"Unknown tie breaker '{tie_breaker}', expected one of {TIE_BREAKERS}")
+        model = get_cost_model(cost_model)
+        if tie_breaker == 'counter' and model.diagonal_cost == int(model.diagonal_cost):
+            return (yield from self._expand_buckets(
+                source, targets, heuristic, model, batch_size, metrics))
+        rows, cols = self.rows, self.cols
+        cells, dist, parent = self.cells, self.dist, self.parent
+        seen, closed = self.seen, self.closed
+        moves = self.moves_for(model)
+        high_g = tie_breaker == 'high_g'
+        on_progress = self.on_progress
+        progress_mask = PROGRESS_INTERVAL - 1
+        self.cancelled = False
+        gen = self.next_generation()
+        pending = set(targets)
+
+        dist[source] = 0.0
+        parent[source] = -1
+        seen[source] = gen
+        priority = heuristic(source) if heuristic else 0
+        open_list = [(priority, 0, 0, source) if high_g else (priority, 0, source)]
+        counter = 0
+        nodes_examined = 0
+        opened_batch, closed_batch = [], []
+        counting = metrics is not None
+        requeued = high_water = 0
+        if counting:
+            metrics.phase('setup')
+
+        while open_list:
+            current = heapq.heappop(open_list)[-1]
+            if closed[current] == gen:
+                continue
+            closed[current] = gen
+            nodes_examined += 1
+            if batch_size:
+                closed_batch.append(current)
+                if len(closed_batch) >= batch_size:
+                    self.nodes_examined = nodes_examined
+                    yield opened_batch, closed_batch
+                    opened_batch, closed_batch = [], []
+            if current in pending:
+                pending.discard(current)
+                if not pending:
+                    break
+            if (on_progress is not None and not (nodes_examined & progress_mask)
+                    and on_progress(nodes_examined)):
+                self.cancelled = True
+                break
+
+            row, col = divmod(current, cols)
+            current_cost = dist[current]
+            for dr, dc, offset, step in moves:
+                nr, nc = row + dr, col + dc
+                if nr < 0 or nr >= rows or nc < 0 or nc >= cols:
+                    continue
+                neighbor = current + offset
+                value = cells[neighbor]
+                if value == 1:
+                    continue
+                tentative_cost = current_cost + (step * value if value else step)
+                if seen[neighbor] != gen or tentative_cost < dist[neighbor]:
+                    if counting:
+                        requeued += seen[neighbor] == gen
+                        high_water = max(high_water, len(open_list) + 1)
+                    seen[neighbor] = gen
+                    dist[neighbor] = tentative_cost
+                    parent[neighbor] = current
+                    priority = tentative_cost
+                    if heuristic:
+                        priority += heuristic(neighbor)
+                    counter += 1
+                    if high_g:
+                        entry = (priority, -tentative_cost, counter, neighbor)
+                        heapq.heappush(open_list, entry)
+                    else:
+                        heapq.heappush(open_list, (priority, counter, neighbor))
+                    if batch_size:
+                        opened_batch.append(neighbor)
+
+        self.nodes_examined = nodes_examined
+        if counting:
+            self._count(metrics, counter, len(open_list), nodes_examined, requeued,
+                        high_water, not pending)
+        if batch_size and (opened_batch or closed_batch):
+            yield opened_batch, closed_batch
+        return not pending
+
+    def _expand_buckets(self, source, targets, heuristic, model, batch_size,
+                        metrics=None):
+        """_expand on Dial's bucket queue instead of a heap, for whole-number costs.
+
+        Priorities are then whole numbers (the heuristic must return whole
+        numbers too, as every distance of such a model does), so the open
+        list is a FIFO bucket per priority. With a consistent heuristic no
+        push lands below the bucket being emptied, and the live buckets span
+        at most a couple of step costs, so moving on to the smallest one is
+        cheap. Pushes and pops are O(1) whatever the terrain costs, and the
+        FIFO order expands cells exactly as the heap's 'counter' tie breaker
+        does.
+        """
+        rows, cols = self.rows, self.cols
+        cells, dist, parent = self.cells, self.dist, self.parent
+        seen, closed = self.seen, self.closed
+        moves = self.moves_for(model)
+        on_progress = self.on_progress
+        progress_mask = PROGRESS_INTERVAL - 1
+        self.cancelled = False
+        gen = self.next_generation()
+        pending = set(targets)
+
+        dist[source] = 0.0
+        parent[source] = -1
+        seen[source] = gen
+        cursor = int(heuristic(source)) if heuristic else 0
+        bucket = deque([source])
+        buckets = {cursor: bucket}
+        queued = 1
+        counter = 0
+        nodes_examined = 0
+        opened_batch, closed_batch = [], []
+        counting = metrics is not None
+        requeued = high_water = 0
+        if counting:
+            metrics.phase('setup')
+
+        while queued:
+            if not bucket:
+                del buckets[cursor]
+                cursor = min(buckets)
+                bucket = buckets[cursor]
+            current = bucket.popleft()
+            queued -= 1
+            if closed[current] == gen:
+                continue
+            closed[current] = gen
+            nodes_examined += 1
+            if batch_size:
+                closed_batch.append(current)
+                if len(closed_batch) >= batch_size:
+                    self.nodes_examined = nodes_examined
+                    yield opened_batch, closed_batch
+                    opened_batch, closed_batch = [], []
+            if current in pending:
+                pending.discard(current)
+                if not pending:
+                    break
+            if (on_progress is not None and not (nodes_examined & progress_mask)
+                    and on_progress(nodes_examined)):
+                self.cancelled = True
+                break
+
+            row, col = divmod(current, cols)
+            current_cost = dist[current]
+            for dr, dc, offset, step in moves:
+                nr, nc = row + dr, col + dc
+                if nr < 0 or nr >= rows or nc < 0 or nc >= cols:
+                    continue
+                neighbor = current + offset
+                value = cells[neighbor]
+                if value == 1:
+                    continue
+                tentative_cost = current_cost + (step * value if value else step)
+                if seen[neighbor] != gen or tentative_cost < dist[neighbor]:
+                    if counting:
+                        requeued += seen[neighbor] == gen
+                        high_water = max(high_water, queued + 1)
+                    seen[neighbor] = gen
+                    dist[neighbor] = tentative_cost
+                    parent[neighbor] = current
+                    priority = tentative_cost
+                    if heuristic:
+                        priority += heuristic(neighbor)
+                    priority = int(priority)
+                    counter += 1
+                    target_bucket = buckets.get(priority)
+                    if target_bucket is None:
+                        target_bucket = buckets[priority] = deque()
+                    target_bucket.append(neighbor)
+                    queued += 1
+                    if batch_size:
+                        opened_batch.append(neighbor)
+
+        self.nodes_examined = nodes_examined
+        if counting:
+            self._count(metrics, counter, queued, nodes_examined, requeued, high_water,
+                        not pending)
+        if batch_size and (opened_batch or closed_batch):
+            yield opened_batch, closed_batch
+        return not pending
+
+    @staticmethod
+    def _count(metrics, counter, remaining, nodes_examined, requeued, high_water,
+               found):
+        metrics.phase('search')
+        metrics.found = found
+        metrics.nodes_examined = nodes_examined
+        metrics.pushes = counter + 1
+        metrics.pops = metrics.pushes - remaining
+        metrics.requeued = requeued
+        metrics.heap_high_water = max(high_water, 1)
+
+    def bidirectional_search(self, start, goal, cost_model='chebyshev', informed=False):
+        """Dijkstra, or A* when informed, grown from both ends until the frontiers meet.
+
+        Each step expands the side with the smaller open list. mu is the cost
+        of the best start-goal path seen through an edge joining the two
+        searches; it is optimal once the two frontier minima add up to mu,
+        or for A* (each side with a consistent heuristic towards its own
+        target) once either frontier's smallest f reaches mu. The forward
+        half lives in the usual arrays and the backward half in
+        self.reverse. A search may leave a walled start but not enter a
+        wall, so the backward search may step onto start and no further.
+        A backward step from a cell to its neighbour stands for the forward
+        move into that cell, so it is charged that cell's terrain cost.
+        """
+        name = 'bidirectional_astar' if informed else 'bidirectional_dijkstra'
+        metrics = self._metrics(name)
+        rows, cols = self.rows, self.cols
+        cells = self.cells
+        moves = self.moves_for(get_cost_model(cost_model))
+        if self.reverse is None:
+            self.reverse = self._reverse_arrays()
+        on_progress = self.on_progress
+        progress_mask = PROGRESS_INTERVAL - 1
+        self.cancelled = False
+        gen = self.next_generation()
+        source, target = self.index(start), self.index(goal)
+        if informed:
+            to_goal = self.heuristic_for(goal, cost_model)
+            to_start = self.heuristic_for(start, cost_model)
+        else:
+            to_goal = to_start = None
+
+        forward = (self.dist, self.parent, self.seen, self.closed)
+        backward = self.reverse
+        for (dist, parent, seen, _), index in ((forward, source), (backward, target)):
+            dist[index] = 0.0
+            parent[index] = -1
+            seen[index] = gen
+        open_forward = [(to_goal(source) if informed else 0, 0, source)]
+        open_backward = []
+        if cells[target] != 1:
+            open_backward.append((to_start(target) if informed else 0, 0, target))
+        counter = 0
+        nodes_examined = 0
+        # Best meeting cost so far and the edge it crosses as (forward, backward) ends
+        mu = math.inf
+        meeting = None
+        if source == target:
+            mu, meeting = 0.0, (source, target)
+        counting = metrics is not None
+        requeued = high_water = 0
+        if counting:
+            metrics.phase('setup')
+
+        while open_forward and open_backward:
+            if informed:
+                if max(open_forward[0][0], open_backward[0][0]) >= mu:
+                    break
+            elif open_forward[0][0] + open_backward[0][0] >= mu:
+                break
+            is_forward = len(open_forward) <= len(open_backward)
+            if is_forward:
+                open_list, heuristic = open_forward, to_goal
+                arrays, other = forward, backward
+            else:
+                open_list, heuristic = open_backward, to_start
+                arrays, other = backward, forward
+            dist, parent, seen, closed = arrays
+            other_dist, _, other_seen, _ = other
+
+            current = heapq.heappop(open_list)[-1]
+            if closed[current] == gen:
+                continue
+            closed[current] = gen
+            nodes_examined += 1
+            if (on_progress is not None and not (nodes_examined & progress_mask)
+                    and on_progress(nodes_examined)):
+                self.cancelled = True
+                meeting = None
+                break
+            # Only start can be a wall on the backward side, and nothing may
+            # step out of it towards goal
+            if not is_forward and cells[current] == 1:
+                continue
+
+            row, col = divmod(current, cols)
+            current_cost = dist[current]
+            # Every backward step enters current in forward terms
+            entered = cells[current]
+            for dr, dc, offset, step in moves:
+                nr, nc = row + dr, col + dc
+                if nr < 0 or nr >= rows or nc < 0 or nc >= cols:
+                    continue
+                neighbor = current + offset
+                value = cells[neighbor]
+                if value == 1 and (is_forward or neighbor != source):
+                    continue
+                if is_forward:
+                    entered = value
+                tentative_cost = current_cost + (step * entered if entered else step)
+                if other_seen[neighbor] == gen:
+                    through = tentative_cost + other_dist[neighbor]
+                    if through < mu:
+                        mu = through
+                        meeting = (current, neighbor)
+                        if not is_forward:
+                            meeting = (neighbor, current)
+                if seen[neighbor] != gen or tentative_cost < dist[neighbor]:
+                    if counting:
+                        requeued += seen[neighbor] == gen
+                        queued = len(open_forward) + len(open_backward) + 1
+                        high_water = max(high_water, queued)
+                    seen[neighbor] = gen
+                    dist[neighbor] = tentative_cost
+                    parent[neighbor] = current
+                    counter += 1
+                    priority = tentative_cost
+                    if heuristic:
+                        priority += heuristic(neighbor)
+                    heapq.heappush(open_list, (priority, counter, neighbor))
+
+        self.nodes_examined = nodes_examined
+        if counting:
+            # Both sides start with one push, hence counter + 1 pushes besides
+            # the one _count adds
+            remaining = len(open_forward) + len(open_backward)
+            self._count(metrics, counter + 1, remaining, nodes_examined, requeued,
+                        high_water, meeting is not None)
+        path = []
+        if meeting is not None:
+            forward_end, current = meeting
+            path = self.path_to(forward_end)
+            reverse_parent = backward[1]
+            if current != forward_end:
+                while current != -1:
+                    path.append(divmod(current, cols))
+                    current = reverse_parent[current]
+        if counting:
+            metrics.phase('reconstruction')
+            metrics.finish()
+        return path
+
+    def jump_point_search(self, start, goal, cost_model='chebyshev'):
+        # Jump Point Search for uniform-cost 8-connected grids; the path it
+        # returns is interpolated to every cell
+        model = get_cost_model(cost_model)
+        if model.directions is not DIRECTIONS:
+            raise ValueError(
+                "Jump Point Search needs an 8-connected cost model, "
+                f"got '{model.name}'")
+        if self.weighted():
+            raise ValueError("Jump Point Search needs a grid without terrain costs")
+        metrics = self._metrics('jump_point_search')
+        distance = model.distance
+        cols = self.cols
+        dist, parent = self.dist, self.parent
+        seen, closed = self.seen, self.closed
+        on_progress = self.on_progress
+        progress_mask = PROGRESS_INTERVAL - 1
+        self.cancelled = False
+        gen = self.next_generation()
+        source = self.index(start)
+        target = self.index(goal)
+        goal_row, goal_col = goal
+
+        dist[source] = 0.0
+        parent[source] = -1
+        seen[source] = gen
+        estimate = distance(abs(start[0] - goal_row), abs(start[1] - goal_col))
+        open_list = [(estimate, 0, source)]
+        counter = 0
+        nodes_examined = 0
+        found = False
+        counting = metrics is not None
+        requeued = high_water = 0
+        if counting:
+            metrics.phase('setup')
+
+        while open_list:
+            current = heapq.heappop(open_list)[-1]
+            if closed[current] == gen:
+                continue
+            closed[current] = gen
+            nodes_examined += 1
+            if current == target:
+                found = True
+                break
+            if (on_progress is not None and not (nodes_examined & progress_mask)
+                    and on_progress(nodes_examined)):
+                self.cancelled = True
+                break
+
+            row, col = divmod(current, cols)
+            current_cost = dist[current]
+            for dr, dc in self._pruned_directions(row, col, parent[current]):
+                jump_point = self._jump(row, col, dr, dc, goal)
+                if jump_point is None:
+                    continue
+                jr, jc = jump_point
+                neighbor = jr * cols + jc
+                tentative_cost = current_cost + distance(abs(jr - row), abs(jc - col))
+                if seen[neighbor] != gen or tentative_cost < dist[neighbor]:
+                    if counting:
+                        requeued += seen[neighbor] == gen
+                        high_water = max(high_water, len(open_list) + 1)
+                    seen[neighbor] = gen
+                    dist[neighbor] = tentative_cost
+                    parent[neighbor] = current
+                    estimate = distance(abs(jr - goal_row), abs(jc - goal_col))
+                    priority = tentative_cost + estimate
+                    counter += 1
+                    heapq.heappush(open_list, (priority, counter, neighbor))
+
+        self.nodes_examined = nodes_examined
+        if not counting:
+            return self._interpolate(self.path_to(target)) if found else []
+        self._count(metrics, counter, len(open_list), nodes_examined, requeued,
+                    high_water, found)
+        path = self._interpolate(self.path_to(target)) if found else []
+        metrics.phase('reconstruction')
+        metrics.finish()
+        return path
+
+    def _blocked(self, row, col):
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return True
+        return self.cells[row * self.cols + col] == 1
+
+    def _pruned_directions(self, row, col, parent_index):
+        if parent_index == -1:
+            return DIRECTIONS
+        parent_row, parent_col = divmod(parent_index, self.cols)
+        dr = (row > parent_row) - (row < parent_row)
+        dc = (col > parent_col) - (col < parent_col)
+        blocked = self._blocked
+        if dr and dc:
+            directions = [(0, dc), (dr, 0), (dr, dc)]
+            if blocked(row - dr, col):
+                directions.append((-dr, dc))
+            if blocked(row, col - dc):
+                directions.append((dr, -dc))
+        elif dc:
+            directions = [(0, dc)]
+            if blocked(row + 1, col):
+                directions.append((1, dc))
+            if blocked(row - 1, col):
+                directions.append((-1, dc))
+        else:
+            directions = [(dr, 0)]
+            if blocked(row, col + 1):
+                directions.append((dr, 1))
+            if blocked(row, col - 1):
+                directions.append((dr, -1))
+        return directions
+
+    def _jump(self, row, col, dr, dc, goal):
+        blocked = self._blocked
+        while True:
+            row += dr
+            col += dc
+            if blocked(row, col):
+                return None
+            if (row, col) == goal:
+                return row, col
+            if dr and dc:
+                if (blocked(row - dr, col) and not blocked(row - dr, col + dc)) or \
+                        (blocked(row, col - dc) and not blocked(row + dr, col - dc)):
+                    return row, col
+                if self._jump(row, col, dr, 0, goal) is not None:
+                    return row, col
+                if self._jump(row, col, 0, dc, goal) is not None:
+                    return row, col
+            elif dc:
+                if (blocked(row + 1, col) and not blocked(row + 1, col + dc)) or \
+                        (blocked(row - 1, col) and not blocked(row - 1, col + dc)):
+                    return row, col
+            else:
+                if (blocked(row, col + 1) and not blocked(row + dr, col + 1)) or \
+                        (blocked(row, col - 1) and not blocked(row + dr, col - 1)):
+                    return row, col
+
+    @staticmethod
+    def _interpolate(jump_points):
+        # Expand consecutive jump points, which always lie on a straight or
+        # diagonal line, into single steps
+        if not jump_points:
+            return []
+        path = [jump_points[0]]
+        for row, col in jump_points[1:]:
+            current_row, current_col = path[-1]
+            dr = (row > current_row) - (row < current_row)
+            dc = (col > current_col) - (col < current_col)
+            while (current_row, current_col) != (row, col):
+                current_row += dr
+                current_col += dc
+                path.append((current_row, current_col))
+        return path
+
+    def path_to(self, target):
+        path = []
+        parent = self.parent
+        current = target
+        while current != -1:
+            path.append(divmod(current, self.cols))
+            current = parent[current]
+        path.reverse()
+        return path
+
+    def heuristic_for(self, goal, cost_model='chebyshev'):
+        distance = get_cost_model(cost_model).distance
+        cols = self.cols
+        goal_row, goal_col = goal
+
+        def heuristic(index):
+            row, col = divmod(index, cols)
+            return distance(abs(row - goal_row), abs(col - goal_col))
+
+        return heuristic
+
+
+_engine = None
+
+
+def engine_for(grid):
+    """Return a shared engine loaded with grid, reusing arrays of the same shape."""
+    global _engine
+    rows, cols = grid_shape(grid)
+    if _engine is None or _engine.rows != rows or _engine.cols != cols:
+        _engine = GridEngine(rows, cols)
+    _engine.load(grid)
+    return _engine
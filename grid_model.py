@@ -0,0 +1,188 @@
+# grid_model.py
+# Grid state shared by the pygame app and the headless tools; nothing here may
+# import pygame
+import heapq
+import random
+from array import array
+
+from connectivity import ConnectivityIndex
+
+
+class Grid:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = 25
+        self.grid = [[0] * cols for _ in range(rows)]
+        self.connectivity_index = None
+        self.listeners = []
+        self.version = 0
+
+    def reset(self):
+        self.grid = [[0] * self.cols for _ in range(self.rows)]
+        self.connectivity_index = None
+        self.listeners = []
+        self.version += 1
+
+    def add_listener(self, listener):
+        # listener(row, col, value) is called after every set_cell that changes a cell
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def set_cell(self, row, col, value):
+        if self.grid[row][col] == value:
+            return
+        self.grid[row][col] = value
+        self.version += 1
+        if self.connectivity_index is not None:
+            self.connectivity_index.set_cell(row, col, value)
+        for listener in self.listeners:
+            listener(row, col, value)
+
+    def connectivity(self, directions):
+        # Built on first use and kept up to date by set_cell afterwards
+        index = self.connectivity_index
+        if index is None or index.directions != directions:
+            self.connectivity_index = ConnectivityIndex.from_grid(self.grid, directions)
+        return self.connectivity_index
+
+
+class Node:
+    def __init__(self, row, col):
+        self.row = row
+        self.col = col
+        self.neighbors = []
+        # Edge cost per neighbour, 1 unless the graph is weighted
+        self.costs = {}
+
+    def add_neighbor(self, neighbor, cost=1):
+        if neighbor not in self.costs:
+            self.neighbors.append(neighbor)
+        self.costs[neighbor] = cost
+
+    def remove_neighbor(self, neighbor):
+        if self.costs.pop(neighbor, None) is not None:
+            self.neighbors.remove(neighbor)
+
+class Graph:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self._nodes = None
+
+    @property
+    def nodes(self):
+        # A node object per cell is costly on large grids, so they are only built
+        # when first used
+        if self._nodes is None:
+            cols = range(self.cols)
+            self._nodes = [[Node(row, col) for col in cols] for row in range(self.rows)]
+            self.build_graph()
+        return self._nodes
+
+    def build_graph(self):
+        nodes = self.nodes
+        for row in range(self.rows):
+            for col in range(self.cols):
+                current_node = nodes[row][col]
+                for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+                    nr, nc = row + dr, col + dc
+                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                        current_node.add_neighbor(nodes[nr][nc])
+
+
+class MazeGenerator:
+    """Base class for maze generators over a Graph's rows and cols.
+
+    Subclasses fill a flat bytearray of cells (1 is a wall) in build();
+    generate_maze() then makes sure start and goal are free and joined,
+    carving through walls where needed, and returns the grid as a list of rows.
+    Passing a seed makes the result reproducible.
+    """
+
+    # Set by generators whose free cells form one region that includes every
+    # (even, even) cell
+    connected = False
+
+    def __init__(self, graph, seed=None):
+        self.graph = graph
+        self.random = random.Random(seed)
+
+    def generate_maze(self, start=None, goal=None):
+        rows, cols = self.graph.rows, self.graph.cols
+        start = start or (0, 0)
+        goal = goal or (rows - 1, cols - 1)
+        cells = self.build(rows, cols)
+        if self.connected:
+            # The free cells already form one region, a walled endpoint only needs
+            # a short tunnel into it
+            for row, col in (start, goal):
+                if cells[row * cols + col] == 1:
+                    nearest = (row - row % 2, col - col % 2)
+                    connect(cells, rows, cols, (row, col), nearest)
+        else:
+            connect(cells, rows, cols, start, goal)
+        return [list(cells[row * cols:(row + 1) * cols]) for row in range(rows)]
+
+    def build(self, rows, cols):
+        raise NotImplementedError
+
+
+class NullAlgorithm(MazeGenerator):
+  # An empty grid, every cell free
+  connected = True
+
+  def build(self, rows, cols):
+      return bytearray(rows * cols)
+
+
+def connect(cells, rows, cols, start, goal, wall_cost=8):
+    """Free start and goal and carve walls until a 4-connected path joins them.
+
+    A weighted A* search (heuristic doubled) treats a wall as passable at
+    wall_cost steps and carves the walls on the path it finds. The path
+    need not carve the fewest walls, but the search heads straight for the
+    goal instead of exhausting start's whole region first, which keeps it
+    to milliseconds on 1000x1000 grids. Returns the number of cells carved.
+    """
+    source, target = start[0] * cols + start[1], goal[0] * cols + goal[1]
+    goal_row, goal_col = goal
+    size = rows * cols
+    cost = array('d', [float('inf')]) * size
+    parent = array('l', [-1]) * size
+    cost[source] = 0
+    # Equal f values are broken towards the larger cost so far, i.e. the cell nearer
+    # the goal
+    open_list = [(0, 0, source)]
+    while open_list:
+        current = heapq.heappop(open_list)[-1]
+        if current == target:
+            break
+        row, col = divmod(current, cols)
+        current_cost = cost[current]
+        for nr, nc in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= nr < rows and 0 <= nc < cols:
+                neighbor = nr * cols + nc
+                step = wall_cost if cells[neighbor] == 1 else 1
+                tentative_cost = current_cost + step
+                if tentative_cost < cost[neighbor]:
+                    cost[neighbor] = tentative_cost
+                    parent[neighbor] = current
+                    estimate = 2 * (abs(nr - goal_row) + abs(nc - goal_col))
+                    priority = tentative_cost + estimate
+                    heapq.heappush(open_list, (priority, -tentative_cost, neighbor))
+    carved = 0
+    for index in (source, target):
+        if cells[index] == 1:
+            cells[index] = 0
+            carved += 1
+    current = parent[target]
+    while current not in (-1, source):
+        if cells[current] == 1:
+            cells[current] = 0
+            carved += 1
+        current = parent[current]
+    return carved
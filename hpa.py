@@ -0,0 +1,437 @@
+# hpa.py
+import heapq
+import math
+
+import instrumentation
+from grid_engine import (
+    DIRECTIONS,
+    GridEngine,
+    cell_cost,
+    flatten_grid,
+    get_cost_model,
+    grid_shape,
+)
+from grid_model import Node
+
+# Runs of open border cells at least this long get an entrance at each end instead of
+# one in the middle
+LONG_ENTRANCE = 6
+
+
+class HierarchicalPlanner:
+    """Hierarchical A* (HPA*) over square clusters of the grid.
+
+    The grid is cut into cluster_size x cluster_size clusters. Where two
+    clusters share a run of free cells along their border, the run gets
+    one or two entrances, and every entrance becomes a Node of the abstract
+    graph. Entrances in the same cluster are joined by edges weighted with
+    their distance inside the cluster, and the two sides of an entrance by
+    a single step. A query links start and goal into their clusters,
+    searches the small abstract graph and then refines every abstract edge
+    with a search confined to one cluster. Paths are near-optimal, not
+    optimal.
+
+    update_cell marks a cluster dirty; dirty clusters and their neighbours
+    are rebuilt on the next query, the rest of the graph is kept.
+
+    Building the graph runs a search inside every cluster from each of its
+    entrances, which is the bulk of the cost: seconds for a few hundred
+    thousand cells, against milliseconds per query afterwards. With an
+    instrumentation sink registered, each path call emits one 'hpa_star'
+    record summing its searches; the searches of builds and rebuilds are
+    not recorded.
+
+    On weighted grids an edge is charged the terrain of the cells it
+    enters, so its two directions can differ; the reverse of a searched
+    edge is priced as the same path walked backwards (see _link).
+    """
+
+    def __init__(self, rows, cols, cells, cluster_size=16, cost_model='chebyshev'):
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.size = cluster_size
+        self.model = get_cost_model(cost_model)
+        self.diagonal = self.model.directions is DIRECTIONS
+        self.cluster_rows = -(-rows // cluster_size)
+        self.cluster_cols = -(-cols // cluster_size)
+        self.nodes = {}
+        self.cluster_nodes = {}
+        self.entrances = {}
+        self.dirty = set()
+        self.nodes_examined = 0
+        self._engines = {}
+        # The record of the query in progress, see emit
+        self._metrics = None
+        self.build()
+
+    @classmethod
+    def from_grid(cls, grid, cluster_size=16, cost_model='chebyshev'):
+        return cls(*flatten_grid(grid), cluster_size, cost_model)
+
+    def build(self):
+        self.nodes = {}
+        self.cluster_nodes = {}
+        self.entrances = {}
+        self.dirty = set()
+        rows, cols = range(self.cluster_rows), range(self.cluster_cols)
+        self._rebuild({(cr, cc) for cr in rows for cc in cols})
+
+    def cluster_of(self, cell):
+        return cell[0] // self.size, cell[1] // self.size
+
+    def update_cell(self, row, col, value):
+        # Same signature as a Grid listener; the rebuild waits for the next query
+        index = row * self.cols + col
+        if self.cells[index] != value:
+            self.cells[index] = value
+            self.dirty.add(self.cluster_of((row, col)))
+
+    def sync(self, cells):
+        # Apply update_cell wherever cells, a flat copy of the grid, differs; rows
+        # that match are skipped with one slice comparison
+        own, cols = self.cells, self.cols
+        for begin in range(0, self.rows * cols, cols):
+            end = begin + cols
+            if cells[begin:end] != own[begin:end]:
+                for index in range(begin, end):
+                    if own[index] != cells[index]:
+                        self.update_cell(index // cols, index % cols, cells[index])
+
+    def emit(self, record):
+        # Metrics records of the planner's own engines: folded into the running query's
+        # record, or dropped while no query runs
+        metrics = self._metrics
+        if metrics is not None:
+            metrics.pushes += record['pushes']
+            metrics.pops += record['pops']
+            metrics.requeued += record['requeued']
+            high_water = record['heap_high_water']
+            metrics.heap_high_water = max(metrics.heap_high_water, high_water)
+
+    def path(self, start, goal):
+        if self.dirty:
+            affected = set(self.dirty)
+            for cluster in self.dirty:
+                affected.update(self._neighbor_clusters(cluster))
+            self.dirty = set()
+            self._rebuild(affected)
+        self.nodes_examined = 0
+        if instrumentation.sinks:
+            cells = self.rows * self.cols
+            self._metrics = instrumentation.SearchMetrics('hpa_star', cells)
+        metrics = self._metrics
+        try:
+            path = self._query(start, goal)
+        finally:
+            self._metrics = None
+        if metrics:
+            metrics.found = bool(path)
+            metrics.nodes_examined = self.nodes_examined
+            metrics.finish()
+        return path
+
+    def _query(self, start, goal):
+        if start == goal:
+            return [start]
+        if self.cells[goal[0] * self.cols + goal[1]] == 1:
+            return []
+
+        temporary = []
+        start_node = self._attach(start, temporary)
+        query = [start]
+        if self.cells[start[0] * self.cols + start[1]] == 1:
+            # A walled start may still be left, including straight into a neighbouring
+            # cluster, which no entrance covers; link it to those neighbours directly
+            for dr, dc in self.model.directions:
+                neighbor = (start[0] + dr, start[1] + dc)
+                outside = self.cluster_of(neighbor) != self.cluster_of(start)
+                if self._free(*neighbor) and outside:
+                    cost = self.model.step_cost(dr, dc) * self._cost(neighbor)
+                    start_node.add_neighbor(self._attach(neighbor, temporary), cost)
+                    query.append(neighbor)
+        goal_node = self._attach(goal, temporary)
+        if goal not in query:
+            query.append(goal)
+        # Query cells in the same or neighbouring clusters also get a direct edge
+        # through the box around their clusters, so nearby queries are not forced
+        # through an entrance
+        direct = {}
+        added = {(node.row, node.col) for node in temporary}
+        for i, cell in enumerate(query):
+            for other in query[i + 1:]:
+                bounds = self._box(self.cluster_of(cell), self.cluster_of(other))
+                if bounds is None or (cell not in added and other not in added):
+                    # Edges between two permanent nodes would outlive the query
+                    continue
+                for _, cost in self._local_search(cell, [other], bounds).items():
+                    self._link(cell, other, cost)
+                    direct[cell, other] = direct[other, cell] = bounds
+        if self._metrics:
+            self._metrics.phase('setup')
+        try:
+            abstract = self._abstract_search(start_node, goal_node)
+            if self._metrics:
+                self._metrics.phase('search')
+        finally:
+            for node in temporary:
+                for neighbor in list(node.neighbors):
+                    neighbor.remove_neighbor(node)
+                del self.nodes[(node.row, node.col)]
+        if not abstract:
+            return []
+        path = self._refine(abstract, direct)
+        if self._metrics:
+            self._metrics.phase('reconstruction')
+        return path
+
+    def _neighbor_clusters(self, cluster):
+        cr, cc = cluster
+        steps = DIRECTIONS if self.diagonal else DIRECTIONS[:4]
+        for dr, dc in steps:
+            if 0 <= cr + dr < self.cluster_rows and 0 <= cc + dc < self.cluster_cols:
+                yield cr + dr, cc + dc
+
+    def _box(self, a, b):
+        # Bounds covering clusters a and b when they are the same or neighbours, or None
+        if abs(a[0] - b[0]) > 1 or abs(a[1] - b[1]) > 1:
+            return None
+        if not self.diagonal and a[0] != b[0] and a[1] != b[1]:
+            return None
+        a_bounds, b_bounds = self._bounds(a), self._bounds(b)
+        return (
+            min(a_bounds[0], b_bounds[0]), min(a_bounds[1], b_bounds[1]),
+            max(a_bounds[2], b_bounds[2]), max(a_bounds[3], b_bounds[3]),
+        )
+
+    def _bounds(self, cluster):
+        size = self.size
+        top, left = cluster[0] * size, cluster[1] * size
+        return top, left, min(top + size, self.rows), min(left + size, self.cols)
+
+    def _free(self, row, col):
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+        return self.cells[row * self.cols + col] != 1
+
+    def _cost(self, cell):
+        return cell_cost(self.cells[cell[0] * self.cols + cell[1]])
+
+    def _link(self, source, target, cost):
+        # Edges both ways for a searched source -> target cost; walking the same path
+        # back enters source instead of target, which is exact for equal step costs and
+        # an upper bound otherwise
+        self.nodes[source].add_neighbor(self.nodes[target], cost)
+        source_cost, target_cost = self._cost(source), self._cost(target)
+        if source_cost != target_cost:
+            cost = cost - target_cost + source_cost
+        if cost != math.inf:
+            self.nodes[target].add_neighbor(self.nodes[source], cost)
+
+    def _rebuild(self, affected):
+        # Recompute the entrances between every pair of affected clusters (a corner
+        # crossing between two neighbours of a dirty cluster depends on its cells too),
+        # then their nodes and edges; nodes elsewhere keep their edges
+        for cluster in affected:
+            for neighbor in self._neighbor_clusters(cluster):
+                if cluster < neighbor and neighbor in affected:
+                    entrances = self._border_entrances(cluster, neighbor)
+                    self.entrances[cluster, neighbor] = entrances
+        for cluster in affected:
+            for cell in self.cluster_nodes.pop(cluster, ()):
+                node = self.nodes.pop(cell)
+                for neighbor in list(node.neighbors):
+                    neighbor.remove_neighbor(node)
+        for cluster in affected:
+            cells = set()
+            for neighbor in self._neighbor_clusters(cluster):
+                pair = (min(cluster, neighbor), max(cluster, neighbor))
+                for a, b, _ in self.entrances.get(pair, ()):
+                    cells.add(a if self.cluster_of(a) == cluster else b)
+            self.cluster_nodes[cluster] = cells
+            for cell in cells:
+                self.nodes[cell] = Node(*cell)
+        for cluster in affected:
+            for neighbor in self._neighbor_clusters(cluster):
+                pair = (min(cluster, neighbor), max(cluster, neighbor))
+                for a, b, step in self.entrances.get(pair, ()):
+                    self.nodes[a].add_neighbor(self.nodes[b], step * self._cost(b))
+                    self.nodes[b].add_neighbor(self.nodes[a], step * self._cost(a))
+            cells = sorted(self.cluster_nodes[cluster])
+            for i, cell in enumerate(cells):
+                distances = self._local_search(cell, cells[i + 1:])
+                for other, cost in distances.items():
+                    self._link(cell, other, cost)
+
+    def _border_entrances(self, a, b):
+        # (cell in a, cell in b, step cost before terrain) for every entrance between
+        # clusters a < b
+        free = self._free
+        step_cost = self.model.step_cost
+        a_top, a_left, a_bottom, a_right = self._bounds(a)
+        b_top, b_left, b_bottom, b_right = self._bounds(b)
+        if a[0] != b[0] and a[1] != b[1]:
+            # Diagonal neighbours touch at one corner, crossed only when both orthogonal
+            # cells are walls
+            row = a_bottom - 1
+            col = a_right - 1 if b[1] > a[1] else a_left
+            other = (row + 1, col + 1) if b[1] > a[1] else (row + 1, col - 1)
+            blocked = not free(row, other[1]) and not free(other[0], col)
+            if free(row, col) and free(*other) and blocked:
+                return [((row, col), other, step_cost(1, 1))]
+            return []
+        if a[0] == b[0]:
+            # Side by side: walk down the shared column pair
+            rows = range(a_top, a_bottom)
+            line = [((row, a_right - 1), (row, b_left)) for row in rows]
+        else:
+            cols = range(a_left, a_right)
+            line = [((a_bottom - 1, col), (b_top, col)) for col in cols]
+        entrances = []
+        runs = [[]]
+        for position, (cell_a, cell_b) in enumerate(line):
+            if free(*cell_a) and free(*cell_b):
+                runs[-1].append(position)
+            elif runs[-1]:
+                runs.append([])
+        for run in runs:
+            if run:
+                if len(run) >= LONG_ENTRANCE:
+                    ends = [run[0], run[-1]]
+                else:
+                    ends = [run[len(run) // 2]]
+                entrances.extend((line[end][0], line[end][1], 1) for end in ends)
+        if self.diagonal:
+            # Diagonal squeezes along the border that no orthogonal run covers
+            for position in range(len(line) - 1):
+                first, second = line[position], line[position + 1]
+                for (cell_a, _), (_, cell_b) in ((first, second), (second, first)):
+                    corners = (cell_a[0], cell_b[1]), (cell_b[0], cell_a[1])
+                    squeezed = not any(free(*corner) for corner in corners)
+                    if free(*cell_a) and free(*cell_b) and squeezed:
+                        entrances.append((cell_a, cell_b, step_cost(1, 1)))
+        return entrances
+
+    def _region_engine(self, bounds):
+        # A GridEngine holding just the cells inside bounds, shared by regions of the
+        # same shape
+        top, left, bottom, right = bounds
+        height, width = bottom - top, right - left
+        engine = self._engines.get((height, width))
+        if engine is None:
+            engine = self._engines[(height, width)] = GridEngine(height, width)
+            engine.sink = self
+        cells, cols = self.cells, self.cols
+        for row in range(height):
+            offset = (top + row) * cols + left
+            engine.cells[row * width:(row + 1) * width] = cells[offset:offset + width]
+        return engine, top, left
+
+    def _local_search(self, source, targets, bounds=None):
+        # Cost from source to each reachable target, moving only inside bounds (default
+        # source's cluster)
+        if not targets:
+            return {}
+        bounds = bounds or self._bounds(self.cluster_of(source))
+        engine, top, left = self._region_engine(bounds)
+        local = {(row - top, col - left): (row, col) for row, col in targets}
+        origin = (source[0] - top, source[1] - left)
+        costs = engine.distances(origin, list(local), self.model)
+        self.nodes_examined += engine.nodes_examined
+        return {local[target]: cost for target, cost in costs.items()}
+
+    def _attach(self, cell, temporary):
+        # The abstract node for cell, creating a temporary one linked to its cluster's
+        # entrances if needed
+        if cell in self.nodes:
+            return self.nodes[cell]
+        node = self.nodes[cell] = Node(*cell)
+        temporary.append(node)
+        entrances = sorted(self.cluster_nodes.get(self.cluster_of(cell), ()))
+        for other, cost in self._local_search(cell, entrances).items():
+            self._link(cell, other, cost)
+        return node
+
+    def _abstract_search(self, start, goal):
+        distance = self.model.distance
+        goal_row, goal_col = goal.row, goal.col
+        cost = {start: 0}
+        parent = {start: None}
+        closed = set()
+        counter = requeued = high_water = 0
+        open_list = [(0, counter, start)]
+        nodes = []
+        while open_list:
+            current = heapq.heappop(open_list)[-1]
+            if current in closed:
+                continue
+            closed.add(current)
+            self.nodes_examined += 1
+            if current is goal:
+                while current is not None:
+                    nodes.append(current)
+                    current = parent[current]
+                nodes.reverse()
+                break
+            for neighbor in current.neighbors:
+                tentative_cost = cost[current] + current.costs[neighbor]
+                if neighbor not in cost or tentative_cost < cost[neighbor]:
+                    if neighbor in cost:
+                        requeued += 1
+                    cost[neighbor] = tentative_cost
+                    parent[neighbor] = current
+                    counter += 1
+                    dr, dc = abs(neighbor.row - goal_row), abs(neighbor.col - goal_col)
+                    priority = tentative_cost + distance(dr, dc)
+                    heapq.heappush(open_list, (priority, counter, neighbor))
+            if len(open_list) > high_water:
+                high_water = len(open_list)
+        self.emit({
+            'pushes': counter + 1,
+            'pops': counter + 1 - len(open_list),
+            'requeued': requeued,
+            'heap_high_water': max(high_water, 1),
+        })
+        return nodes
+
+    def _refine(self, abstract, direct):
+        # Expand each abstract edge into cells: a search inside the box of a direct edge
+        # or inside a cluster, or a single step across a border
+        path = [(abstract[0].row, abstract[0].col)]
+        for node in abstract[1:]:
+            source, target = path[-1], (node.row, node.col)
+            cluster = self.cluster_of(source)
+            bounds = direct.get((source, target))
+            if bounds is None and cluster != self.cluster_of(target):
+                path.append(target)
+                continue
+            engine, top, left = self._region_engine(bounds or self._bounds(cluster))
+            local_target = (target[0] - top, target[1] - left)
+            segment = engine.search(
+                (source[0] - top, source[1] - left), local_target,
+                engine.heuristic_for(local_target, self.model), self.model,
+            )
+            self.nodes_examined += engine.nodes_examined
+            path.extend((row + top, col + left) for row, col in segment[1:])
+        return path
+
+
+_planner = None
+
+
+def planner_for(grid, cost_model='chebyshev', cluster_size=16):
+    """Return a shared planner for grid, rebuilding only the clusters that changed.
+
+    A cluster is rebuilt when its cells differ from the last call. The
+    first call for a grid size or cost model builds the whole abstract
+    graph, which takes seconds on large maps (see HierarchicalPlanner).
+    """
+    global _planner
+    rows, cols = grid_shape(grid)
+    model = get_cost_model(cost_model)
+    built = _planner and (_planner.rows, _planner.cols, _planner.size, _planner.model)
+    if built != (rows, cols, cluster_size, model):
+        _planner = HierarchicalPlanner.from_grid(grid, cluster_size, model)
+        return _planner
+    _planner.sync(flatten_grid(grid)[2])
+    return _planner
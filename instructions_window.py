@@ -1,35 +1,67 @@
 # instructions_window.py
 import pygame
-from pygame_utils import initialize_pygame, display_message, update_display
+
+from pygame_utils import MAX_WINDOW_SIZE, display_message, update_display
+
+TITLE = "Algorithm Instructions"
+HELP_LINES = [
+  "Press 's' to place start",
+  "Press 'g' to place goal",
+  "Press 'p' for A* algorithm",
+  "Press 'd' for Dijkstra's algorithm",
+  "Press 'j' for Jump Point Search",
+  "Press 'r' to reset the grid",
+  "Press 'm' to generate a maze",
+  "Press 'q' to close this window",
+  "Press 'z' to save your maze",
+  "Press 'l' to load a maze",
+  "Press 'c' to cycle the cost model",
+  "Press 'n' for incremental D* Lite replanning",
+  "Press 'f' to toggle the frame-time overlay",
+  "Arrows pan, '+'/'-' or the wheel zoom, '0' resets the view",
+  "Press 'x' to cancel a running search",
+  "Press 'v' to watch A*/Dijkstra expand step by step",
+  "Press 'k' to cycle the maze generator used by 'm'",
+  "Press 'h' for hierarchical HPA* on large maps",
+  "Press 'b'/'e' for bidirectional A*/Dijkstra",
+  "Press 'a' for A* with landmark (ALT) heuristics",
+  "Press 't' to paint walls, forest or swamp",
+]
+MARGIN = 10
+TOP = 50
+LINE_HEIGHT = 30
+
 
 def show_instructions(grid_size):
+  # The window is sized to the help text rather than the grid; lines that do not
+  # fit under each other within MAX_WINDOW_SIZE continue in another column
   pygame.init()
-  rows, cols = grid_size, grid_size
-  cell_size = 25
-  screen = initialize_pygame(rows, cols, cell_size, "Algorithm Instructions")
-  
+  font = pygame.font.Font(None, 24)
+  per_column = max(1, (MAX_WINDOW_SIZE[1] - TOP - MARGIN) // LINE_HEIGHT)
+  starts = range(0, len(HELP_LINES), per_column)
+  columns = [HELP_LINES[i:i + per_column] for i in starts]
+  column_width = max(font.size(line)[0] for line in HELP_LINES) + 2 * MARGIN
+  title_width = pygame.font.Font(None, 36).size(TITLE)[0] + 2 * MARGIN
+  width = max(column_width * len(columns), title_width)
+  height = TOP + LINE_HEIGHT * len(columns[0]) + MARGIN
+  screen = pygame.display.set_mode((width, height))
+  pygame.display.set_caption(TITLE)
+
   running = True
   while running:
       for event in pygame.event.get():
-          if event.type == pygame.QUIT:
-              running = False
-          elif event.type == pygame.KEYDOWN and event.key == pygame.K_q:
+          closing = event.type == pygame.KEYDOWN and event.key == pygame.K_q
+          if event.type == pygame.QUIT or closing:
               running = False
-  
+
       screen.fill((255, 255, 255))
-      display_message(screen, "Algorithm Instructions", 36, (10, 10), (0, 0, 0))
-      display_message(screen, "Press 's' to place start", 24, (10, 50), (0, 0, 0))
-      display_message(screen, "Press 'g' to place goal", 24, (10, 80), (0, 0, 0))
-      display_message(screen, "Press 'p' for A* algorithm", 24, (10, 110), (0, 0, 0))
-      display_message(screen, "Press 'd' for Dijkstra's algorithm", 24, (10, 140), (0, 0, 0))
-      display_message(screen, "Press 'r' to reset the grid", 24, (10, 170), (0, 0, 0))
-      display_message(screen, "Press 'm' to generate a random maze", 24, (10, 200), (0, 0, 0))
-      display_message(screen, "Press 'q' to close this window", 24, (10, 230), (0, 0, 0))
-      display_message(screen, "Press 'z' to save your maze", 24, (10, 260), (0, 0, 0))
-      display_message(screen, "Press 'l' to load a maze", 24, (10, 290), (0, 0, 0))
-  
+      display_message(screen, TITLE, 36, (MARGIN, MARGIN), (0, 0, 0))
+      for column, lines in enumerate(columns):
+          for row, line in enumerate(lines):
+              position = (MARGIN + column * column_width, TOP + row * LINE_HEIGHT)
+              display_message(screen, line, 24, position, (0, 0, 0))
+
       update_display()
-  
+
   pygame.quit()
   return grid_size
-
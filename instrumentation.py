@@ -0,0 +1,184 @@
+# instrumentation.py
+"""Per-search counters and phase timings, delivered to pluggable sinks.
+
+Nothing is measured until a sink is registered with add_sink; while the
+sink list is empty the searches skip all bookkeeping apart from one check
+per heap push. A sink is any object with an emit(record) method, where
+record is a flat dict such as
+
+    {'algorithm': 'astar', 'cells': 65536, 'found': True,
+     'nodes_examined': 2341, 'pushes': 2790, 'pops': 2402, 'stale_pops': 61,
+     'requeued': 61, 'heap_high_water': 389, 'setup_s': 0.00001,
+     'search_s': 0.0089, 'reconstruction_s': 0.00004}
+
+Closed cells are never expanded twice, so the work a re-expansion would
+cost shows up as requeued pushes (a cheaper path to a queued cell) and the
+stale_pops they leave behind.
+"""
+import json
+import logging
+import time
+
+COUNTERS = ('nodes_examined', 'pushes', 'pops', 'stale_pops', 'requeued')
+PHASES = ('setup', 'search', 'reconstruction')
+
+sinks = []
+
+
+def add_sink(sink):
+    sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    if sink in sinks:
+        sinks.remove(sink)
+
+
+def emit(record):
+    for sink in sinks:
+        sink.emit(record)
+
+
+class SearchMetrics:
+    """Measurements for one search.
+
+    phase(name) closes the phase that has been running since the last
+    call. finish hands the record to sink instead of the registered sinks when
+    one is given.
+    """
+
+    def __init__(self, algorithm, cells, sink=None):
+        self.algorithm = algorithm
+        self.cells = cells
+        self.sink = sink
+        self.found = False
+        self.nodes_examined = 0
+        self.pushes = 0
+        self.pops = 0
+        self.requeued = 0
+        self.heap_high_water = 0
+        self.timings = {}
+        self._mark = time.perf_counter()
+
+    def phase(self, name):
+        now = time.perf_counter()
+        self.timings[name] = self.timings.get(name, 0.0) + now - self._mark
+        self._mark = now
+
+    def as_dict(self):
+        record = {
+            'algorithm': self.algorithm,
+            'cells': self.cells,
+            'found': self.found,
+            'nodes_examined': self.nodes_examined,
+            'pushes': self.pushes,
+            'pops': self.pops,
+            'stale_pops': self.pops - self.nodes_examined,
+            'requeued': self.requeued,
+            'heap_high_water': self.heap_high_water,
+        }
+        for name in PHASES:
+            record[name + '_s'] = self.timings.get(name, 0.0)
+        return record
+
+    def finish(self):
+        if self.sink is not None:
+            self.sink.emit(self.as_dict())
+        else:
+            emit(self.as_dict())
+
+
+class LogSink:
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger('pathfinding.metrics')
+        self.level = level
+
+    def emit(self, record):
+        text = ' '.join(f"{key}={value}" for key, value in record.items())
+        self.logger.log(self.level, text)
+
+
+class JsonLinesSink:
+    """Appends every record to a file as one JSON object per line.
+
+    The file stays open until close, and every record is flushed as it is
+    written, so a crash loses nothing already emitted.
+    """
+
+    def __init__(self, filename):
+        # Held for the sink's lifetime, released by close or the with block
+        self.file = open(filename, 'a')  # noqa: SIM115
+
+    def emit(self, record):
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CollectingSink:
+    # Keeps the records in memory, handy for tests and the benchmark
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class PrometheusSink:
+    """Aggregates records per algorithm in the Prometheus text exposition format."""
+
+    def __init__(self, prefix='pathfinding'):
+        self.prefix = prefix
+        self.totals = {}
+
+    def emit(self, record):
+        totals = self.totals.setdefault(
+            record['algorithm'], {'searches': 0, 'found': 0, 'heap_high_water': 0})
+        totals['searches'] += 1
+        totals['found'] += record['found']
+        high_water = max(totals['heap_high_water'], record['heap_high_water'])
+        totals['heap_high_water'] = high_water
+        for name in COUNTERS:
+            totals[name] = totals.get(name, 0) + record[name]
+        for name in PHASES:
+            totals[name + '_s'] = totals.get(name + '_s', 0.0) + record[name + '_s']
+
+    def render(self):
+        lines = []
+
+        def metric(name, kind, help_text, key):
+            full_name = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for algorithm, totals in sorted(self.totals.items()):
+                lines.append(f'{full_name}{{algorithm="{algorithm}"}} {totals[key]}')
+
+        metric('searches_total', 'counter', "Searches run.", 'searches')
+        metric('searches_found_total', 'counter',
+               "Searches that reached their goal.", 'found')
+        for name in COUNTERS:
+            help_text = f"Sum of {name.replace('_', ' ')} over all searches."
+            metric(name + '_total', 'counter', help_text, name)
+        metric('heap_high_water', 'gauge',
+               "Largest open list seen in any search.", 'heap_high_water')
+        phase_name = f"{self.prefix}_phase_seconds_total"
+        lines.append(f"# HELP {phase_name} Time spent per search phase.")
+        lines.append(f"# TYPE {phase_name} counter")
+        for algorithm, totals in sorted(self.totals.items()):
+            for name in PHASES:
+                labels = f'algorithm="{algorithm}",phase="{name}"'
+                lines.append(f'{phase_name}{{{labels}}} {totals[name + "_s"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, filename):
+        with open(filename, 'w') as file:
+            file.write(self.render())
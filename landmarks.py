@@ -0,0 +1,190 @@
+# landmarks.py
+import zlib
+from array import array
+from collections import Counter
+
+from connectivity import ConnectivityIndex
+from grid_engine import GridEngine, cell_cost, flatten_grid, get_cost_model
+
+# Landmark tables use uint16 entries while every distance fits, uint32 otherwise;
+# the largest value of the type marks cells a landmark cannot reach
+SENTINELS = {'H': 2 ** 16 - 1, 'I': 2 ** 32 - 1}
+
+
+class LandmarkTable:
+    """Exact distances from a few landmark cells to every cell, for ALT heuristics.
+
+    For any landmark L the triangle inequality gives
+    d(n, goal) >= |d(L, goal) - d(L, n)|, so the largest of those
+    differences is an admissible and consistent A* heuristic that,
+    unlike the straight-line distance, knows about the walls between n and
+    the goal. Landmarks are picked by farthest-point selection inside the
+    largest region, which puts them at the extremes of the map where the
+    bounds are tightest.
+
+    On weighted grids distances are directed, and the bound above only
+    holds one way round. With unit step costs the way back along a path
+    differs only in its end cells' terrain, so
+    d(n, L) = d(L, n) - cost(n) + cost(L), which restores the second bound
+    without tables towards the landmarks.
+
+    The tables are exact for the cells they were built from; checksum
+    records which ones, and cells keeps a copy when it is known. Making a
+    cell dearer can only lengthen distances, so the bounds stay admissible
+    and consistent after such edits, only looser (see bounds_hold).
+    Distances are stored as integers and reversed as above, so only cost
+    models whose steps all cost 1 are supported.
+    """
+
+    def __init__(self, rows, cols, cost_model, landmarks, tables, checksum, cells=None):
+        self.rows = rows
+        self.cols = cols
+        self.model = get_cost_model(cost_model)
+        self.landmarks = landmarks
+        self.tables = tables
+        self.checksum = checksum
+        self.cells = cells
+
+    @classmethod
+    def build(cls, rows, cols, cells, count=8, cost_model='chebyshev'):
+        model = get_cost_model(cost_model)
+        if model.diagonal_cost != 1:
+            raise ValueError(
+                f"Landmark tables need unit step costs, got '{model.name}'")
+        engine = GridEngine(rows, cols, bytearray(cells))
+        labels = ConnectivityIndex(rows, cols, engine.cells, model.directions).labels
+        sizes = Counter(labels)
+        sizes.pop(-1, None)
+        landmarks, distances = [], []
+        if sizes:
+            # The first landmark is the cell farthest from a cell of the largest region
+            seed = labels.index(sizes.most_common(1)[0][0])
+            # Cells outside that region stay at -1 so they are never picked
+            seed_distances = cls._distances(engine, seed, model)
+            nearest = [-1 if value is None else value for value in seed_distances]
+            while len(landmarks) < count:
+                farthest = max(nearest)
+                if farthest <= 0 and landmarks:
+                    break
+                landmark = nearest.index(farthest)
+                landmarks.append(landmark)
+                row = cls._distances(engine, landmark, model)
+                distances.append(row)
+                nearest = [
+                    -1 if value is None else min(best, value)
+                    for best, value in zip(nearest, row, strict=True)
+                ]
+        reached = (value for row in distances for value in row if value is not None)
+        largest = max(reached, default=0)
+        typecode = 'H' if largest < SENTINELS['H'] else 'I'
+        sentinel = SENTINELS[typecode]
+        tables = [
+            array(typecode, [sentinel if value is None else value for value in row])
+            for row in distances
+        ]
+        checksum = zlib.crc32(engine.cells)
+        return cls(rows, cols, model, landmarks, tables, checksum, bytes(engine.cells))
+
+    @classmethod
+    def from_grid(cls, grid, count=8, cost_model='chebyshev'):
+        rows, cols, cells = flatten_grid(grid)
+        return cls.build(rows, cols, cells, count, cost_model)
+
+    @staticmethod
+    def _distances(engine, source, model):
+        # A full Dijkstra tree from source; None for every cell it does not reach
+        engine._run(source, set(), None, model, 'counter')
+        closed, gen = engine.closed, engine.generation
+        return [
+            int(cost) if stamp == gen else None
+            for cost, stamp in zip(engine.dist, closed, strict=True)
+        ]
+
+    def matches(self, cells):
+        return zlib.crc32(bytes(cells)) == self.checksum
+
+    def bounds_hold(self, cells):
+        # Whether the heuristics are still valid on cells, i.e. no cell got cheaper
+        if self.cells is None or len(cells) != len(self.cells):
+            return self.matches(cells)
+        built, cols = self.cells, self.cols or 1
+        for begin in range(0, len(built), cols):
+            end = begin + cols
+            if cells[begin:end] != built[begin:end]:
+                for index in range(begin, end):
+                    if cell_cost(cells[index]) < cell_cost(built[index]):
+                        return False
+        return True
+
+    def heuristic_for(self, goal, cells=None):
+        """A heuristic over flat indices for GridEngine.search towards goal.
+
+        Landmarks that cannot reach goal are left out. Every cell a search
+        pushes is in the start's region, so when goal is in it too the
+        remaining tables hold a real distance for that cell; when it is
+        not, no path exists and the bound is never relied upon. The
+        reversed bound needs the terrain the tables were built from, so
+        cells is only read for tables that do not hold their own copy;
+        pass the grid's cells when it has terrain.
+        """
+        distance = self.model.distance
+        cols = self.cols
+        goal_row, goal_col = goal
+        target = goal_row * cols + goal_col
+        pairs = [
+            (table, table[target]) for table in self.tables
+            if table[target] != SENTINELS[table.typecode]
+        ]
+        if self.cells is not None:
+            cells = self.cells
+
+        if cells is not None and bytes(cells).translate(None, b'\x00\x01'):
+            goal_cost = cell_cost(cells[target])
+
+            def weighted_heuristic(index):
+                row, col = divmod(index, cols)
+                bound = distance(abs(row - goal_row), abs(col - goal_col))
+                # Bounds via d(L, goal) - d(L, n) and the reversed d(n, L) - d(goal, L)
+                offset = goal_cost - cell_cost(cells[index])
+                for table, to_goal in pairs:
+                    to_index = table[index]
+                    difference = max(to_goal - to_index, to_index - to_goal + offset)
+                    if difference > bound:
+                        bound = difference
+                return bound
+
+            return weighted_heuristic
+
+        def heuristic(index):
+            row, col = divmod(index, cols)
+            bound = distance(abs(row - goal_row), abs(col - goal_col))
+            for table, to_goal in pairs:
+                difference = to_goal - table[index]
+                if difference < 0:
+                    difference = -difference
+                if difference > bound:
+                    bound = difference
+            return bound
+
+        return heuristic
+
+
+_table = None
+_table_key = None
+
+
+def landmarks_for(grid, cost_model='chebyshev', count=8):
+    """Return a shared landmark table for grid.
+
+    The table is rebuilt when the cost model changes or a cell gets cheaper.
+    Rebuilding runs a Dijkstra tree per landmark, seconds on large maps.
+    Walls and terrain added since the build keep the old table, whose
+    bounds are then looser but still admissible.
+    """
+    global _table, _table_key
+    rows, cols, cells = flatten_grid(grid)
+    key = (rows, cols, get_cost_model(cost_model), count)
+    if _table is None or _table_key != key or not _table.bounds_hold(cells):
+        _table = LandmarkTable.build(rows, cols, cells, count, cost_model)
+        _table_key = key
+    return _table
@@ -3,65 +3,28 @@ import os
 import sys
 import time
 import random
-from pathfinding_algorithms import dijkstra, astar
-from pygame_utils import initialize_pygame, draw_grid, draw_path, draw_start_goal, display_message, update_display
+from pathfinding_algorithms import dijkstra, astar, jump_point_search
+from pathfinding_algorithms import dijkstra_steps, astar_steps
+from pathfinding_algorithms import bidirectional_dijkstra, bidirectional_astar
+from pathfinding_algorithms import alt_astar, hpa_star
+from grid_engine import COST_MODELS, GridEngine, flatten_grid
+from dstar_lite import DStarLite
+from hpa import HierarchicalPlanner
+from landmarks import LandmarkTable
+from grid_model import Grid, Graph
+from maze_generators import GENERATORS
+from path_cache import PathCache
+from search_worker import SearchWorker
+from pygame_utils import initialize_pygame, display_message, GridRenderer, Camera, \
+    TiledGridRenderer, FRONTIER_COLOR, VISITED_COLOR
 from instructions_window import show_instructions
-from maze_saver import save_maze, load_maze
-
-
-class Grid:
-    def __init__(self, rows, cols):
-        self.rows = rows
-        self.cols = cols
-        self.cell_size = 25
-        self.grid = [[0] * cols for _ in range(rows)]
-
-    def reset(self):
-        self.grid = [[0] * self.cols for _ in range(self.rows)]
-
-
-class Node:
-    def __init__(self, row, col):
-        self.row = row
-        self.col = col
-        self.neighbors = []
-
-    def add_neighbor(self, neighbor):
-        self.neighbors.append(neighbor)
-
-class Graph:
-    def __init__(self, rows, cols):
-        self.rows = rows
-        self.cols = cols
-        self.nodes = [[Node(row, col) for col in range(cols)] for row in range(rows)]
-        self.build_graph()
-
-    def build_graph(self):
-        for row in range(self.rows):
-            for col in range(self.cols):
-                current_node = self.nodes[row][col]
-                for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                    nr, nc = row + dr, col + dc
-                    if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                        current_node.add_neighbor(self.nodes[nr][nc])
-
-
-class MazeGenerator:
-    def __init__(self, graph):
-        self.graph = graph
-
-    def generate_maze(self):
-        # Implement maze generation algorithm here
-        pass
-class NullAlgorithm(MazeGenerator):
-  def __init__(self, graph):
-      super().__init__(graph)
-
-  def generate_maze(self):
-      print("NullAlgorithm: Generating maze...") 
-        
-      # This algorithm does very little, just print a message
-      pass
+from maze_saver import save_maze, save_maze_binary, load_maze_binary, is_binary_maze
+from maze_saver import load_maze_streaming
+from maze_saver import landmarks_filename, save_landmarks, load_landmarks
+
+
+# Cell values the mouse can paint, see grid_engine.cell_cost
+BRUSHES = {1: 'wall', 3: 'forest (cost 3)', 7: 'swamp (cost 7)'}
 
 
 class PathfindingApp:
@@ -70,17 +33,29 @@ class PathfindingApp:
       self.rows, self.cols = grid_size, grid_size
       self.grid = Grid(self.rows, self.cols)
       self.graph = Graph(self.rows, self.cols)
-      self.maze_generator = MazeGenerator(self.graph)
+      self.maze_generator = 'random'
+      self.brush = 1
       self.screen = initialize_pygame(self.rows, self.cols, self.grid.cell_size, "Pathfinding Comparison")
+      self.tile_renderer = None
+      self.create_renderers()
       self.running = True
       self.algorithm_started = False
       self.path = []
+      self.path_source = None  # Name of the search that produced self.path
       self.start, self.goal = (0, 0), (self.rows - 1, self.cols - 1)
       self.placing_start, self.placing_goal, self.drawing_obstacle = False, False, False
       self.clock = pygame.time.Clock()
       self.show_instructions = False
       self.instruction_screen = None
       self.instruction_toggle_pressed = False
+      self.cost_model = 'chebyshev'
+      self.planner = None
+      self.hierarchical = None
+      self.landmarks = None
+      self.path_cache = PathCache()
+      self.search_worker = SearchWorker()
+      self.visualize = False
+      self.stepped_search = None
 
 
   
@@ -88,17 +63,31 @@ class PathfindingApp:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+            elif event.type == pygame.MOUSEWHEEL:
+                self.camera.zoom(event.y, pygame.mouse.get_pos())
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 2, 3):
                 self.handle_mouse_button_down(event.pos)
             elif event.type == pygame.MOUSEBUTTONUP:
                 self.drawing_obstacle = False
             elif event.type == pygame.KEYDOWN:
                 self.handle_key_down(event.key)
 
+    def create_renderers(self):
+        width, height = self.screen.get_size()
+        self.camera = Camera(self.rows, self.cols, self.grid.cell_size, width, height)
+        self.renderer = GridRenderer(self.screen, self.grid.cell_size)
+        if self.tile_renderer is not None:
+            self.tile_renderer.detach()
+        self.tile_renderer = TiledGridRenderer(self.screen, self.camera)
+
+    def pan_view(self, dx, dy):
+        step = self.camera.width // 4
+        self.camera.pan(dx * step, dy * step)
+
     def handle_mouse_button_down(self, pos):
-        row, col = pos[1] // self.grid.cell_size, pos[0] // self.grid.cell_size
+        row, col = self.camera.screen_to_cell(pos)
         if 0 <= row < self.rows and 0 <= col < self.cols:
-            if self.grid.grid[row][col] == 0:
+            if self.grid.grid[row][col] != 1:
                 if not self.placing_start and not self.placing_goal:
                     self.drawing_obstacle = True
                 elif self.placing_start:
@@ -109,22 +98,58 @@ class PathfindingApp:
                     self.placing_goal = False
                   
     def save_current_maze(self):
-      # Prompt the user for a filename in the console
-      filename = self.ask_text_input("Enter a filename for the maze (without extension): ") + '.json'
-      save_maze(self.grid.grid, filename)
+      # Prompt the user for a filename in the console, a '.maze' extension selects the
+      # binary format
+      filename = self.ask_text_input(
+          "Enter a filename for the maze (add .maze for binary): ")
+      if filename.endswith('.maze'):
+          save_maze_binary(self.grid.grid, filename, self.start, self.goal)
+      else:
+          filename += '.json'
+          save_maze(self.grid.grid, filename)
       print(f"Maze saved to '{filename}'.")
+      if self.landmarks is not None and self.landmarks.matches(self.grid_cells()):
+          # Landmark tables are costly to build, keep them next to the maze
+          save_landmarks(self.landmarks, landmarks_filename(filename))
+          print(f"Landmarks saved to '{landmarks_filename(filename)}'.")
+      self.renderer.invalidate()
 
     def load_current_maze(self):
-      filename = self.ask_text_input("Enter the filename for the maze (without extension): ") + '.json'
+      filename = self.ask_text_input(
+          "Enter the filename for the maze (without extension): ")
+      self.renderer.invalidate()
+      if not os.path.splitext(filename)[1]:
+          filename += '.maze' if os.path.exists(filename + '.maze') else '.json'
       if not os.path.exists(filename):
           print(f"File '{filename}' not found. Please save a maze first.")
           return
   
-      loaded_grid_data = load_maze(filename)
+      if is_binary_maze(filename):
+          with load_maze_binary(filename) as maze:
+              loaded_grid_data = maze.to_grid()
+              if maze.start is not None and maze.goal is not None:
+                  self.start, self.goal = maze.start, maze.goal
+      else:
+          rows, cols, cells = load_maze_streaming(filename)
+          loaded_grid_data = [
+              list(cells[row * cols:(row + 1) * cols]) for row in range(rows)
+          ]
       rows = len(loaded_grid_data)  # Assuming square grid
       cols = len(loaded_grid_data[0]) if rows > 0 else 0
       self.grid = Grid(rows, cols)  # Re-initialize the grid with the correct dimensions
       self.grid.grid = loaded_grid_data  # Directly set the loaded grid data
+      self.rows, self.cols = rows, cols
+      self.create_renderers()
+      self.planner = None
+      self.hierarchical = None
+      self.landmarks = None
+      if os.path.exists(landmarks_filename(filename)):
+          try:
+              self.landmarks = load_landmarks(landmarks_filename(filename),
+                                              self.grid_cells())
+              print(f"Landmarks loaded from '{landmarks_filename(filename)}'.")
+          except ValueError as error:
+              print(f"Ignoring landmarks: {error}")
   
       print(f"Maze loaded from '{filename}'.")
     # Refresh the display or perform other necessary updates
@@ -136,12 +161,31 @@ class PathfindingApp:
             pygame.K_g: self.toggle_placing_goal,
             pygame.K_p: self.run_astar,
             pygame.K_d: self.run_dijkstra,
+            pygame.K_j: self.run_jump_point_search,
+            pygame.K_b: self.run_bidirectional_astar,
+            pygame.K_e: self.run_bidirectional_dijkstra,
+            pygame.K_a: self.run_landmark_astar,
+            pygame.K_t: self.cycle_brush,
+            pygame.K_n: self.run_incremental,
+            pygame.K_h: self.run_hierarchical,
+            pygame.K_f: self.toggle_frame_stats,
+            pygame.K_x: self.cancel_search,
+            pygame.K_LEFT: lambda: self.pan_view(-1, 0),
+            pygame.K_RIGHT: lambda: self.pan_view(1, 0),
+            pygame.K_UP: lambda: self.pan_view(0, -1),
+            pygame.K_DOWN: lambda: self.pan_view(0, 1),
+            pygame.K_EQUALS: lambda: self.camera.zoom(1),
+            pygame.K_MINUS: lambda: self.camera.zoom(-1),
+            pygame.K_0: self.camera_reset,
             pygame.K_r: self.reset_grid,
             pygame.K_i: self.toggle_instructions,
             pygame.K_m: self.generate_random_maze,
             pygame.K_q: sys.exit,
             pygame.K_z: self.save_current_maze,
             pygame.K_l: self.load_current_maze,
+            pygame.K_c: self.cycle_cost_model,
+            pygame.K_k: self.cycle_maze_generator,
+            pygame.K_v: self.toggle_visualize,
         }
         if key in key_functions:
             key_functions[key]()
@@ -153,99 +197,310 @@ class PathfindingApp:
         else:
           self.instruction_toggle_pressed = False
       
+    def toggle_frame_stats(self):
+        self.renderer.show_stats = not self.renderer.show_stats
+        self.tile_renderer.show_stats = self.renderer.show_stats
+
+    def toggle_visualize(self):
+        self.visualize = not self.visualize
+        print(f"Visualize search: {'on' if self.visualize else 'off'}")
+
+    def cancel_search(self):
+        self.search_worker.cancel()
+        if self.stepped_search is not None:
+            name, _, engine, _, _ = self.stepped_search
+            print(f"{name}: cancelled after {engine.nodes_examined} nodes")
+            self.stepped_search = None
+            self.algorithm_started = False
+
+    def camera_reset(self):
+        self.camera.reset()
+
     def toggle_placing_start(self):
         self.placing_start = True
 
     def toggle_placing_goal(self):
         self.placing_goal = True
 
+    def cycle_cost_model(self):
+        names = list(COST_MODELS)
+        self.cost_model = names[(names.index(self.cost_model) + 1) % len(names)]
+        # The planners are rebuilt for the new model, so the grid must stop feeding the
+        # old ones
+        if self.planner is not None:
+            self.grid.remove_listener(self.planner.update_cell)
+        self.planner = None
+        self.hierarchical = None
+        print(f"Cost model: {self.cost_model}")
+
+    def cycle_maze_generator(self):
+        names = list(GENERATORS)
+        self.maze_generator = names[(names.index(self.maze_generator) + 1) % len(names)]
+        print(f"Maze generator: {self.maze_generator}")
+
+    def cycle_brush(self):
+        # Painting places walls or terrain that costs more to cross
+        brushes = list(BRUSHES)
+        self.brush = brushes[(brushes.index(self.brush) + 1) % len(brushes)]
+        print(f"Brush: {BRUSHES[self.brush]}")
+
     def run_astar(self):
         self.run_algorithm(astar)
 
     def run_dijkstra(self):
         self.run_algorithm(dijkstra)
 
+    def run_jump_point_search(self):
+        self.run_algorithm(jump_point_search)
+
+    def run_bidirectional_astar(self):
+        self.run_algorithm(bidirectional_astar)
+
+    def run_bidirectional_dijkstra(self):
+        self.run_algorithm(bidirectional_dijkstra)
+
+    def run_incremental(self):
+        # D* Lite keeps its state between runs and is fed every painted wall through
+        # the grid listener
+        start_time = time.time()
+        if self.planner is None:
+            self.planner = DStarLite(self.grid.grid, self.start, self.goal,
+                                     self.cost_model)
+            self.grid.add_listener(self.planner.update_cell)
+        if self.planner.goal != self.goal:
+            self.planner.set_goal(self.goal)
+        if self.planner.start != self.start:
+            self.planner.move_start(self.start)
+        self.path = self.planner.plan()
+        self.path_source = 'D* Lite'
+        self.algorithm_started = True
+        print(f"D* Lite: {time.time() - start_time}s, "
+              f"Nodes examined: {self.planner.nodes_examined}")
+
+    def run_hierarchical(self):
+        self.run_algorithm(hpa_star)
+
+    def hierarchical_task(self):
+        # The abstract graph is built once, on the search worker, and kept between
+        # runs; later runs only rebuild the clusters that differ from the snapshot
+        planner = self.hierarchical
+        if planner is not None and planner.model.name != self.cost_model:
+            planner = None
+        rows, cols, cells = self.rows, self.cols, bytearray(self.grid_cells())
+        start, goal, cost_model = self.start, self.goal, self.cost_model
+
+        def task(_progress):
+            nonlocal planner
+            if planner is None:
+                build_time = time.time()
+                planner = HierarchicalPlanner(rows, cols, cells, cost_model=cost_model)
+                print(f"HPA*: abstract graph of {len(planner.nodes)} nodes "
+                      f"built in {time.time() - build_time}s")
+            else:
+                planner.sync(cells)
+            return planner.path(start, goal), planner.nodes_examined, planner
+
+        return task
+
+    def run_landmark_astar(self):
+        if self.cost_model == 'octile':
+            print("ALT landmarks need whole-number step costs, running A* instead")
+            self.run_astar()
+            return
+        self.run_algorithm(alt_astar)
+
+    def landmark_task(self):
+        # ALT A*; the landmark tables are built once per maze and cost model, or loaded
+        # with the maze, and both the build and the search run on the search worker
+        table = self.landmarks
+        rows, cols, cells = self.rows, self.cols, self.grid_cells()
+        start, goal, cost_model = self.start, self.goal, self.cost_model
+
+        def task(progress):
+            nonlocal table
+            if table is None or table.model.name != cost_model \
+                    or not table.bounds_hold(cells):
+                build_time = time.time()
+                table = LandmarkTable.build(rows, cols, cells, cost_model=cost_model)
+                print(f"ALT: {len(table.landmarks)} landmarks built in "
+                      f"{time.time() - build_time}s")
+            engine = GridEngine(rows, cols, bytearray(cells))
+            engine.on_progress = progress
+            path = alt_astar(None, start, goal, cost_model, table, engine=engine)
+            return path, engine.nodes_examined, table
+
+        return task
+
+    def grid_cells(self):
+        return bytes(flatten_grid(self.grid.grid)[2])
+
     def run_algorithm(self, algorithm):
-      if not self.algorithm_started:
+      idle = not self.search_worker.busy() and self.stepped_search is None
+      if not self.algorithm_started and idle:
           self.algorithm_started = True
-          start_time = time.time()
-          if algorithm == astar:
-              visited_nodes = astar(self.grid.grid, self.start, self.goal)
-          elif algorithm == dijkstra:
-              visited_nodes = dijkstra(self.grid.grid, self.start, self.goal)
+          self.clear_search_layer()
+          cache_key = (algorithm.__name__, self.cost_model)
+          cached_path = self.path_cache.get(self.grid, self.start, self.goal, cache_key)
+          connectivity = self.grid.connectivity(COST_MODELS[self.cost_model].directions)
+          if cached_path is not None:
+              self.finish_search(algorithm.__name__, cached_path, 0, 0)
+          elif not connectivity.reachable(self.start, self.goal):
+              # Start and goal are in different regions, no search needed
+              self.finish_search(algorithm.__name__, [], 0, 0)
+          elif self.visualize and algorithm in (astar, dijkstra):
+              # Step the search from the main loop so its frontier can be drawn as it
+              # grows
+              engine = GridEngine.from_grid(self.grid.grid)
+              step = astar_steps if algorithm == astar else dijkstra_steps
+              steps = step(None, self.start, self.goal, self.cost_model, engine=engine)
+              context = (cache_key, self.start, self.goal, self.grid, self.grid.version)
+              self.stepped_search = (algorithm.__name__, steps, engine, context,
+                                     time.time())
+          elif algorithm in (astar, dijkstra, jump_point_search, bidirectional_astar,
+                             bidirectional_dijkstra):
+              if algorithm == jump_point_search and self.cost_model == 'manhattan':
+                  # JPS needs diagonal moves, so 4-connected grids fall back to A*
+                  algorithm = astar
+              # The search runs on its own snapshot of the grid, off the event loop
+              context = (cache_key, self.start, self.goal, self.grid, self.grid.version)
+              engine = GridEngine.from_grid(self.grid.grid)
+              self.search_worker.submit(algorithm, engine, self.start, self.goal,
+                                        self.cost_model, context)
+          elif algorithm in (hpa_star, alt_astar):
+              # Building the planner or landmark tables takes seconds on large grids,
+              # so it runs on the worker together with the search
+              context = (cache_key, self.start, self.goal, self.grid, self.grid.version)
+              task = self.hierarchical_task() if algorithm == hpa_star \
+                  else self.landmark_task()
+              self.search_worker.submit_task(algorithm.__name__, task, context)
           else:
-              visited_nodes = []
-          end_time = time.time()
-          nodes_examined = len(visited_nodes)
-          print(f"{algorithm.__name__}: {end_time - start_time}s, Nodes visited: {nodes_examined}")
+              self.finish_search(algorithm.__name__, [], 0, 0)
+
+    def advance_search(self, budget=0.01):
+        # Run the stepped search for up to budget seconds, painting each batch of
+        # deltas as it arrives
+        if self.stepped_search is None:
+            return
+        name, steps, engine, context, start_time = self.stepped_search
+        deadline = time.time() + budget
+        while time.time() < deadline:
+            try:
+                opened, closed = next(steps)
+            except StopIteration as done:
+                self.stepped_search = None
+                pygame.display.set_caption("Pathfinding Comparison")
+                self.store_result(context, done.value)
+                elapsed = time.time() - start_time
+                self.finish_search(name, done.value, elapsed, engine.nodes_examined)
+                return
+            for renderer in (self.renderer, self.tile_renderer):
+                renderer.paint_cells(opened, FRONTIER_COLOR)
+                renderer.paint_cells(closed, VISITED_COLOR)
+        pygame.display.set_caption(
+            f"Pathfinding Comparison - {name}: "
+            f"{engine.nodes_examined} nodes expanded (x to cancel)")
+
+    def clear_search_layer(self):
+        self.renderer.clear_layer()
+        self.tile_renderer.clear_layer()
+
+    def store_result(self, context, path):
+        cache_key, start, goal, grid, version = context
+        if grid is self.grid and version == self.grid.version:
+            self.path_cache.put(self.grid, start, goal, cache_key, path)
+
+    def poll_search(self):
+        if self.search_worker.busy():
+            pygame.display.set_caption(
+                f"Pathfinding Comparison - {self.search_worker.name}: "
+                f"{self.search_worker.nodes_examined} nodes expanded (x to cancel)")
+            return
+        result = self.search_worker.poll()
+        if result is None:
+            return
+        pygame.display.set_caption("Pathfinding Comparison")
+        if result.value is not None and result.context[3] is self.grid:
+            self.keep_built(result.value)
+        if result.error is not None:
+            print(f"{result.name}: failed: {result.error!r}")
+            self.algorithm_started = False
+            return
+        if result.cancelled:
+            print(f"{result.name}: cancelled after {result.nodes_examined} nodes")
+            self.algorithm_started = False
+            return
+        self.store_result(result.context, result.path)
+        self.finish_search(result.name, result.path, result.elapsed,
+                           result.nodes_examined)
+
+    def keep_built(self, value):
+        # A planner or landmark table the worker built, kept unless the cost model
+        # changed meanwhile; cancelling a search does not throw its build away
+        if value.model.name != self.cost_model:
+            return
+        if isinstance(value, HierarchicalPlanner):
+            self.hierarchical = value
+        else:
+            self.landmarks = value
+
+    def finish_search(self, name, path, elapsed, nodes_examined):
+      print(f"{name}: {elapsed}s, Nodes examined: {nodes_examined}, "
+            f"Path length: {len(path)}")
+      print(f"Path cache: {self.path_cache.stats()}")
 
-          # Display nodes examined in a separate window
-          nodes_display = NodesExaminedDisplay(algorithm.__name__)
-          nodes_display.display_nodes_examined(nodes_examined)
+      # Display nodes examined in a separate window
+      nodes_display = NodesExaminedDisplay(name)
+      nodes_display.display_nodes_examined(nodes_examined)
+      self.renderer.invalidate()
 
-          self.path = visited_nodes
+      self.path = path
+      self.path_source = name
 
     def handle_drawing_obstacle(self):
-        mouse_pos = pygame.mouse.get_pos()
-        col = mouse_pos[0] // self.grid.cell_size
-        row = mouse_pos[1] // self.grid.cell_size
+        row, col = self.camera.screen_to_cell(pygame.mouse.get_pos())
         if 0 <= row < self.rows and 0 <= col < self.cols:
-            self.grid.grid[row][col] = 1
+            self.grid.set_cell(row, col, self.brush)
+            if self.planner is not None and self.path and self.path_source == 'D* Lite':
+                # Keep the incremental planner's path current while walls are painted
+                self.path = self.planner.plan()
 
     def update_display(self):
-        self.screen.fill((255, 255, 255))
-        draw_grid(self.screen, self.grid.grid, self.grid.cell_size)
-
-        if self.path and self.algorithm_started:
-            draw_path(self.screen, self.path, self.grid.cell_size, (0, 255, 0))
-
-        draw_start_goal(self.screen, self.start, self.goal, self.grid.cell_size)
-
-
-        update_display()
+        path = self.path if self.path and self.algorithm_started else []
+        if self.camera.shows_whole_grid():
+            self.renderer.render(self.grid.grid, path, self.start, self.goal)
+        else:
+            # Zoomed, panned or too large for the window: draw only the visible tiles
+            self.tile_renderer.render(self.grid, path, self.start, self.goal)
+            self.renderer.invalidate()
 
     def reset_grid(self):
+        self.search_worker.cancel()
+        self.stepped_search = None
+        self.clear_search_layer()
         self.grid.reset()
         self.path = []
+        self.path_source = None
+        self.planner = None
+        self.hierarchical = None
         self.placing_start, self.placing_goal, self.algorithm_started = False, False, False
 
     def generate_random_maze(self):
-        # Ensure the grid starts empty
+        # The seed is printed so a maze worth keeping can be generated again
+        seed = random.randrange(2 ** 32)
+        if (self.graph.rows, self.graph.cols) != (self.rows, self.cols):
+            self.graph = Graph(self.rows, self.cols)
+        generator = GENERATORS[self.maze_generator](self.graph, seed)
+        self.search_worker.cancel()
+        self.stepped_search = None
+        self.clear_search_layer()
         self.grid.reset()
-
-        # Create at least two paths
-        self.ensure_two_paths()
-        num_obstacles = int(self.rows * self.cols * 0.2)
-        # Add random obstacles
-        for _ in range(num_obstacles):  # Random number of obstacles
-            self.add_random_obstacle()
-
-    def ensure_two_paths(self):
-        # Generate two distinct paths without obstacles from start to goal
-        # Path 1
-        for i in range(self.rows):
-            self.grid.grid[i][0] = 0  # Vertical path on the left
-            self.grid.grid[0][i] = 0  # Horizontal path on the top
-
-        # Path 2
-        for i in range(self.rows):
-            self.grid.grid[i][self.cols-1] = 0  # Vertical path on the right
-            self.grid.grid[self.rows-1][i] = 0  # Horizontal path on the bottom
-
-    def add_random_obstacle(self):
-        row, col = random.randint(1, self.rows-2), random.randint(1, self.cols-2)
-        # Ensure the cell is not part of the guaranteed paths
-        if not ((row == 0 or col == 0) or (row == self.rows-1 or col == self.cols-1)):
-            self.grid.grid[row][col] = 1
-
-    @staticmethod
-    def choose_orientation(width, height):
-        if width < height:
-            return 'H'
-        elif height < width:
-            return 'V'
-        else:
-            return 'H' if random.random() < 0.5 else 'V'
+        self.grid.grid = generator.generate_maze(self.start, self.goal)
+        self.planner = None
+        self.hierarchical = None
+        self.path = []
+        self.path_source = None
+        self.algorithm_started = False
+        print(f"Maze generator: {self.maze_generator}, seed {seed}")
 
     def ask_text_input(self, prompt):
       # Define the text input box and colors
@@ -296,6 +551,8 @@ class PathfindingApp:
     def run(self):
         while self.running:
             self.handle_events()
+            self.poll_search()
+            self.advance_search()
 
             if self.show_instructions:
               if not self.instruction_screen:
@@ -306,6 +563,7 @@ class PathfindingApp:
                   pygame.quit()
                   self.instruction_screen = None
                   self.screen = initialize_pygame(self.rows, self.cols, self.grid.cell_size, "Pathfinding Comparison")
+                  self.create_renderers()
               
             
               if self.drawing_obstacle:
@@ -357,9 +615,10 @@ class NodesExaminedDisplay(BaseWindow):
   
 class GridSizeSelectionWindow(BaseWindow):
   def __init__(self):
-      super().__init__("Grid Size Selection", 400, 350)  # Increase height to accommodate 5 more blocks
+      # Larger sizes are shown through the zoomable camera
+      super().__init__("Grid Size Selection", 400, 450)
       self.selected_size = None
-      self.sizes = [10, 15, 20, 25, 30]
+      self.sizes = [10, 20, 30, 100, 250, 500, 1000]
 
   def run(self):
       running = True
@@ -387,7 +646,7 @@ class GridSizeSelectionWindow(BaseWindow):
       return self.selected_size
 
 
-if __name__ == "__main__":
+def run_gui():
   pygame.init()
   window = GridSizeSelectionWindow()
   selected_size = window.run()
@@ -397,6 +656,5 @@ if __name__ == "__main__":
       app.run()
 
 
-
-
-
+if __name__ == "__main__":
+  run_gui()
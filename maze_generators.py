@@ -0,0 +1,270 @@
+# maze_generators.py
+"""Seedable maze generators on the MazeGenerator interface.
+
+Every generator writes a flat bytearray (1 is a wall, 2 and up weighted
+terrain) using whole-row and strided slice assignments where it can, and
+generate_maze() guarantees a path between start and goal. The lattice
+generators (division, Kruskal, Prim) produce perfect mazes: free cells sit
+on even rows and columns and every pair of them is joined by exactly one
+corridor.
+"""
+from grid_model import MazeGenerator, NullAlgorithm
+
+
+def _lattice(rows, cols):
+    # All walls except the cells on even rows and even columns
+    cells = bytearray(b'\x01') * (rows * cols)
+    for row in range(0, rows, 2):
+        cells[row * cols:(row + 1) * cols:2] = bytes((cols + 1) // 2)
+    return cells
+
+
+def _add3(first, second, third):
+    # Element-wise sums, as long as the shortest input: the shifted copies the
+    # smoothing passes add are one cell longer and their last cell is dropped
+    return [a + b + c for a, b, c in zip(first, second, third, strict=False)]
+
+
+def _triples(rows):
+    # Every row together with the two below it
+    return zip(rows, rows[1:], rows[2:], strict=False)
+
+
+def _open_margins(cells, rows, cols):
+    # With an even size the last row or column has no lattice cells; give it stubs
+    # hanging off the lattice so the far corner is reachable and the maze stays a tree
+    if rows % 2 == 0:
+        cells[(rows - 1) * cols:rows * cols:2] = bytes((cols + 1) // 2)
+    if cols % 2 == 0:
+        # When both are even the corner hangs off the last row, so the column stops
+        # short of it
+        stop = (rows - 2) * cols if rows % 2 == 0 else rows * cols
+        cells[cols - 1:stop:2 * cols] = bytes(len(range(cols - 1, stop, 2 * cols)))
+        if rows % 2 == 0:
+            cells[rows * cols - 1] = 0
+
+
+class RecursiveDivision(MazeGenerator):
+    """Starts from an open grid and splits every chamber with a wall that has one gap.
+
+    Walls go on odd rows or columns and gaps on even ones, so a later wall
+    can never close an earlier gap. Chambers are kept on an explicit stack
+    instead of recursing, which keeps 1000x1000 grids within Python's
+    recursion limit.
+    """
+
+    connected = True
+
+    def choose_orientation(self, width, height):
+        if width < height:
+            return 'H'
+        elif height < width:
+            return 'V'
+        else:
+            return 'H' if self.random.random() < 0.5 else 'V'
+
+    def build(self, rows, cols):
+        cells = bytearray(rows * cols)
+        randrange = self.random.randrange
+        chambers = [(0, 0, rows - 1, cols - 1)]
+        while chambers:
+            top, left, bottom, right = chambers.pop()
+            can_split_rows = bottom - top >= 2
+            can_split_cols = right - left >= 2
+            if not (can_split_rows or can_split_cols):
+                continue
+            orientation = self.choose_orientation(right - left + 1, bottom - top + 1)
+            if orientation == 'H' and not can_split_rows:
+                orientation = 'V'
+            elif orientation == 'V' and not can_split_cols:
+                orientation = 'H'
+            if orientation == 'H':
+                wall = randrange(top + 1, bottom, 2)
+                gap = randrange(left, right + 1, 2)
+                begin = wall * cols
+                cells[begin + left:begin + right + 1] = b'\x01' * (right - left + 1)
+                cells[wall * cols + gap] = 0
+                chambers.append((top, left, wall - 1, right))
+                chambers.append((wall + 1, left, bottom, right))
+            else:
+                wall = randrange(left + 1, right, 2)
+                gap = randrange(top, bottom + 1, 2)
+                column = slice(top * cols + wall, bottom * cols + wall + 1, cols)
+                cells[column] = b'\x01' * (bottom - top + 1)
+                cells[gap * cols + wall] = 0
+                chambers.append((top, left, bottom, wall - 1))
+                chambers.append((top, wall + 1, bottom, right))
+        return cells
+
+
+class Kruskal(MazeGenerator):
+    # Randomized Kruskal: knock down lattice walls in random order whenever they
+    # join two separate trees
+    connected = True
+
+    def build(self, rows, cols):
+        cells = _lattice(rows, cols)
+        lattice_rows = range(0, rows * cols, 2 * cols)
+        edges = [
+            (index, index + 1)
+            for begin in lattice_rows for index in range(begin, begin + cols - 2, 2)
+        ]
+        edges += [
+            (index, index + cols)
+            for begin in lattice_rows[:-1] for index in range(begin, begin + cols, 2)
+        ]
+        self.random.shuffle(edges)
+        parent = list(range(rows * cols))
+
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        for a, wall in edges:
+            b = 2 * wall - a
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+                cells[wall] = 0
+        _open_margins(cells, rows, cols)
+        return cells
+
+
+class Prim(MazeGenerator):
+    # Randomized Prim: grow one tree from a random lattice cell through a random
+    # frontier wall each step
+    connected = True
+
+    def build(self, rows, cols):
+        cells = bytearray(b'\x01') * (rows * cols)
+        randrange = self.random.randrange
+        first = randrange(0, rows, 2) * cols + randrange(0, cols, 2)
+        cells[first] = 0
+        frontier = []
+
+        def add_walls(index):
+            row, col = divmod(index, cols)
+            if row >= 2:
+                frontier.append((index - cols, index - 2 * cols))
+            if row + 2 < rows:
+                frontier.append((index + cols, index + 2 * cols))
+            if col >= 2:
+                frontier.append((index - 1, index - 2))
+            if col + 2 < cols:
+                frontier.append((index + 1, index + 2))
+
+        add_walls(first)
+        while frontier:
+            # Swap a random entry to the end so removing it is O(1)
+            position = randrange(len(frontier))
+            frontier[position], frontier[-1] = frontier[-1], frontier[position]
+            wall, cell = frontier.pop()
+            if cells[cell]:
+                cells[wall] = cells[cell] = 0
+                add_walls(cell)
+        _open_margins(cells, rows, cols)
+        return cells
+
+
+class CellularCaves(MazeGenerator):
+    """Organic caves: random noise smoothed by the 4-5 cellular automaton rule.
+
+    A cell becomes a wall when at least five of the nine cells in its 3x3
+    block are walls, counting the outside of the grid as wall. Each pass
+    works on whole rows with running sums instead of cell by cell.
+    """
+
+    def __init__(self, graph, seed=None, fill=0.45, iterations=4):
+        super().__init__(graph, seed)
+        self.fill = fill
+        self.iterations = iterations
+
+    def build(self, rows, cols):
+        random_value = self.random.random
+        fill = self.fill
+        grid = [[int(random_value() < fill) for _ in range(cols)] for _ in range(rows)]
+        for _ in range(self.iterations):
+            # Horizontal three-cell sums per row, then three of those stacked vertically
+            sums = [_add3([1] + row, row, row[1:] + [1]) for row in grid]
+            border = [3] * cols
+            padded = [border] + sums + [border]
+            grid = [
+                [1 if total >= 5 else 0 for total in _add3(above, middle, below)]
+                for above, middle, below in _triples(padded)
+            ]
+        cells = bytearray()
+        for row in grid:
+            cells += bytes(row)
+        return cells
+
+
+class RandomObstacles(MazeGenerator):
+    # Independent random walls, the old 'm' behaviour, made seedable and solvable
+    def __init__(self, graph, seed=None, density=0.2):
+        super().__init__(graph, seed)
+        self.density = density
+
+    def build(self, rows, cols):
+        random_value = self.random.random
+        density = self.density
+        return bytearray(random_value() < density for _ in range(rows * cols))
+
+
+# (share of the cells, cell value) from the lowest noise to the highest
+DEFAULT_BANDS = ((0.5, 0), (0.25, 3), (0.15, 7), (0.1, 1))
+
+
+class Terrain(MazeGenerator):
+    """Weighted terrain: smoothed noise cut into bands of increasing cost.
+
+    bands lists (share of the cells, cell value) from the lowest noise to
+    the highest, so by default half the map is open ground, then forest
+    costing 3, swamp costing 7 and impassable rock. The cuts are taken
+    from the sorted noise, which keeps the shares exact however much the
+    smoothing flattens it.
+    """
+
+    def __init__(self, graph, seed=None, bands=DEFAULT_BANDS, iterations=3):
+        super().__init__(graph, seed)
+        self.bands = bands
+        self.iterations = iterations
+
+    def build(self, rows, cols):
+        random_value = self.random.random
+        noise = [[random_value() for _ in range(cols)] for _ in range(rows)]
+        for _ in range(self.iterations):
+            # Box blur over 3x3 blocks, with horizontal sums per row stacked vertically
+            # as in CellularCaves
+            sums = [_add3(row[:1] + row, row, row[1:] + row[-1:]) for row in noise]
+            padded = sums[:1] + sums + sums[-1:]
+            noise = [_add3(*triple) for triple in _triples(padded)]
+        flat = [value for row in noise for value in row]
+        ranked = sorted(flat)
+        cuts = []
+        share = 0.0
+        for fraction, value in self.bands[:-1]:
+            share += fraction
+            cuts.append((ranked[min(int(share * len(ranked)), len(ranked) - 1)], value))
+        last = self.bands[-1][1]
+        cells = bytearray(len(flat))
+        for index, noise_value in enumerate(flat):
+            for cut, value in cuts:
+                if noise_value < cut:
+                    cells[index] = value
+                    break
+            else:
+                cells[index] = last
+        return cells
+
+
+GENERATORS = {
+    'random': RandomObstacles,
+    'division': RecursiveDivision,
+    'kruskal': Kruskal,
+    'prim': Prim,
+    'caves': CellularCaves,
+    'terrain': Terrain,
+    'empty': NullAlgorithm,
+}
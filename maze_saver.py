@@ -1,5 +1,32 @@
 #maze_saver.py
 import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from grid_engine import GridEngine, flatten_grid
+from landmarks import LandmarkTable
+
+# Binary layout: a fixed header followed by the cells in row-major order,
+# either one byte per cell, which holds terrain costs (see grid_engine.cell_cost)
+# as well as walls, or bit-packed (most significant bit first) for plain wall grids
+MAGIC = b'MAZE'
+FORMAT_VERSION = 1
+BYTE_PER_CELL, BIT_PACKED = 0, 1
+HEADER = struct.Struct('<4sHBBIIiiii')
+
+# Landmark tables live next to the maze in '<maze>.landmarks': a header, the landmark
+# indices as uint32 and then one table per landmark, all little-endian
+LANDMARK_MAGIC = b'LMKS'
+LANDMARK_HEADER = struct.Struct('<4sHcBIII16s')
+
+_TO_BITS = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_BITS = bytes.maketrans(b'01', b'\x00\x01')
+_FROM_DIGITS = bytes.maketrans(b'0123456789', bytes(range(10)))
+
+CHUNK_SIZE = 1 << 20
 
 def save_maze(grid, filename):
     # Save the grid directly, assuming it's alrsdfeady in a format that can be serialized (e.g., a 2D list of integers)
@@ -7,7 +34,232 @@ def save_maze(grid, filename):
         json.dump(grid, file)
 
 def load_maze(filename):
-  # Load the grid from the specified file
+  # Load the grid from the specified file, binary mazes are recognised by their header
+  if is_binary_maze(filename):
+      with load_maze_binary(filename) as maze:
+          return maze.to_grid()
+  if filename.endswith('.txt'):
+      with open(filename, 'rb') as file:
+          return [list(row) for row in iter_text_rows(file)]
   with open(filename, 'r') as file:
       grid_data = json.load(file)
   return grid_data
+
+def is_binary_maze(filename):
+    with open(filename, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+def save_maze_binary(grid, filename, start=None, goal=None, packed=False):
+    rows, cols, cells = flatten_grid(grid)
+    encoding = BYTE_PER_CELL
+    if packed:
+        if cells.translate(None, b'\x00\x01'):
+            raise ValueError(
+                "Only grids of walls (1) and free cells (0) can be bit-packed")
+        cells = _pack_bits(cells)
+        encoding = BIT_PACKED
+    start_row, start_col = start if start is not None else (-1, -1)
+    goal_row, goal_col = goal if goal is not None else (-1, -1)
+    with open(filename, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, encoding, 0, rows, cols,
+                               start_row, start_col, goal_row, goal_col))
+        file.write(cells)
+
+def load_maze_binary(filename):
+    return MazeFile(filename)
+
+def landmarks_filename(maze_filename):
+    return maze_filename + '.landmarks'
+
+def save_landmarks(table, filename):
+    landmarks = array('I', table.landmarks)
+    tables = [array(values.typecode, values) for values in table.tables]
+    if sys.byteorder == 'big':
+        for values in [landmarks] + tables:
+            values.byteswap()
+    typecode = tables[0].typecode if tables else 'H'
+    with open(filename, 'wb') as file:
+        file.write(LANDMARK_HEADER.pack(
+            LANDMARK_MAGIC, FORMAT_VERSION, typecode.encode('ascii'), len(tables),
+            table.rows, table.cols, table.checksum, table.model.name.encode('ascii')))
+        file.write(landmarks.tobytes())
+        for values in tables:
+            file.write(values.tobytes())
+
+def load_landmarks(filename, cells=None):
+    # Pass the maze's cells to reject tables built for a different version of it
+    with open(filename, 'rb') as file:
+        data = file.read()
+    header = LANDMARK_HEADER.unpack_from(data)
+    magic, version, typecode, count, rows, cols, checksum, name = header
+    if magic != LANDMARK_MAGIC or version != FORMAT_VERSION:
+        raise ValueError(
+            f"'{filename}' is not a version {FORMAT_VERSION} landmark file")
+    typecode = typecode.decode('ascii')
+    position = LANDMARK_HEADER.size
+    landmarks = array('I')
+    landmarks.frombytes(data[position:position + 4 * count])
+    position += 4 * count
+    tables = []
+    for _ in range(count):
+        values = array(typecode)
+        values.frombytes(data[position:position + values.itemsize * rows * cols])
+        position += values.itemsize * rows * cols
+        tables.append(values)
+    if sys.byteorder == 'big':
+        for values in [landmarks] + tables:
+            values.byteswap()
+    cost_model = name.rstrip(b'\0').decode('ascii')
+    table = LandmarkTable(rows, cols, cost_model, list(landmarks), tables, checksum)
+    if cells is not None:
+        if not table.matches(cells):
+            raise ValueError(f"'{filename}' was built for a different maze")
+        table.cells = bytes(cells)
+    return table
+
+def iter_text_rows(file, progress=None):
+    # Rows of space-separated cell values, one row per line, as bytes
+    for line in file:
+        if progress:
+            progress(len(line))
+        line = line.strip()
+        if not line:
+            continue
+        tokens = line.split()
+        if len(line) == 2 * len(tokens) - 1:
+            # Every value is a single digit, the common case
+            yield line[::2].translate(_FROM_DIGITS)
+        else:
+            yield bytes(map(int, tokens))
+
+def iter_json_rows(file, progress=None, chunk_size=CHUNK_SIZE):
+    # Rows of a JSON list of integer lists, parsed chunk by chunk without loading the
+    # whole document
+    buffer = b''
+    inside = False
+    while True:
+        chunk = file.read(chunk_size)
+        if progress and chunk:
+            progress(len(chunk))
+        buffer += chunk
+        position = 0
+        if not inside:
+            opening = buffer.find(b'[')
+            if opening == -1:
+                if not chunk:
+                    raise ValueError("Not a JSON maze: no opening '['")
+                buffer = b''
+                continue
+            inside = True
+            position = opening + 1
+        while True:
+            row_start = buffer.find(b'[', position)
+            outer_end = buffer.find(b']', position)
+            if outer_end != -1 and (row_start == -1 or outer_end < row_start):
+                return
+            if row_start == -1:
+                break
+            row_end = buffer.find(b']', row_start)
+            if row_end == -1:
+                position = row_start
+                break
+            values = buffer[row_start + 1:row_end].split(b',')
+            yield bytes(int(value) for value in values) if values != [b''] else b''
+            position = row_end + 1
+        buffer = buffer[position:]
+        if not chunk:
+            raise ValueError("Truncated JSON maze")
+
+def load_maze_streaming(filename, progress=None):
+    """Read a JSON, text or binary maze row by row into a flat buffer.
+
+    Returns (rows, cols, cells). Only one chunk of the file and the growing
+    bytearray of cells are held in memory, never a list of lists. progress,
+    if given, is called with (bytes_read, total_bytes) as the file is
+    consumed.
+    """
+    if is_binary_maze(filename):
+        with load_maze_binary(filename) as maze:
+            return maze.rows, maze.cols, bytearray(maze.cells)
+
+    total = os.path.getsize(filename)
+    read = 0
+
+    def report(count):
+        nonlocal read
+        read += count
+        if progress:
+            progress(read, total)
+
+    cells = bytearray()
+    rows, cols = 0, None
+    with open(filename, 'rb') as file:
+        first = file.read(CHUNK_SIZE).lstrip()[:1]
+        file.seek(0)
+        rows_of = iter_json_rows if first == b'[' else iter_text_rows
+        reader = rows_of(file, report)
+        for row in reader:
+            if cols is None:
+                cols = len(row)
+            elif len(row) != cols:
+                raise ValueError(f"Row {rows} of '{filename}' has {len(row)} cells, "
+                                 f"expected {cols}")
+            cells += row
+            rows += 1
+    return rows, cols or 0, cells
+
+def _pack_bits(cells):
+    padding = -len(cells) % 8
+    bits = cells.translate(_TO_BITS) + b'0' * padding
+    return int(bits, 2).to_bytes(len(bits) // 8, 'big') if bits else b''
+
+def _unpack_bits(data, count):
+    if count == 0:
+        return bytearray()
+    bits = format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b').encode('ascii')
+    return bytearray(bits[:count].translate(_FROM_BITS))
+
+
+class MazeFile:
+    """A binary maze opened through mmap.
+
+    For byte-per-cell files, cells is a read-only view straight into the
+    mapped file, so searches can run on it without copying anything;
+    bit-packed files are unpacked into memory once.
+    """
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, encoding, _, rows, cols, *points = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.map.close()
+            raise ValueError(
+                f"'{filename}' is not a version {FORMAT_VERSION} binary maze")
+        self.rows, self.cols = rows, cols
+        self.start = (points[0], points[1]) if points[0] >= 0 else None
+        self.goal = (points[2], points[3]) if points[2] >= 0 else None
+        if encoding == BIT_PACKED:
+            payload = self.map[HEADER.size:HEADER.size + (rows * cols + 7) // 8]
+            self.cells = _unpack_bits(payload, rows * cols)
+        else:
+            self.cells = memoryview(self.map)[HEADER.size:HEADER.size + rows * cols]
+
+    def engine(self):
+        return GridEngine(self.rows, self.cols, self.cells)
+
+    def to_grid(self):
+        cols = self.cols
+        cells = self.cells
+        return [list(cells[row * cols:(row + 1) * cols]) for row in range(self.rows)]
+
+    def close(self):
+        if isinstance(self.cells, memoryview):
+            self.cells.release()
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,71 @@
+# parallel.py
+import os
+from multiprocessing import get_context, shared_memory
+
+from connectivity import ConnectivityIndex
+from grid_engine import GridEngine, get_cost_model, grid_shape
+from pathfinding_algorithms import solve_batch_on_engine
+
+# Per-process state, set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(name, rows, cols, cost_model):
+    # Attach to the parent's shared grid buffer and build this worker's search state
+    # over it
+    memory = shared_memory.SharedMemory(name=name)
+    cells = memory.buf[:rows * cols]
+    _worker['memory'] = memory
+    _worker['engine'] = GridEngine(rows, cols, cells)
+    _worker['cost_model'] = cost_model
+    directions = get_cost_model(cost_model).directions
+    _worker['connectivity'] = ConnectivityIndex(rows, cols, cells, directions)
+
+
+def _solve_chunk(queries):
+    return solve_batch_on_engine(_worker['engine'], queries, _worker['cost_model'],
+                                 _worker['connectivity'])
+
+
+class ParallelSolver:
+    """Answers (start, goal) queries on one grid across a pool of worker processes.
+
+    The grid is copied once into a shared memory block that every worker
+    maps read-only, so tasks only carry their queries. Queries are sent in
+    chunks of consecutive entries; each chunk is solved as a batch, so
+    queries sharing a start in the same chunk share one search tree.
+    """
+
+    def __init__(self, grid, processes=None, cost_model='chebyshev'):
+        rows, cols = grid_shape(grid)
+        self.memory = shared_memory.SharedMemory(create=True, size=max(rows * cols, 1))
+        for row, values in enumerate(grid):
+            self.memory.buf[row * cols:(row + 1) * cols] = bytes(values)
+        self.pool = get_context().Pool(
+            processes or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(self.memory.name, rows, cols, get_cost_model(cost_model).name),
+        )
+
+    def solve(self, queries, chunksize=64):
+        # Yields one path per query, in submission order, as soon as its chunk is done
+        chunks = [queries[i:i + chunksize] for i in range(0, len(queries), chunksize)]
+        for paths in self.pool.imap(_solve_chunk, chunks):
+            yield from paths
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def solve_parallel(grid, queries, processes=None, cost_model='chebyshev', chunksize=64):
+    with ParallelSolver(grid, processes, cost_model) as solver:
+        return list(solver.solve(queries, chunksize))
@@ -0,0 +1,105 @@
+# path_cache.py
+from collections import OrderedDict
+
+from grid_engine import cell_cost, flatten_grid
+
+
+class PathCache:
+    """LRU cache of search results for one Grid, bounded in entries and path cells.
+
+    Entries are keyed by (start, goal, algorithm) and tied to the grid's
+    version. The cache listens to Grid.set_cell and keeps a copy of the
+    cell values to tell what an edit did: a cell getting dearer (heavier
+    terrain or a wall) only drops the cached paths that cross it, since
+    every other result stays optimal, while a cell getting cheaper could
+    open a shortcut and flushes everything. Edits the cache did not see (a
+    reset, a new Grid) are caught by the version check and also flush.
+    """
+
+    def __init__(self, max_entries=1024, max_cells=1_000_000):
+        self.max_entries = max_entries
+        self.max_cells = max_cells
+        self.entries = OrderedDict()
+        self.by_cell = {}
+        self.cells = 0
+        self.grid = None
+        self.version = None
+        self.values = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, grid, start, goal, algorithm):
+        self._sync(grid)
+        key = (start, goal, algorithm)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return list(self.entries[key])
+        self.misses += 1
+        return None
+
+    def put(self, grid, start, goal, algorithm, path):
+        self._sync(grid)
+        key = (start, goal, algorithm)
+        self._remove(key)
+        self.entries[key] = tuple(path)
+        self.cells += len(path)
+        for cell in path:
+            self.by_cell.setdefault(cell, set()).add(key)
+        while self.entries and (len(self.entries) > self.max_entries
+                                or self.cells > self.max_cells):
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def cell_changed(self, row, col, value):
+        index = row * self.grid.cols + col
+        previous, self.values[index] = self.values[index], value
+        if cell_cost(value) >= cell_cost(previous):
+            for key in list(self.by_cell.get((row, col), ())):
+                self._remove(key)
+                self.invalidations += 1
+        else:
+            self.invalidations += len(self.entries)
+            self.clear()
+        if self.grid is not None:
+            self.version = self.grid.version
+
+    def clear(self):
+        self.entries.clear()
+        self.by_cell.clear()
+        self.cells = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self.entries),
+            'cells': self.cells,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+    def _sync(self, grid):
+        if grid is self.grid and grid.version == self.version:
+            return
+        self.clear()
+        self.grid = grid
+        self.version = grid.version
+        _, _, self.values = flatten_grid(grid.grid)
+        if self.cell_changed not in grid.listeners:
+            grid.add_listener(self.cell_changed)
+
+    def _remove(self, key):
+        path = self.entries.pop(key, None)
+        if path is None:
+            return
+        self.cells -= len(path)
+        for cell in path:
+            keys = self.by_cell[cell]
+            keys.discard(key)
+            if not keys:
+                del self.by_cell[cell]
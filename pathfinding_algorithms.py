@@ -1,84 +1,183 @@
 # pathfinding_algorithms.py
-import heapq
+from connectivity import ConnectivityIndex
+from grid_engine import GridEngine, cell_cost, engine_for, get_cost_model
+from hpa import planner_for
+from landmarks import landmarks_for
 
-def dijkstra(grid, start, goal):
-    open_list = [(0, start)]
-    came_from = {}
-    cost = {(row, col): float('inf') for row in range(len(grid)) for col in range(len(grid[0]))}
-    cost[start] = 0
-    nodes_examined = 0  # Initialize counter for nodes examined
+# Pass a dict as stats to any search to receive its 'nodes_examined' count
 
-    while open_list:
-        current_cost, current = heapq.heappop(open_list)
-        nodes_examined += 1  # Increment counter for each node examined
-        if current == goal:
-            path = reconstruct_path(came_from, start, goal)
-            print("Nodes Examined (Dijkstra):", nodes_examined)  # Print number of nodes examined
-            return path
-
-        directions = [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-
-        for dx, dy in directions:
-            neighbor = current[0] + dx, current[1] + dy
-
-            if not (0 <= neighbor[0] < len(grid) and 0 <= neighbor[1] < len(grid[0])):
-                continue
-
-            if grid[neighbor[0]][neighbor[1]] == 1:
-                continue
+def dijkstra(grid, start, goal, cost_model='chebyshev', engine=None, stats=None):
+    engine = engine or engine_for(grid)
+    path = engine.search(start, goal, cost_model=cost_model)
+    _record(engine, stats)
+    return path
 
-            tentative_cost = cost[current] + 1
 
-            if tentative_cost < cost[neighbor]:
-                came_from[neighbor] = current
-                cost[neighbor] = tentative_cost
-                heapq.heappush(open_list, (cost[neighbor], neighbor))
+def astar(grid, start, goal, cost_model='chebyshev', tie_breaker='counter', engine=None,
+          stats=None):
+    engine = engine or engine_for(grid)
+    heuristic = engine.heuristic_for(goal, cost_model)
+    path = engine.search(start, goal, heuristic, cost_model, tie_breaker)
+    _record(engine, stats)
+    return path
 
-    print("Nodes Examined (Dijkstra):", nodes_examined)  # Print number of nodes examined
-    return []
 
+def jump_point_search(grid, start, goal, cost_model='chebyshev', engine=None,
+                      stats=None):
+    engine = engine or engine_for(grid)
+    if engine.weighted():
+        # Jumps skip over cells whose costs they would have to add up, so terrain
+        # falls back to A*
+        heuristic = engine.heuristic_for(goal, cost_model)
+        path = engine.search(start, goal, heuristic, cost_model)
+    else:
+        path = engine.jump_point_search(start, goal, cost_model)
+    _record(engine, stats)
+    return path
 
-def astar(grid, start, goal):
-    open_list = [(0, start)]
-    came_from = {}
-    g_score = {(row, col): float('inf') for row in range(len(grid)) for col in range(len(grid[0]))}
-    g_score[start] = 0
-    f_score = {(row, col): float('inf') for row in range(len(grid)) for col in range(len(grid[0]))}
-    f_score[start] = heuristic(start, goal)
-    nodes_examined = 0  # Initialize counter for nodes examined
 
-    while open_list:
-        current_f, current = heapq.heappop(open_list)
-        nodes_examined += 1  # Increment counter for each node examined
-        if current == goal:
-            path = reconstruct_path(came_from, start, goal)
-            print("Nodes Examined (A*):", nodes_examined)  # Print number of nodes examined
-            return path
+def alt_astar(grid, start, goal, cost_model='chebyshev', landmarks=None, engine=None,
+              stats=None):
+    # A* with landmark (ALT) lower bounds; without a LandmarkTable one is built for
+    # grid on first use and kept
+    engine = engine or engine_for(grid)
+    landmarks = landmarks or landmarks_for(grid, cost_model)
+    heuristic = landmarks.heuristic_for(goal, engine.cells)
+    path = engine.search(start, goal, heuristic, landmarks.model, algorithm='alt_astar')
+    _record(engine, stats)
+    return path
 
-        directions = [(0, -1), (0, 1), (-1, 0), (1, 0), (1, 1), (-1, -1), (-1, 1), (1, -1)]
 
-        for dx, dy in directions:
-            neighbor = current[0] + dx, current[1] + dy
+def bidirectional_dijkstra(grid, start, goal, cost_model='chebyshev', engine=None,
+                           stats=None):
+    # Grows Dijkstra from both ends, see GridEngine.bidirectional_search
+    engine = engine or engine_for(grid)
+    path = engine.bidirectional_search(start, goal, cost_model)
+    _record(engine, stats)
+    return path
 
-            if not (0 <= neighbor[0] < len(grid) and 0 <= neighbor[1] < len(grid[0])):
-                continue
 
-            if grid[neighbor[0]][neighbor[1]] == 1:
-                continue
+def bidirectional_astar(grid, start, goal, cost_model='chebyshev', engine=None,
+                        stats=None):
+    engine = engine or engine_for(grid)
+    path = engine.bidirectional_search(start, goal, cost_model, informed=True)
+    _record(engine, stats)
+    return path
 
-            tentative_g_score = g_score[current] + 1
 
-            if tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + heuristic(neighbor, goal)
-                heapq.heappush(open_list, (f_score[neighbor], neighbor))
+def hpa_star(grid, start, goal, cost_model='chebyshev', stats=None):
+    # Near-optimal hierarchical search; the abstract graph is built on first use,
+    # which takes seconds on large maps, and patched as the grid changes
+    planner = planner_for(grid, cost_model)
+    path = planner.path(start, goal)
+    _record(planner, stats)
+    return path
 
-    print("Nodes Examined (A*):", nodes_examined)  # Print number of nodes examined
-    return []
 
-def heuristic(node, goal):
-    return abs(node[0] - goal[0]) + abs(node[1] - goal[1])
+def dijkstra_steps(grid, start, goal, cost_model='chebyshev', batch_size=256,
+                   engine=None):
+    # Generator form of dijkstra, see GridEngine.search_steps; runs on a private copy
+    # of the grid by default
+    engine = engine or GridEngine.from_grid(grid)
+    return engine.search_steps(start, goal, None, cost_model, batch_size=batch_size)
+
+
+def astar_steps(grid, start, goal, cost_model='chebyshev', tie_breaker='counter',
+                batch_size=256, engine=None):
+    engine = engine or GridEngine.from_grid(grid)
+    heuristic = engine.heuristic_for(goal, cost_model)
+    return engine.search_steps(start, goal, heuristic, cost_model, tie_breaker,
+                               batch_size)
+
+
+def _record(engine, stats):
+    if stats is not None:
+        stats['nodes_examined'] = engine.nodes_examined
+
+
+# Searches selectable by name from the benchmark and the command line; each takes
+# (grid, start, goal, cost_model=..., stats=...) and returns a path
+ALGORITHMS = {
+    'dijkstra': dijkstra,
+    'astar': astar,
+    'jump_point_search': jump_point_search,
+    'bidirectional_dijkstra': bidirectional_dijkstra,
+    'bidirectional_astar': bidirectional_astar,
+    'alt_astar': alt_astar,
+    'hpa_star': hpa_star,
+}
+
+
+def register_algorithm(name, algorithm):
+    ALGORITHMS[name] = algorithm
+
+
+def solve_batch(grid, queries, cost_model='chebyshev'):
+    """Answer many (start, goal) queries on one grid, returning paths in query order.
+
+    Queries are grouped by shared endpoint: every group runs a single
+    Dijkstra tree that stops once all of its goals are settled, and groups
+    with a single query run A* instead. When goals repeat more than starts
+    the trees are grown from the goals and the paths reversed. That needs a
+    path and its reverse to rank the same: always true without terrain,
+    and with terrain only when every step costs 1, since reversing then
+    shifts all paths between two cells by the same end-cell difference.
+    Weighted octile grids are always searched forwards. Pairs in different
+    components are answered from a connectivity index without searching at
+    all.
+    """
+    return solve_batch_on_engine(engine_for(grid), queries, cost_model)
+
+
+def solve_batch_on_engine(engine, queries, cost_model='chebyshev', connectivity=None):
+    # solve_batch over an already loaded engine, optionally reusing a connectivity
+    # index built for it
+    model = get_cost_model(cost_model)
+    if connectivity is None:
+        connectivity = ConnectivityIndex(engine.rows, engine.cols, engine.cells,
+                                         model.directions)
+    goals = {goal for _, goal in queries}
+    starts = {start for start, _ in queries}
+    reverse = len(goals) < len(starts) and (
+        model.diagonal_cost == 1 or not engine.weighted())
+
+    groups = {}
+    for position, (start, goal) in enumerate(queries):
+        if not connectivity.reachable(start, goal):
+            continue
+        # A search may leave a walled start but never enter a walled goal, so those
+        # queries stay forward
+        if reverse and connectivity.component(start) != -1:
+            groups.setdefault((goal, True), []).append((position, start))
+        else:
+            groups.setdefault((start, False), []).append((position, goal))
+
+    paths = [[] for _ in queries]
+    for (source, reversed_group), members in groups.items():
+        targets = {target for _, target in members}
+        if len(targets) == 1:
+            target = next(iter(targets))
+            heuristic = engine.heuristic_for(target, model)
+            tree = {target: engine.search(source, target, heuristic, model)}
+        else:
+            tree = engine.search_tree(source, targets, model)
+        for position, target in members:
+            path = tree[target]
+            paths[position] = path[::-1] if reversed_group else list(path)
+    return paths
+
+def heuristic(node, goal, cost_model='chebyshev'):
+    distance = get_cost_model(cost_model).distance
+    return distance(abs(node[0] - goal[0]), abs(node[1] - goal[1]))
+
+def path_cost(path, cost_model='chebyshev', grid=None):
+    # Pass the grid to charge each step the terrain cost of the cell it enters
+    model = get_cost_model(cost_model)
+    steps = zip(path, path[1:], strict=False)
+    if grid is None:
+        return sum(model.step_cost(r2 - r1, c2 - c1) for (r1, c1), (r2, c2) in steps)
+    return sum(model.step_cost(r2 - r1, c2 - c1) * cell_cost(grid[r2][c2])
+               for (r1, c1), (r2, c2) in steps)
 
 def reconstruct_path(came_from, start, goal):
     path = []
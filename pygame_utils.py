@@ -1,10 +1,58 @@
 # pygame_utils.py
+import time
+from collections import OrderedDict, deque
+
 import pygame
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+# Whole-grid surfaces can only be built in one step when NumPy is installed
+VECTORIZED = numpy is not None
+
+WALL_COLOR = (0, 0, 0)
+FREE_COLOR = (255, 255, 255)
+BORDER_COLOR = (0, 0, 0)
+START_COLOR = (255, 0, 0)
+GOAL_COLOR = (0, 0, 255)
+PATH_COLOR = (0, 255, 0)
+VISITED_COLOR = (190, 220, 255)
+FRONTIER_COLOR = (255, 230, 150)
+# Terrain shades run from light (cost 2) to dark (cost 9 and up)
+LIGHT_TERRAIN_COLOR = (225, 205, 160)
+DARK_TERRAIN_COLOR = (110, 75, 40)
+
+# Larger maps are shown through a Camera instead of growing the window
+MAX_WINDOW_SIZE = (1280, 800)
+ZOOM_LEVELS = [1, 2, 3, 4, 6, 8, 12, 16, 25, 40]
+TILE_CELLS = 64
+# Tile cache budget in pixels, about 128 MB at 32 bits per pixel; a tile grows with
+# the square of the cell size, so this holds thousands of tiles zoomed out but only
+# the few a full window shows at the largest zoom
+MAX_CACHED_PIXELS = 32 * 2 ** 20
+
+
+def cell_color(value):
+  if value == 0:
+    return FREE_COLOR
+  if value == 1:
+    return WALL_COLOR
+  shade = (min(value, 9) - 2) / 7
+  pairs = zip(LIGHT_TERRAIN_COLOR, DARK_TERRAIN_COLOR, strict=True)
+  return tuple(round(light + (dark - light) * shade) for light, dark in pairs)
+
+
+# Colour of every possible cell value, for palette lookups
+PALETTE = [cell_color(value) for value in range(256)]
+
 
 def initialize_pygame(rows, cols, cell_size, caption):
   pygame.init()
-  screen = pygame.display.set_mode((cols * cell_size, rows * cell_size))
+  width = min(cols * cell_size, MAX_WINDOW_SIZE[0])
+  height = min(rows * cell_size, MAX_WINDOW_SIZE[1])
+  screen = pygame.display.set_mode((width, height))
   pygame.display.set_caption(caption)
   return screen
 
@@ -12,13 +60,52 @@ def initialize_pygame(rows, cols, cell_size, caption):
 def draw_grid(screen, grid, cell_size):
   for row in range(len(grid)):
     for col in range(len(grid[0])):
-      color = (0, 0, 0) if grid[row][col] == 1 else (255, 255, 255)
-      pygame.draw.rect(
-          screen, color,
-          (col * cell_size, row * cell_size, cell_size, cell_size))
-      pygame.draw.rect(
-          screen, (0, 0, 0),
-          (col * cell_size, row * cell_size, cell_size, cell_size), 1)
+      draw_cell(screen, row, col, grid[row][col], cell_size)
+
+
+def grid_surface(grid, cell_size, layers=()):
+  """Build the surface for a whole grid with NumPy instead of one rect per cell.
+
+  grid is a list of rows or a (rows, cols, buffer) tuple over a flat cell
+  buffer. Cell colours come from a palette lookup, each (cells, colour)
+  layer is painted over them in order, and the result is scaled up to
+  cell_size in one call before the cell borders are drawn as array slices.
+  """
+  if isinstance(grid, tuple):
+    rows, cols, buffer = grid
+    values = numpy.frombuffer(buffer, dtype=numpy.uint8, count=rows * cols)
+    values = values.reshape(rows, cols)
+  else:
+    values = numpy.array(grid, dtype=numpy.uint8).reshape(len(grid), -1)
+  pixels = numpy.array(PALETTE, dtype=numpy.uint8)[values]
+  for cells, color in layers:
+    cells = numpy.asarray(list(cells), dtype=numpy.intp).reshape(-1, 2)
+    if len(cells):
+      pixels[cells[:, 0], cells[:, 1]] = color
+
+  surface = pygame.surfarray.make_surface(pixels.transpose(1, 0, 2))
+  size = (values.shape[1] * cell_size, values.shape[0] * cell_size)
+  surface = pygame.transform.scale(surface, size)
+  if cell_size > 2:
+    border = pygame.surfarray.pixels3d(surface)
+    border[::cell_size, :] = BORDER_COLOR
+    border[:, ::cell_size] = BORDER_COLOR
+    border[cell_size - 1::cell_size, :] = BORDER_COLOR
+    border[:, cell_size - 1::cell_size] = BORDER_COLOR
+    del border
+  return surface
+
+
+def draw_cell(screen, row, col, value, cell_size):
+  color = PALETTE[value]
+  pygame.draw.rect(
+      screen, color,
+      (col * cell_size, row * cell_size, cell_size, cell_size))
+  # Borders would swallow cells only a pixel or two wide
+  if cell_size > 2:
+    pygame.draw.rect(
+        screen, BORDER_COLOR,
+        (col * cell_size, row * cell_size, cell_size, cell_size), 1)
 
 
 def draw_path(screen, path, cell_size, color):
@@ -45,3 +132,353 @@ def display_message(screen, message, font_size, position, color):
 
 def update_display():
   pygame.display.flip()
+
+
+def _by_color(cells):
+  # {cell: colour} to grid_surface layers, one (cells, colour) pair per colour in
+  # first-seen order
+  layers = {}
+  for cell, color in cells.items():
+    layers.setdefault(color, []).append(cell)
+  return [(cells, color) for color, cells in layers.items()]
+
+
+class GridRenderer:
+  """Retained-mode grid drawing that only repaints cells that changed.
+
+  The walls are kept on an offscreen background surface. Each frame the
+  grid is compared against the snapshot last drawn, and the path, start
+  and goal overlay against the one last shown. Only cells that differ are
+  repainted and pushed with pygame.display.update(rects); a full redraw
+  happens on the first frame, after invalidate(), or when so many cells
+  changed that rebuilding the whole background with grid_surface (when
+  NumPy is available) is cheaper than repainting them one by one.
+
+  Cells given to paint_cells (a search's visited and frontier deltas)
+  form a layer on the background that survives full redraws until
+  clear_layer().
+  """
+
+  def __init__(self, screen, cell_size):
+    self.screen = screen
+    self.cell_size = cell_size
+    self.background = pygame.Surface(screen.get_size())
+    self.snapshot = None
+    self.overlay = {}
+    self.full_redraw = True
+    self.show_stats = True
+    self.stats_rect = None
+    self.font = pygame.font.Font(None, 20)
+    self.frame_times = deque(maxlen=30)
+    self.layer = {}
+    self.painted = set()
+
+  def invalidate(self):
+    self.full_redraw = True
+
+  def paint_cells(self, cells, color):
+    # Paint search deltas straight onto the background; they are pushed with the next
+    # frame's dirty rects
+    cell_size = self.cell_size
+    for row, col in cells:
+      self.layer[(row, col)] = color
+      rect = (col * cell_size, row * cell_size, cell_size, cell_size)
+      pygame.draw.rect(self.background, color, rect)
+      if cell_size > 2:
+        pygame.draw.rect(self.background, BORDER_COLOR, rect, 1)
+    self.painted.update(cells)
+
+  def clear_layer(self):
+    self.layer.clear()
+    self.painted.clear()
+    self.invalidate()
+
+  def render(self, grid, path, start, goal, visited=()):
+    started = time.perf_counter()
+    cell_size = self.cell_size
+    overlay = dict.fromkeys(visited, VISITED_COLOR)
+    overlay.update((cell, PATH_COLOR) for cell in path)
+    overlay[start] = START_COLOR
+    overlay[goal] = GOAL_COLOR
+
+    if not self.full_redraw and VECTORIZED and self.snapshot is not None \
+        and self._changed_cells(grid) > len(grid) * len(grid[0]) // 4:
+      self.full_redraw = True
+
+    if self.full_redraw or self.snapshot is None or len(self.snapshot) != len(grid) \
+        or (grid and len(self.snapshot[0]) != len(grid[0])):
+      if VECTORIZED and grid:
+        # Composite the search layer as arrays too
+        self.background = grid_surface(grid, cell_size, _by_color(self.layer))
+      else:
+        self.background.fill(FREE_COLOR)
+        draw_grid(self.background, grid, cell_size)
+        for (row, col), color in self.layer.items():
+          rect = (col * cell_size, row * cell_size, cell_size, cell_size)
+          pygame.draw.rect(self.background, color, rect)
+          if cell_size > 2:
+            pygame.draw.rect(self.background, BORDER_COLOR, rect, 1)
+      # The overlay cells are painted over the background, the same way the
+      # incremental frames below draw them
+      self.screen.blit(self.background, (0, 0))
+      for (row, col), color in overlay.items():
+        rect = (col * cell_size, row * cell_size, cell_size, cell_size)
+        pygame.draw.rect(self.screen, color, rect)
+      self.snapshot = [row[:] for row in grid]
+      self.painted = set()
+      self.overlay = overlay
+      self.full_redraw = False
+      self.stats_rect = None
+      self._draw_stats(len(grid) * len(grid[0]) if grid else 0, started)
+      pygame.display.flip()
+      return
+
+    dirty = set()
+    for row, (values, drawn) in enumerate(zip(grid, self.snapshot, strict=True)):
+      if values != drawn:
+        for col, value in enumerate(values):
+          if value != drawn[col]:
+            draw_cell(self.background, row, col, value, cell_size)
+            self.layer.pop((row, col), None)
+            drawn[col] = value
+            dirty.add((row, col))
+    for cell in self.overlay.keys() | overlay.keys():
+      if self.overlay.get(cell) != overlay.get(cell):
+        dirty.add(cell)
+    if self.stats_rect is not None:
+      cols = len(grid[0]) if grid else 0
+      dirty |= self._cells_under(self.stats_rect, len(grid), cols)
+    dirty |= self.painted
+    self.painted = set()
+
+    rects = []
+    for row, col in dirty:
+      rect = pygame.Rect(col * cell_size, row * cell_size, cell_size, cell_size)
+      self.screen.blit(self.background, rect, rect)
+      if (row, col) in overlay:
+        pygame.draw.rect(self.screen, overlay[(row, col)], rect)
+      rects.append(rect)
+    self.overlay = overlay
+    stats_rect = self._draw_stats(len(dirty), started)
+    if stats_rect is not None:
+      rects.append(stats_rect)
+    if rects:
+      pygame.display.update(rects)
+
+  def _changed_cells(self, grid):
+    changed = 0
+    # Called before the shape check, so grid and the snapshot may differ in size
+    for values, drawn in zip(grid, self.snapshot, strict=False):
+      if values != drawn:
+        pairs = zip(values, drawn, strict=False)
+        changed += sum(1 for value, old in pairs if value != old)
+    return changed
+
+  def _cells_under(self, rect, rows, cols):
+    cell_size = self.cell_size
+    return {
+        (row, col)
+        for row in range(rect.top // cell_size, min(rows, rect.bottom // cell_size + 1))
+        for col in range(rect.left // cell_size, min(cols, rect.right // cell_size + 1))
+    }
+
+  def _draw_stats(self, cells_drawn, started):
+    # Frame-time overlay: average render time and the number of cells repainted this
+    # frame
+    self.frame_times.append(time.perf_counter() - started)
+    if not self.show_stats:
+      self.stats_rect = None
+      return None
+    average = sum(self.frame_times) / len(self.frame_times) * 1000
+    message = f"{average:.2f} ms/frame, {cells_drawn} cells redrawn"
+    text = self.font.render(message, True, (255, 255, 255), (0, 0, 0))
+    self.stats_rect = self.screen.blit(text, (0, 0))
+    return self.stats_rect
+
+
+class Camera:
+  """Maps between window pixels and grid cells for a pannable, zoomable view.
+
+  x and y are the world-pixel coordinates (at the current cell size) of
+  the window's top-left corner.
+  """
+
+  def __init__(self, rows, cols, cell_size, width, height):
+    self.rows = rows
+    self.cols = cols
+    self.width = width
+    self.height = height
+    self.default_cell_size = cell_size
+    self.zoom_levels = sorted(set(ZOOM_LEVELS) | {cell_size})
+    self.cell_size = cell_size
+    self.x = 0
+    self.y = 0
+
+  def screen_to_cell(self, pos):
+    return (pos[1] + self.y) // self.cell_size, (pos[0] + self.x) // self.cell_size
+
+  def cell_rect(self, row, col):
+    cell_size = self.cell_size
+    x, y = col * cell_size - self.x, row * cell_size - self.y
+    return pygame.Rect(x, y, cell_size, cell_size)
+
+  def visible_cells(self):
+    # (first_row, last_row, first_col, last_col), end-exclusive and clamped to the grid
+    cell_size = self.cell_size
+    return (
+        self.y // cell_size, min(self.rows, (self.y + self.height) // cell_size + 1),
+        self.x // cell_size, min(self.cols, (self.x + self.width) // cell_size + 1),
+    )
+
+  def shows_whole_grid(self):
+    return self.cell_size == self.default_cell_size and self.x == 0 and self.y == 0 \
+        and self.cols * self.cell_size <= self.width \
+        and self.rows * self.cell_size <= self.height
+
+  def pan(self, dx, dy):
+    self.x += dx
+    self.y += dy
+    self._clamp()
+
+  def zoom(self, steps, pos=None):
+    # Step through the zoom levels, keeping the cell under pos (the window centre by
+    # default) in place
+    pos = pos or (self.width // 2, self.height // 2)
+    level = self.zoom_levels.index(self.cell_size)
+    cell_size = self.zoom_levels[max(0, min(len(self.zoom_levels) - 1, level + steps))]
+    world_x = (pos[0] + self.x) / self.cell_size
+    world_y = (pos[1] + self.y) / self.cell_size
+    self.cell_size = cell_size
+    self.x = int(world_x * cell_size) - pos[0]
+    self.y = int(world_y * cell_size) - pos[1]
+    self._clamp()
+
+  def reset(self):
+    self.cell_size = self.default_cell_size
+    self.x = self.y = 0
+
+  def _clamp(self):
+    self.x = max(0, min(self.x, self.cols * self.cell_size - self.width))
+    self.y = max(0, min(self.y, self.rows * self.cell_size - self.height))
+
+
+class TiledGridRenderer(GridRenderer):
+  """Draws only the tiles of the grid that are visible through a Camera.
+
+  Tiles of TILE_CELLS x TILE_CELLS cells are rendered once per zoom level
+  and kept in an LRU cache of at most MAX_CACHED_PIXELS. The renderer
+  listens to Grid.set_cell and only drops the tiles containing edited
+  cells; any change it did not hear about (a reset, a new Grid) shows up
+  as a version mismatch and clears the whole cache.
+  """
+
+  def __init__(self, screen, camera):
+    super().__init__(screen, camera.cell_size)
+    self.camera = camera
+    self.tiles = OrderedDict()
+    self.pixels = 0  # Total size of the cached tiles
+    self.grid = None
+    self.version = None
+    self.layer = {}
+
+  def detach(self):
+    # Stop listening to the grid, for renderers that are being replaced
+    if self.grid is not None:
+      self.grid.remove_listener(self.cell_changed)
+      self.grid = None
+
+  def cell_changed(self, row, col, _value):
+    tile = (row // TILE_CELLS, col // TILE_CELLS)
+    for key in [key for key in self.tiles if key[1:] == tile]:
+      self._drop(key)
+    self.layer.get(tile, {}).pop((row, col), None)
+    self.version = self.grid.version
+
+  def paint_cells(self, cells, color):
+    # Search deltas are kept per tile and drawn into every cached tile that holds them
+    for row, col in cells:
+      tile = (row // TILE_CELLS, col // TILE_CELLS)
+      self.layer.setdefault(tile, {})[(row, col)] = color
+      for cell_size in self.camera.zoom_levels:
+        surface = self.tiles.get((cell_size,) + tile)
+        if surface is not None:
+          self._paint(surface, cell_size, tile, row, col, color)
+
+  def clear_layer(self):
+    self.layer.clear()
+    self._clear_tiles()
+
+  def _clear_tiles(self):
+    self.tiles.clear()
+    self.pixels = 0
+
+  def _drop(self, key):
+    tile = self.tiles.pop(key)
+    self.pixels -= tile.get_width() * tile.get_height()
+
+  def _paint(self, surface, cell_size, tile, row, col, color):
+    x = (col - tile[1] * TILE_CELLS) * cell_size
+    y = (row - tile[0] * TILE_CELLS) * cell_size
+    rect = (x, y, cell_size, cell_size)
+    pygame.draw.rect(surface, color, rect)
+    if cell_size > 2:
+      pygame.draw.rect(surface, BORDER_COLOR, rect, 1)
+
+  def render(self, grid, path, start, goal, visited=()):
+    # grid is the Grid object here, so its listeners and version can be used
+    started = time.perf_counter()
+    if grid is not self.grid or grid.version != self.version:
+      self._clear_tiles()
+      if grid is not self.grid:
+        self.detach()
+      self.grid = grid
+      self.version = grid.version
+      if self.cell_changed not in grid.listeners:
+        grid.add_listener(self.cell_changed)
+
+    camera = self.camera
+    cell_size = camera.cell_size
+    first_row, last_row, first_col, last_col = camera.visible_cells()
+    self.screen.fill(FREE_COLOR)
+    drawn = 0
+    for tile_row in range(first_row // TILE_CELLS, (last_row - 1) // TILE_CELLS + 1):
+      for tile_col in range(first_col // TILE_CELLS, (last_col - 1) // TILE_CELLS + 1):
+        tile = self._tile(grid.grid, cell_size, tile_row, tile_col)
+        x = tile_col * TILE_CELLS * cell_size - camera.x
+        y = tile_row * TILE_CELLS * cell_size - camera.y
+        self.screen.blit(tile, (x, y))
+        drawn += tile.get_width() * tile.get_height() // (cell_size * cell_size)
+
+    def visible(cell):
+      return first_row <= cell[0] < last_row and first_col <= cell[1] < last_col
+
+    layers = ((visited, VISITED_COLOR), (path, PATH_COLOR),
+              ((start,), START_COLOR), ((goal,), GOAL_COLOR))
+    for cells, color in layers:
+      for cell in cells:
+        if visible(cell):
+          pygame.draw.rect(self.screen, color, camera.cell_rect(*cell))
+    self._draw_stats(drawn, started)
+    pygame.display.flip()
+
+  def _tile(self, grid, cell_size, tile_row, tile_col):
+    key = (cell_size, tile_row, tile_col)
+    if key in self.tiles:
+      self.tiles.move_to_end(key)
+      return self.tiles[key]
+    row_start, col_start = tile_row * TILE_CELLS, tile_col * TILE_CELLS
+    rows = grid[row_start:row_start + TILE_CELLS]
+    cells = [values[col_start:col_start + TILE_CELLS] for values in rows]
+    if VECTORIZED:
+      tile = grid_surface(cells, cell_size)
+    else:
+      tile = pygame.Surface((len(cells[0]) * cell_size, len(cells) * cell_size))
+      tile.fill(FREE_COLOR)
+      draw_grid(tile, cells, cell_size)
+    for (row, col), color in self.layer.get((tile_row, tile_col), {}).items():
+      self._paint(tile, cell_size, (tile_row, tile_col), row, col, color)
+    self.tiles[key] = tile
+    self.pixels += tile.get_width() * tile.get_height()
+    while self.pixels > MAX_CACHED_PIXELS and len(self.tiles) > 1:
+      self._drop(next(iter(self.tiles)))
+    return tile
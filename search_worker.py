@@ -0,0 +1,98 @@
+# search_worker.py
+import queue
+import threading
+import time
+
+
+class SearchResult:
+    def __init__(self, name, path, nodes_examined, elapsed, cancelled, context,
+                 error=None, value=None):
+        self.name = name
+        self.path = path
+        self.nodes_examined = nodes_examined
+        self.elapsed = elapsed
+        self.cancelled = cancelled
+        self.context = context
+        # The exception the search raised, if it failed
+        self.error = error
+        # What a task built on the way to its path, e.g. a planner worth keeping
+        self.value = value
+
+
+class SearchWorker:
+    """Runs one search at a time on a background thread so the event loop keeps drawing.
+
+    Each search gets its own GridEngine, built by the caller from a snapshot
+    of the grid, so edits made while it runs do not affect it. The engine's
+    progress hook publishes the expansion count and checks for cancellation;
+    the finished SearchResult is delivered through the results queue, also
+    when the search raised. submit_task runs any other work that ends in a
+    path the same way, such as building a planner before querying it.
+    """
+
+    def __init__(self):
+        self.results = queue.Queue()
+        self.thread = None
+        self.cancel_event = threading.Event()
+        self.name = None
+        self.nodes_examined = 0
+
+    def busy(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def submit(self, algorithm, engine, start, goal, cost_model, context=None):
+        def search(progress):
+            engine.on_progress = progress
+            try:
+                path = algorithm(None, start, goal, cost_model=cost_model,
+                                 engine=engine)
+            finally:
+                self.nodes_examined = engine.nodes_examined
+            return path, engine.nodes_examined, None
+
+        self.submit_task(algorithm.__name__, search, context)
+
+    def submit_task(self, name, task, context=None):
+        # task(progress) runs on the worker thread and returns (path, nodes_examined,
+        # value); progress(nodes_examined) publishes its count and returns True once
+        # the task should give up
+        if self.busy():
+            raise RuntimeError("A search is already running")
+        self.cancel_event.clear()
+        self.name = name
+        self.nodes_examined = 0
+        args = (task, context)
+        self.thread = threading.Thread(target=self._run, args=args, daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def poll(self):
+        # The finished SearchResult, or None while the search is still running
+        try:
+            return self.results.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _progress(self, nodes_examined):
+        self.nodes_examined = nodes_examined
+        return self.cancel_event.is_set()
+
+    def _run(self, task, context):
+        start_time = time.time()
+        try:
+            path, nodes_examined, value = task(self._progress)
+        except Exception as error:
+            # Report the failure, or the caller would wait for this result forever
+            self.results.put(SearchResult(
+                self.name, [], self.nodes_examined, time.time() - start_time,
+                False, context, error,
+            ))
+            return
+        self.nodes_examined = nodes_examined
+        cancelled = self.cancel_event.is_set()
+        self.results.put(SearchResult(
+            self.name, [] if cancelled else path, nodes_examined,
+            time.time() - start_time, cancelled, context, value=value,
+        ))
@@ -0,0 +1,90 @@
+# reference.py
+"""Seeded random grids and a plain Dijkstra to check the searches against."""
+import heapq
+
+import pytest
+
+from grid_engine import cell_cost, get_cost_model
+from pathfinding_algorithms import path_cost
+
+WEIGHTED = {False: (0, 0, 0, 1), True: (0, 0, 0, 1, 2, 3, 5, 9)}
+TRIALS = 40
+
+
+def reference_cost(grid, start, goal, cost_model):
+    # Dijkstra over (row, col) tuples; a search may leave a walled start but never
+    # enter a wall
+    model = get_cost_model(cost_model)
+    rows, cols = len(grid), len(grid[0])
+    best = {start: 0}
+    open_list = [(0, start)]
+    while open_list:
+        cost, (row, col) = heapq.heappop(open_list)
+        if cost > best[(row, col)]:
+            continue
+        if (row, col) == goal:
+            return cost
+        for dr, dc in model.directions:
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] != 1:
+                step = model.step_cost(dr, dc) * cell_cost(grid[nr][nc])
+                tentative_cost = cost + step
+                if tentative_cost < best.get((nr, nc), float('inf')) - 1e-12:
+                    best[(nr, nc)] = tentative_cost
+                    heapq.heappush(open_list, (tentative_cost, (nr, nc)))
+    return None
+
+
+def random_case(rng, weighted, max_size=20):
+    rows, cols = rng.randint(1, max_size), rng.randint(1, max_size)
+    values = WEIGHTED[weighted]
+    grid = [[rng.choice(values) for _ in range(cols)] for _ in range(rows)]
+    start = (rng.randrange(rows), rng.randrange(cols))
+    goal = (rng.randrange(rows), rng.randrange(cols))
+    return grid, start, goal
+
+
+def batch_queries(rng, grid):
+    rows, cols = len(grid), len(grid[0])
+    cells = [(rng.randrange(rows), rng.randrange(cols)) for _ in range(6)]
+    # Few goals and many starts makes solve_batch grow its trees from the goals
+    queries = [(rng.choice(cells), rng.choice(cells[:2])) for _ in range(20)]
+    queries += [(rng.choice(cells), rng.choice(cells)) for _ in range(5)]
+    return queries
+
+
+def run_to_end(search):
+    # Drive a stepped search, returning its path and the batches it yielded
+    batches = []
+    while True:
+        try:
+            batches.append(next(search))
+        except StopIteration as done:
+            return done.value, batches
+
+
+def assert_valid(path, grid, start, goal, cost_model):
+    directions = set(get_cost_model(cost_model).directions)
+    assert path[0] == start and path[-1] == goal
+    for (r1, c1), (r2, c2) in zip(path, path[1:], strict=False):
+        assert (r2 - r1, c2 - c1) in directions
+        assert grid[r2][c2] != 1
+    return path_cost(path, cost_model, grid)
+
+
+def assert_optimal(path, grid, start, goal, cost_model):
+    expected = reference_cost(grid, start, goal, cost_model)
+    if expected is None:
+        assert path == []
+    else:
+        cost = assert_valid(path, grid, start, goal, cost_model)
+        assert cost == pytest.approx(expected)
+
+
+def assert_near_optimal(path, grid, start, goal, cost_model):
+    # For HPA*: a path exactly when one exists, never cheaper than the optimum
+    expected = reference_cost(grid, start, goal, cost_model)
+    if expected is None:
+        assert path == []
+    else:
+        assert assert_valid(path, grid, start, goal, cost_model) >= expected - 1e-9
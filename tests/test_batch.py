@@ -0,0 +1,24 @@
+# test_batch.py
+import random
+
+import pytest
+from reference import assert_optimal, batch_queries, random_case
+
+from grid_engine import COST_MODELS
+from pathfinding_algorithms import solve_batch
+
+
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+def test_solve_batch(cost_model):
+    rng = random.Random(f"batch {cost_model}")
+    for _ in range(10):
+        grid, _, _ = random_case(rng, False)
+        queries = batch_queries(rng, grid)
+        paths = solve_batch(grid, queries, cost_model)
+        assert len(paths) == len(queries)
+        for (start, goal), path in zip(queries, paths, strict=True):
+            assert_optimal(path, grid, start, goal, cost_model)
+
+
+def test_empty_batch():
+    assert solve_batch([[0]], []) == []
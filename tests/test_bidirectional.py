@@ -0,0 +1,32 @@
+# test_bidirectional.py
+import random
+
+import pytest
+from reference import TRIALS, assert_optimal, random_case
+
+from grid_engine import COST_MODELS
+from pathfinding_algorithms import bidirectional_astar, bidirectional_dijkstra
+
+SEARCHES = [bidirectional_astar, bidirectional_dijkstra]
+
+
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+@pytest.mark.parametrize('search', SEARCHES, ids=lambda search: search.__name__)
+def test_matches_reference(search, cost_model):
+    rng = random.Random(f"{search.__name__} {cost_model}")
+    for _ in range(TRIALS):
+        grid, start, goal = random_case(rng, False, max_size=40)
+        stats = {}
+        path = search(grid, start, goal, cost_model=cost_model, stats=stats)
+        assert stats['nodes_examined'] >= 0
+        assert_optimal(path, grid, start, goal, cost_model)
+
+
+@pytest.mark.parametrize('search', SEARCHES, ids=lambda search: search.__name__)
+def test_endpoints(search):
+    grid = [[0, 1, 0], [0, 1, 0], [0, 1, 0]]
+    assert search(grid, (1, 0), (1, 0)) == [(1, 0)]
+    assert search(grid, (0, 0), (2, 2)) == []
+    # A walled start can still be left, but a walled goal is never entered
+    assert search(grid, (0, 1), (2, 0)) == [(0, 1), (1, 0), (2, 0)]
+    assert search(grid, (0, 0), (1, 1)) == []
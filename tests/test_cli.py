@@ -0,0 +1,55 @@
+# test_cli.py
+import json
+import sys
+
+import pytest
+
+import cli
+from maze_saver import landmarks_filename, load_maze
+
+
+def solve_json(capsys, *argv):
+    assert cli.main(['solve', *argv, '--json']) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+@pytest.mark.parametrize('output', ['maze.maze', 'maze.json'])
+def test_generate_then_solve(tmp_path, capsys, output):
+    filename = str(tmp_path / output)
+    assert cli.main(['generate', 'kruskal', '15', '21', filename, '--seed', '3']) == 0
+    assert len(load_maze(filename)) == 15
+    capsys.readouterr()
+    result = solve_json(capsys, filename, '--algorithm', 'dijkstra')
+    assert result['found'] and result['start'] == [0, 0] and result['goal'] == [14, 20]
+    assert result['path'][0] == [0, 0] and result['path'][-1] == [14, 20]
+    assert result['cost'] == len(result['path']) - 1
+
+
+def test_landmarks_are_used_by_alt(tmp_path, capsys):
+    filename = str(tmp_path / 'maze.maze')
+    cli.main(['generate', 'caves', '30', '30', filename, '--seed', '5'])
+    assert cli.main(['landmarks', filename, '--count', '4']) == 0
+    assert (tmp_path / 'maze.maze.landmarks').exists()
+    assert landmarks_filename(filename).endswith('.landmarks')
+    capsys.readouterr()
+    alt = solve_json(capsys, filename, '--algorithm', 'alt_astar')
+    reference = solve_json(capsys, filename, '--algorithm', 'dijkstra')
+    assert alt['cost'] == reference['cost']
+    assert 'Ignoring landmarks' not in capsys.readouterr().err
+
+
+def test_bad_arguments(tmp_path):
+    filename = str(tmp_path / 'maze.json')
+    cli.main(['generate', 'empty', '4', '4', filename])
+    with pytest.raises(SystemExit, match='outside'):
+        cli.main(['solve', filename, '--goal', '9,9'])
+    with pytest.raises(SystemExit, match='jump_point_search'):
+        cli.main(['solve', filename, '--algorithm', 'jump_point_search',
+                  '--cost-model', 'manhattan'])
+    with pytest.raises(SystemExit):
+        cli.main(['solve', filename, '--start', 'nowhere'])
+
+
+def test_headless_commands_skip_the_gui(tmp_path):
+    cli.main(['generate', 'empty', '4', '4', str(tmp_path / 'maze.json')])
+    assert 'main' not in sys.modules and 'pygame' not in sys.modules
@@ -0,0 +1,54 @@
+# test_connectivity.py
+import random
+
+import pytest
+from reference import reference_cost
+
+from connectivity import ConnectivityIndex
+from grid_engine import COST_MODELS
+from grid_model import Grid
+
+
+def test_wall_splits_and_removal_merges():
+    # A wall across the middle column cuts the open grid in two; opening one cell
+    # joins the halves again
+    grid = Grid(5, 5)
+    index = grid.connectivity(COST_MODELS['manhattan'].directions)
+    assert index.connected((0, 0), (4, 4))
+    for row in range(5):
+        grid.set_cell(row, 2, 1)
+    assert not index.connected((0, 0), (4, 4))
+    assert index.connected((0, 0), (4, 1))
+    grid.set_cell(3, 2, 0)
+    assert index.connected((0, 0), (4, 4))
+
+
+def test_diagonal_gap_stays_connected():
+    # With diagonal moves, two walls touching at a corner leave the gap open
+    index = ConnectivityIndex.from_grid([[0, 1], [1, 0]])
+    assert index.connected((0, 0), (1, 1))
+    index = ConnectivityIndex.from_grid(
+        [[0, 1], [1, 0]], COST_MODELS['manhattan'].directions)
+    assert not index.connected((0, 0), (1, 1))
+
+
+def test_walled_start_is_reachable_through_a_neighbour():
+    index = ConnectivityIndex.from_grid([[1, 0, 0]])
+    assert not index.connected((0, 0), (0, 2))
+    assert index.reachable((0, 0), (0, 2))
+
+
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+def test_random_edits_match_reference(cost_model):
+    rng = random.Random(f"connectivity {cost_model}")
+    for _ in range(20):
+        rows, cols = rng.randint(1, 12), rng.randint(1, 12)
+        grid = Grid(rows, cols)
+        grid.grid = [[rng.choice((0, 0, 1)) for _ in range(cols)] for _ in range(rows)]
+        index = grid.connectivity(COST_MODELS[cost_model].directions)
+        for _ in range(30):
+            grid.set_cell(rng.randrange(rows), rng.randrange(cols), rng.choice((0, 1)))
+            start = (rng.randrange(rows), rng.randrange(cols))
+            goal = (rng.randrange(rows), rng.randrange(cols))
+            expected = reference_cost(grid.grid, start, goal, cost_model) is not None
+            assert index.reachable(start, goal) == expected
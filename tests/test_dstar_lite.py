@@ -0,0 +1,59 @@
+# test_dstar_lite.py
+import random
+
+import pytest
+from reference import TRIALS, WEIGHTED, assert_optimal, random_case
+
+from dstar_lite import DStarLite
+from grid_engine import COST_MODELS
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+def test_replanning(cost_model, weighted):
+    rng = random.Random(f"dstar {cost_model} {weighted}")
+    for _ in range(TRIALS // 2):
+        grid, start, goal = random_case(rng, weighted, max_size=12)
+        rows, cols = len(grid), len(grid[0])
+        planner = DStarLite(grid, start, goal, cost_model)
+        assert_optimal(planner.plan(), grid, start, goal, cost_model)
+        for _ in range(5):
+            changes = []
+            for _ in range(rng.randint(1, 3)):
+                row, col = rng.randrange(rows), rng.randrange(cols)
+                value = rng.choice(WEIGHTED[weighted])
+                grid[row][col] = value
+                changes.append((row, col, value))
+            planner.update_cells(changes)
+            path = planner.plan()
+            assert_optimal(path, grid, planner.start, goal, cost_model)
+            if len(path) > 1:
+                # Walk one step along the path, as the GUI agent would
+                planner.move_start(path[1])
+
+
+def test_octile_key_ties():
+    # Octile sums that differ in the last bit once ended the search before the
+    # start was settled, and the path extraction then looped
+    grid = [
+        [1, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 1, 1, 0],
+        [1, 0, 1, 0, 0, 0, 1, 0],
+        [0, 0, 0, 0, 1, 0, 0, 0],
+    ]
+    planner = DStarLite(grid, (0, 0), (3, 7), 'octile')
+    assert_optimal(planner.plan(), grid, (0, 0), (3, 7), 'octile')
+    planner.move_start((0, 1))
+    changes = [(3, 6, 1), (1, 0, 1), (2, 1, 0)]
+    for row, col, value in changes:
+        grid[row][col] = value
+    planner.update_cells(changes)
+    assert_optimal(planner.plan(), grid, (0, 1), (3, 7), 'octile')
+
+
+def test_new_goal():
+    grid = [[0] * 6 for _ in range(6)]
+    planner = DStarLite(grid, (0, 0), (5, 5))
+    planner.plan()
+    planner.set_goal((0, 5))
+    assert_optimal(planner.plan(), grid, (0, 0), (0, 5), 'chebyshev')
@@ -0,0 +1,58 @@
+# test_hpa.py
+import random
+
+import pytest
+from reference import TRIALS, assert_near_optimal, random_case
+
+from grid_engine import COST_MODELS, flatten_grid
+from hpa import HierarchicalPlanner
+from pathfinding_algorithms import hpa_star
+
+
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+def test_hpa_star(cost_model):
+    rng = random.Random(f"hpa_star {cost_model}")
+    for _ in range(TRIALS):
+        grid, start, goal = random_case(rng, False, max_size=40)
+        stats = {}
+        path = hpa_star(grid, start, goal, cost_model, stats=stats)
+        assert stats['nodes_examined'] >= 0
+        assert_near_optimal(path, grid, start, goal, cost_model)
+
+
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+def test_small_clusters(cost_model):
+    rng = random.Random(f"hpa {cost_model}")
+    for _ in range(TRIALS):
+        grid, start, goal = random_case(rng, False)
+        planner = HierarchicalPlanner.from_grid(grid, 4, cost_model)
+        assert_near_optimal(planner.path(start, goal), grid, start, goal, cost_model)
+
+
+def test_edits_rebuild_only_dirty_clusters():
+    rng = random.Random("hpa edits")
+    grid, _, _ = random_case(rng, False, max_size=30)
+    rows, cols = len(grid), len(grid[0])
+    planner = HierarchicalPlanner.from_grid(grid, 4)
+    for _ in range(30):
+        row, col = rng.randrange(rows), rng.randrange(cols)
+        grid[row][col] = rng.choice((0, 1))
+        planner.update_cell(row, col, grid[row][col])
+        assert planner.dirty == {planner.cluster_of((row, col))} or not planner.dirty
+        start = (rng.randrange(rows), rng.randrange(cols))
+        goal = (rng.randrange(rows), rng.randrange(cols))
+        assert_near_optimal(planner.path(start, goal), grid, start, goal, 'chebyshev')
+        assert not planner.dirty
+
+
+def test_sync_applies_only_the_differences():
+    grid = [[0] * 12 for _ in range(12)]
+    planner = HierarchicalPlanner.from_grid(grid, 4)
+    for row in range(11):
+        grid[row][5] = 1
+    planner.sync(flatten_grid(grid)[2])
+    assert planner.dirty == {(0, 1), (1, 1), (2, 1)}
+    assert_near_optimal(planner.path((0, 0), (0, 11)), grid, (0, 0), (0, 11),
+                        'chebyshev')
+    planner.sync(flatten_grid(grid)[2])
+    assert not planner.dirty
@@ -0,0 +1,69 @@
+# test_instrumentation.py
+import json
+
+import pytest
+
+import instrumentation
+from pathfinding_algorithms import astar, dijkstra
+
+GRID = [[0, 0, 0, 0], [1, 1, 1, 0], [0, 0, 0, 0]]
+FIELDS = {'algorithm', 'cells', 'found', 'heap_high_water', 'setup_s', 'search_s',
+          'reconstruction_s', *instrumentation.COUNTERS}
+
+
+@pytest.fixture
+def collected():
+    sink = instrumentation.add_sink(instrumentation.CollectingSink())
+    yield sink.records
+    instrumentation.remove_sink(sink)
+
+
+def test_record_per_search(collected):
+    stats = {}
+    astar(GRID, (0, 0), (2, 0), stats=stats)
+    astar(GRID, (0, 0), (1, 0))
+    found, blocked = collected
+    assert set(found) == FIELDS
+    assert found['algorithm'] == 'astar' and found['cells'] == 12
+    assert found['found'] and not blocked['found']
+    assert found['nodes_examined'] == stats['nodes_examined']
+    assert found['stale_pops'] == found['pops'] - found['nodes_examined'] >= 0
+    assert found['pushes'] >= found['pops'] and found['heap_high_water'] >= 1
+
+
+def test_nothing_recorded_without_sinks(collected):
+    instrumentation.remove_sink(instrumentation.sinks[0])
+    astar(GRID, (0, 0), (2, 0))
+    assert collected == []
+
+
+def test_json_lines_sink(tmp_path):
+    filename = tmp_path / 'metrics.jsonl'
+    with instrumentation.JsonLinesSink(filename) as sink:
+        instrumentation.add_sink(sink)
+        try:
+            dijkstra(GRID, (0, 0), (2, 0))
+            # Every record is flushed as soon as it is written
+            assert len(filename.read_text().splitlines()) == 1
+            astar(GRID, (0, 0), (2, 0))
+        finally:
+            instrumentation.remove_sink(sink)
+    records = [json.loads(line) for line in filename.read_text().splitlines()]
+    assert [record['algorithm'] for record in records] == ['dijkstra', 'astar']
+    assert sink.file.closed
+
+
+def test_prometheus_sink(tmp_path):
+    sink = instrumentation.PrometheusSink()
+    instrumentation.add_sink(sink)
+    try:
+        for goal in [(2, 0), (2, 3), (1, 0)]:
+            astar(GRID, (0, 0), goal)
+    finally:
+        instrumentation.remove_sink(sink)
+    text = sink.render()
+    assert 'pathfinding_searches_total{algorithm="astar"} 3' in text
+    assert 'pathfinding_searches_found_total{algorithm="astar"} 2' in text
+    assert '# TYPE pathfinding_heap_high_water gauge' in text
+    sink.write(tmp_path / 'metrics.prom')
+    assert (tmp_path / 'metrics.prom').read_text() == text
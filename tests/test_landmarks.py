@@ -0,0 +1,79 @@
+# test_landmarks.py
+import random
+
+import pytest
+from reference import TRIALS, assert_optimal, random_case
+
+from grid_engine import COST_MODELS, flatten_grid
+from landmarks import LandmarkTable
+from maze_saver import load_landmarks, save_landmarks
+from pathfinding_algorithms import alt_astar
+
+UNIT_MODELS = sorted(name for name in COST_MODELS if name != 'octile')
+
+
+def build(grid, count=4, cost_model='chebyshev'):
+    return LandmarkTable.build(*flatten_grid(grid), count, cost_model)
+
+
+@pytest.mark.parametrize('cost_model', UNIT_MODELS)
+def test_alt_matches_reference(cost_model):
+    rng = random.Random(f"alt {cost_model}")
+    for _ in range(TRIALS):
+        grid, start, goal = random_case(rng, False, max_size=40)
+        table = build(grid, cost_model=cost_model)
+        path = alt_astar(grid, start, goal, cost_model, table)
+        assert_optimal(path, grid, start, goal, cost_model)
+
+
+def test_octile_is_unsupported():
+    grid = [[0] * 5 for _ in range(5)]
+    with pytest.raises(ValueError):
+        alt_astar(grid, (0, 0), (4, 4), cost_model='octile')
+
+
+def test_bounds_survive_dearer_cells_only():
+    rng = random.Random("alt bounds")
+    grid, _, _ = random_case(rng, False, max_size=20)
+    grid[0][0] = 1
+    table = build(grid)
+    grid[0][0] = 0
+    assert not table.bounds_hold(flatten_grid(grid)[2])
+    table = build(grid)
+    grid[0][0] = 1
+    assert table.bounds_hold(flatten_grid(grid)[2])
+    # Looser bounds still give optimal paths
+    rows, cols = len(grid), len(grid[0])
+    for _ in range(TRIALS):
+        start = (rng.randrange(rows), rng.randrange(cols))
+        goal = (rng.randrange(rows), rng.randrange(cols))
+        path = alt_astar(grid, start, goal, 'chebyshev', table)
+        assert_optimal(path, grid, start, goal, 'chebyshev')
+
+
+@pytest.mark.parametrize('cost_model', UNIT_MODELS)
+def test_file_round_trip(tmp_path, cost_model):
+    grid, _, _ = random_case(random.Random(cost_model), False, max_size=30)
+    cells = flatten_grid(grid)[2]
+    table = build(grid, cost_model=cost_model)
+    filename = tmp_path / 'maze.json.landmarks'
+    save_landmarks(table, filename)
+    loaded = load_landmarks(filename, cells)
+    assert (loaded.rows, loaded.cols) == (table.rows, table.cols)
+    assert loaded.model.name == cost_model
+    assert loaded.landmarks == table.landmarks
+    assert [list(values) for values in loaded.tables] == \
+        [list(values) for values in table.tables]
+    assert loaded.bounds_hold(cells)
+
+
+def test_stale_file_is_rejected(tmp_path):
+    grid = [[0] * 8 for _ in range(8)]
+    filename = tmp_path / 'maze.json.landmarks'
+    save_landmarks(build(grid), filename)
+    grid[3][3] = 1
+    with pytest.raises(ValueError):
+        load_landmarks(filename, flatten_grid(grid)[2])
+    filename.write_bytes(b'not a landmark file' + bytes(40))
+    with pytest.raises(ValueError):
+        load_landmarks(filename)
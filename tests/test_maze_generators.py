@@ -0,0 +1,55 @@
+# test_maze_generators.py
+import random
+
+import pytest
+from reference import reference_cost
+
+from grid_model import Graph
+from maze_generators import GENERATORS
+
+# Lattice generators and sizes they give perfect mazes for; recursive division
+# leaves open corners in a grid whose sides are both even
+PERFECT = [
+    (name, rows, cols)
+    for name in ('division', 'kruskal', 'prim')
+    for rows, cols in ((21, 31), (9, 2), (20, 30))
+    if (rows % 2, cols % 2) != (0, 0) or name != 'division'
+]
+
+
+def generate(name, rows, cols, seed, start=None, goal=None):
+    return GENERATORS[name](Graph(rows, cols), seed).generate_maze(start, goal)
+
+
+@pytest.mark.parametrize('name', list(GENERATORS))
+def test_seeded_and_solvable(name):
+    rng = random.Random(name)
+    for rows, cols in [(1, 1), (2, 7), (9, 9), (16, 25), (31, 20)]:
+        start = (rng.randrange(rows), rng.randrange(cols))
+        goal = (rng.randrange(rows), rng.randrange(cols))
+        grid = generate(name, rows, cols, 11, start, goal)
+        assert grid == generate(name, rows, cols, 11, start, goal)
+        assert len(grid) == rows and all(len(values) == cols for values in grid)
+        # Generators guarantee a 4-connected path, which every cost model can take
+        assert reference_cost(grid, start, goal, 'manhattan') is not None
+
+
+@pytest.mark.parametrize('name', [name for name in GENERATORS if name != 'empty'])
+def test_seeds_differ(name):
+    assert generate(name, 21, 21, 1) != generate(name, 21, 21, 2)
+
+
+@pytest.mark.parametrize('name, rows, cols', PERFECT)
+def test_lattice_mazes_are_perfect(name, rows, cols):
+    # A tree of corridors: one fewer 4-neighbour link than free cells, and every
+    # free cell reachable from the corner
+    grid = generate(name, rows, cols, 4)
+    free = [(row, col) for row in range(rows) for col in range(cols)
+            if grid[row][col] != 1]
+    links = sum(
+        1 for row, col in free for nr, nc in ((row + 1, col), (row, col + 1))
+        if nr < rows and nc < cols and grid[nr][nc] != 1
+    )
+    assert links == len(free) - 1
+    assert all(reference_cost(grid, (0, 0), cell, 'manhattan') is not None
+               for cell in free[::7])
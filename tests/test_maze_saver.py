@@ -0,0 +1,111 @@
+# test_maze_saver.py
+import io
+import json
+import random
+
+import pytest
+
+from maze_saver import (
+    is_binary_maze,
+    iter_json_rows,
+    iter_text_rows,
+    load_maze,
+    load_maze_binary,
+    load_maze_streaming,
+    save_maze,
+    save_maze_binary,
+)
+from pathfinding_algorithms import astar
+
+
+def random_grid(rng, rows, cols, values=(0, 1)):
+    return [[rng.choice(values) for _ in range(cols)] for _ in range(rows)]
+
+
+@pytest.mark.parametrize('packed', [False, True])
+def test_binary_round_trip(tmp_path, packed):
+    rng = random.Random(f"binary {packed}")
+    # Sizes around a byte boundary exercise the bit padding
+    for rows, cols in [(1, 1), (3, 5), (7, 9), (16, 16)]:
+        grid = random_grid(rng, rows, cols)
+        filename = tmp_path / 'maze.maze'
+        save_maze_binary(grid, filename, (0, 0), (rows - 1, cols - 1), packed=packed)
+        assert is_binary_maze(filename)
+        with load_maze_binary(filename) as maze:
+            assert (maze.rows, maze.cols) == (rows, cols)
+            assert maze.to_grid() == grid
+            assert maze.start == (0, 0) and maze.goal == (rows - 1, cols - 1)
+        assert load_maze(filename) == grid
+    save_maze_binary([], tmp_path / 'empty.maze', packed=packed)
+    assert load_maze(tmp_path / 'empty.maze') == []
+
+
+def test_byte_file_is_searched_in_place(tmp_path):
+    grid = [[0, 3, 0], [0, 1, 0], [0, 0, 0]]
+    filename = tmp_path / 'maze.maze'
+    save_maze_binary(grid, filename)
+    with load_maze_binary(filename) as maze:
+        assert isinstance(maze.cells, memoryview) and maze.cells.readonly
+        assert maze.start is None and maze.goal is None
+        path = astar(None, (0, 0), (0, 2), engine=maze.engine())
+        assert path == astar(grid, (0, 0), (0, 2))
+
+
+def test_terrain_cannot_be_bit_packed(tmp_path):
+    with pytest.raises(ValueError):
+        save_maze_binary([[0, 3]], tmp_path / 'maze.maze', packed=True)
+
+
+def test_not_a_binary_maze(tmp_path):
+    filename = tmp_path / 'maze.maze'
+    filename.write_bytes(b'[[0, 1]]')
+    assert not is_binary_maze(filename)
+    filename.write_bytes(b'MAZE' + bytes(40))
+    with pytest.raises(ValueError):
+        load_maze_binary(filename)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64])
+def test_json_rows_across_chunk_boundaries(chunk_size):
+    grid = random_grid(random.Random("json"), 6, 9, values=(0, 1, 3, 12))
+    for text in (json.dumps(grid), json.dumps(grid, indent=1)):
+        file = io.BytesIO(text.encode())
+        rows = iter_json_rows(file, chunk_size=chunk_size)
+        assert [list(row) for row in rows] == grid
+
+
+def test_truncated_json():
+    with pytest.raises(ValueError):
+        list(iter_json_rows(io.BytesIO(b'[[0, 1], [1, 0'), chunk_size=4))
+
+
+def test_text_rows():
+    file = io.BytesIO(b'0 1 0\n\n1 12 3\n')
+    assert [list(row) for row in iter_text_rows(file)] == [[0, 1, 0], [1, 12, 3]]
+
+
+@pytest.mark.parametrize('suffix', ['.json', '.txt'])
+def test_streaming_load(tmp_path, suffix):
+    grid = random_grid(random.Random(suffix), 40, 30, values=(0, 1, 5))
+    filename = tmp_path / ('maze' + suffix)
+    if suffix == '.json':
+        save_maze(grid, filename)
+    else:
+        filename.write_text('\n'.join(' '.join(map(str, row)) for row in grid))
+    reports = []
+
+    def progress(read, total):
+        reports.append((read, total))
+
+    rows, cols, cells = load_maze_streaming(filename, progress)
+    assert (rows, cols) == (40, 30)
+    assert [list(cells[row * cols:(row + 1) * cols]) for row in range(rows)] == grid
+    size = filename.stat().st_size
+    assert reports[-1] == (size, size)
+
+
+def test_ragged_rows(tmp_path):
+    filename = tmp_path / 'maze.txt'
+    filename.write_text('0 0\n0\n')
+    with pytest.raises(ValueError):
+        load_maze_streaming(filename)
@@ -0,0 +1,42 @@
+# test_parallel.py
+import random
+from multiprocessing import shared_memory
+
+import pytest
+from reference import random_case
+
+from grid_engine import flatten_grid
+from parallel import ParallelSolver
+from pathfinding_algorithms import path_cost, solve_batch
+
+
+def test_paths_come_back_in_query_order():
+    rng = random.Random("parallel")
+    grid, _, _ = random_case(rng, False, max_size=30)
+    rows, cols = len(grid), len(grid[0])
+    queries = [
+        ((rng.randrange(rows), rng.randrange(cols)),
+         (rng.randrange(rows), rng.randrange(cols)))
+        for _ in range(50)
+    ]
+    with ParallelSolver(grid, processes=2) as solver:
+        # Small chunks spread the queries over both workers
+        paths = list(solver.solve(queries, chunksize=3))
+    expected = solve_batch(grid, queries)
+    for (start, goal), path, single in zip(queries, paths, expected, strict=True):
+        # Chunks group queries differently, so equally short paths may differ
+        if single:
+            assert path[0] == start and path[-1] == goal
+            assert path_cost(path, grid=grid) == path_cost(single, grid=grid)
+        else:
+            assert path == []
+
+
+def test_grid_is_shared_once_and_released():
+    grid = [[0, 1, 0], [0, 0, 1]]
+    with ParallelSolver(grid, processes=1) as solver:
+        name = solver.memory.name
+        assert bytes(solver.memory.buf[:6]) == bytes(flatten_grid(grid)[2])
+        assert list(solver.solve([((0, 0), (0, 2))])) == [[(0, 0), (1, 1), (0, 2)]]
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
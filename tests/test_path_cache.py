@@ -0,0 +1,61 @@
+# test_path_cache.py
+from grid_model import Grid
+from path_cache import PathCache
+
+TOP = [(0, 0), (0, 1), (0, 2)]
+BOTTOM = [(2, 0), (2, 1), (2, 2)]
+
+
+def cached(rows=3, cols=3):
+    grid, cache = Grid(rows, cols), PathCache()
+    cache.put(grid, (0, 0), (0, 2), 'astar', TOP)
+    cache.put(grid, (2, 0), (2, 2), 'astar', BOTTOM)
+    return grid, cache
+
+
+def test_hit_and_miss():
+    grid, cache = cached()
+    assert cache.get(grid, (0, 0), (0, 2), 'astar') == TOP
+    assert cache.get(grid, (0, 0), (0, 2), 'dijkstra') is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_dearer_cell_drops_only_paths_through_it():
+    grid, cache = cached()
+    grid.set_cell(0, 1, 1)
+    assert cache.get(grid, (0, 0), (0, 2), 'astar') is None
+    assert cache.get(grid, (2, 0), (2, 2), 'astar') == BOTTOM
+    grid.set_cell(1, 1, 5)
+    assert cache.get(grid, (2, 0), (2, 2), 'astar') == BOTTOM
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_cheaper_cell_flushes_everything():
+    grid, cache = cached()
+    grid.set_cell(1, 1, 1)
+    grid.set_cell(1, 1, 0)
+    assert cache.get(grid, (2, 0), (2, 2), 'astar') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_unseen_edit_flushes_through_the_version():
+    grid, cache = cached()
+    grid.reset()
+    assert cache.get(grid, (0, 0), (0, 2), 'astar') is None
+    cache.put(grid, (0, 0), (0, 2), 'astar', TOP)
+    assert cache.get(Grid(3, 3), (0, 0), (0, 2), 'astar') is None
+
+
+def test_eviction_by_entries_and_cells():
+    grid = Grid(3, 3)
+    cache = PathCache(max_entries=2, max_cells=5)
+    cache.put(grid, (0, 0), (0, 2), 'astar', TOP)
+    cache.put(grid, (2, 0), (2, 0), 'astar', [(2, 0)])
+    cache.get(grid, (0, 0), (0, 2), 'astar')
+    cache.put(grid, (1, 0), (1, 0), 'astar', [(1, 0)])
+    # The least recently used entry goes first
+    assert cache.get(grid, (2, 0), (2, 0), 'astar') is None
+    assert cache.get(grid, (0, 0), (0, 2), 'astar') == TOP
+    cache.put(grid, (2, 0), (2, 2), 'astar', BOTTOM)
+    assert cache.stats()['cells'] <= 5
+    assert cache.stats()['evictions'] == 3
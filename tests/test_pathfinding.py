@@ -0,0 +1,47 @@
+# test_pathfinding.py
+"""A*, Dijkstra and JPS checked against a reference Dijkstra on seeded random grids."""
+import random
+
+import pytest
+from reference import TRIALS, assert_optimal, random_case
+
+from grid_engine import COST_MODELS
+from pathfinding_algorithms import astar, dijkstra, jump_point_search
+
+SEARCHES = [astar, dijkstra, jump_point_search]
+
+
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+@pytest.mark.parametrize('search', SEARCHES, ids=lambda search: search.__name__)
+def test_matches_reference(search, cost_model):
+    if search == jump_point_search and cost_model == 'manhattan':
+        pytest.skip("JPS needs diagonal moves")
+    rng = random.Random(f"{search.__name__} {cost_model}")
+    for _ in range(TRIALS):
+        grid, start, goal = random_case(rng, False, max_size=40)
+        stats = {}
+        path = search(grid, start, goal, cost_model=cost_model, stats=stats)
+        assert stats['nodes_examined'] >= 0
+        assert_optimal(path, grid, start, goal, cost_model)
+
+
+def test_jump_point_search_needs_diagonals():
+    grid = [[0] * 5 for _ in range(5)]
+    with pytest.raises(ValueError):
+        jump_point_search(grid, (0, 0), (4, 4), cost_model='manhattan')
+
+
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+def test_high_g_tie_breaker(cost_model):
+    rng = random.Random(f"high_g {cost_model}")
+    for _ in range(TRIALS):
+        grid, start, goal = random_case(rng, False)
+        path = astar(grid, start, goal, cost_model, tie_breaker='high_g')
+        assert_optimal(path, grid, start, goal, cost_model)
+
+
+def test_octile_prefers_diagonals():
+    # An open grid is crossed diagonally first: 3 diagonal and 2 straight steps
+    grid = [[0] * 6 for _ in range(4)]
+    path = astar(grid, (0, 0), (3, 5), 'octile')
+    assert len(path) == 6
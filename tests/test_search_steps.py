@@ -0,0 +1,26 @@
+# test_search_steps.py
+import random
+
+import pytest
+from reference import TRIALS, assert_optimal, random_case, run_to_end
+
+from pathfinding_algorithms import astar, astar_steps, dijkstra_steps
+
+
+@pytest.mark.parametrize('steps', [astar_steps, dijkstra_steps])
+def test_stepped_search(steps):
+    rng = random.Random(steps.__name__)
+    for _ in range(TRIALS):
+        grid, start, goal = random_case(rng, False)
+        path, _ = run_to_end(steps(grid, start, goal, 'octile', batch_size=7))
+        assert_optimal(path, grid, start, goal, 'octile')
+
+
+def test_batches_report_each_expansion_once():
+    grid = [[0] * 30 for _ in range(30)]
+    search = astar_steps(grid, (0, 0), (29, 0), 'manhattan', batch_size=5)
+    path, batches = run_to_end(search)
+    closed = [cell for _, cells in batches for cell in cells]
+    assert len(closed) == len(set(closed))
+    assert all(len(cells) <= 5 for _, cells in batches)
+    assert path == astar(grid, (0, 0), (29, 0), 'manhattan')
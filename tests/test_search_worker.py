@@ -0,0 +1,60 @@
+# test_search_worker.py
+from grid_engine import GridEngine
+from pathfinding_algorithms import astar, dijkstra
+from search_worker import SearchWorker
+
+
+def wait_for(worker):
+    worker.thread.join(timeout=30)
+    return worker.poll()
+
+
+def test_result_is_queued():
+    worker = SearchWorker()
+    engine = GridEngine.from_grid([[0] * 8 for _ in range(8)])
+    worker.submit(astar, engine, (0, 0), (7, 7), 'chebyshev', context='query')
+    result = wait_for(worker)
+    assert len(result.path) == 8
+    assert result.context == 'query'
+    assert not result.cancelled and result.error is None
+    assert not worker.busy() and worker.poll() is None
+
+
+def test_failed_search_still_reports():
+    def broken(*_args, **_options):
+        raise ValueError("broken search")
+
+    worker = SearchWorker()
+    worker.submit(broken, GridEngine(4, 4), (0, 0), (3, 3), 'chebyshev')
+    result = wait_for(worker)
+    assert isinstance(result.error, ValueError)
+    assert result.path == [] and not result.cancelled
+
+
+def test_cancel():
+    worker = SearchWorker()
+    engine = GridEngine.from_grid([[0] * 300 for _ in range(300)])
+    # submit clears the event, so cancel from the first progress call instead
+    progress = worker._progress
+
+    def cancel_at_once(nodes_examined):
+        worker.cancel()
+        return progress(nodes_examined)
+
+    worker._progress = cancel_at_once
+    worker.submit(dijkstra, engine, (0, 0), (299, 299), 'chebyshev')
+    result = wait_for(worker)
+    assert result.cancelled and result.path == []
+
+
+def test_task_value_survives_cancel():
+    worker = SearchWorker()
+
+    def build_then_cancel(progress):
+        worker.cancel()
+        return [(0, 0)], 1 if progress(1) else 0, 'planner'
+
+    worker.submit_task('build', build_then_cancel, context='query')
+    result = wait_for(worker)
+    assert result.cancelled and result.path == []
+    assert result.value == 'planner' and result.name == 'build'
@@ -0,0 +1,94 @@
+# test_terrain.py
+"""Every search on grids of weighted terrain, checked against the reference Dijkstra."""
+import random
+
+import pytest
+from reference import (
+    TRIALS,
+    assert_near_optimal,
+    assert_optimal,
+    batch_queries,
+    random_case,
+    run_to_end,
+)
+
+from grid_engine import COST_MODELS, GridEngine, cell_cost
+from hpa import HierarchicalPlanner
+from pathfinding_algorithms import (
+    ALGORITHMS,
+    astar,
+    astar_steps,
+    dijkstra_steps,
+    path_cost,
+    solve_batch,
+)
+
+
+def test_cell_costs():
+    assert [cell_cost(value) for value in (0, 2, 9, 255)] == [1, 2, 9, 255]
+    assert cell_cost(1) == float('inf')
+    assert path_cost([(0, 0), (0, 1), (1, 2)], 'octile', [[0, 3, 0], [0, 0, 5]]) == \
+        pytest.approx(3 + 5 * 2 ** 0.5)
+    assert GridEngine.from_grid([[0, 1], [2, 0]]).weighted()
+    assert not GridEngine.from_grid([[0, 1], [1, 0]]).weighted()
+
+
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+@pytest.mark.parametrize('name', sorted(ALGORITHMS))
+def test_matches_reference(name, cost_model):
+    if name == 'alt_astar' and cost_model == 'octile':
+        pytest.skip("ALT tables need unit step costs")
+    rng = random.Random(f"{name} {cost_model} weighted")
+    for _ in range(TRIALS):
+        grid, start, goal = random_case(rng, True, max_size=40)
+        path = ALGORITHMS[name](grid, start, goal, cost_model=cost_model)
+        if name == 'hpa_star':
+            assert_near_optimal(path, grid, start, goal, cost_model)
+        else:
+            assert_optimal(path, grid, start, goal, cost_model)
+
+
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+def test_high_g_tie_breaker(cost_model):
+    rng = random.Random(f"high_g {cost_model} weighted")
+    for _ in range(TRIALS):
+        grid, start, goal = random_case(rng, True)
+        path = astar(grid, start, goal, cost_model, tie_breaker='high_g')
+        assert_optimal(path, grid, start, goal, cost_model)
+
+
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+def test_solve_batch(cost_model):
+    # Trees grown from the goals must price a reversed path like the forward one
+    rng = random.Random(f"batch {cost_model} weighted")
+    for _ in range(10):
+        grid, _, _ = random_case(rng, True)
+        queries = batch_queries(rng, grid)
+        paths = solve_batch(grid, queries, cost_model)
+        for (start, goal), path in zip(queries, paths, strict=True):
+            assert_optimal(path, grid, start, goal, cost_model)
+
+
+@pytest.mark.parametrize('steps', [astar_steps, dijkstra_steps])
+def test_stepped_search(steps):
+    rng = random.Random(f"{steps.__name__} weighted")
+    for _ in range(TRIALS):
+        grid, start, goal = random_case(rng, True)
+        path, _ = run_to_end(steps(grid, start, goal, 'octile', batch_size=7))
+        assert_optimal(path, grid, start, goal, 'octile')
+
+
+@pytest.mark.parametrize('cost_model', sorted(COST_MODELS))
+def test_hierarchical_small_clusters(cost_model):
+    rng = random.Random(f"hpa {cost_model} weighted")
+    for _ in range(TRIALS):
+        grid, start, goal = random_case(rng, True)
+        planner = HierarchicalPlanner.from_grid(grid, 4, cost_model)
+        assert_near_optimal(planner.path(start, goal), grid, start, goal, cost_model)
+
+
+def test_terrain_is_avoided_when_cheaper():
+    # Crossing the swamp costs 9 per cell, the detour round it less
+    grid = [[0, 0, 0], [9, 9, 9], [0, 0, 0], [0, 0, 0]]
+    grid[1][2] = 0
+    assert (1, 2) in astar(grid, (0, 0), (2, 0), 'manhattan')